@@ -0,0 +1,112 @@
+# backtesting/engine.py
+
+from dataclasses import dataclass, field
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+from core.interfaces import IStrategy
+from core.models import OrderType
+
+BUY_TYPES = (OrderType.BUY, OrderType.BUY_CALL, OrderType.BUY_PUT)
+SELL_TYPES = (OrderType.SELL, OrderType.SELL_CALL, OrderType.SELL_PUT)
+
+@dataclass
+class BacktestResult:
+    equity: pd.Series
+    trades: pd.DataFrame
+    stats: Dict[str, float] = field(default_factory=dict)
+
+class Backtester:
+    """
+    A vectorized backtest engine for any IStrategy.
+
+    The strategy's full signal series is computed once through
+    IStrategy.generate_signal_series, then fills, positions and equity are
+    derived with array operations. Position rules mirror PaperBroker:
+      - BUY / BUY_CALL / BUY_PUT add 'quantity' to the position
+      - SELL / SELL_CALL / SELL_PUT remove 'quantity', and are rejected
+        if they would take the position below zero
+    Orders fill at the close of the bar that produced the signal.
+    Unlike PaperBroker, cash is debited and credited so equity can be tracked.
+    """
+
+    def __init__(
+        self,
+        strategy: IStrategy,
+        starting_balance: float = 100000.0,
+        quantity: float = 10,
+        price_column: str = "close",
+        periods_per_year: int = 252,
+    ):
+        self.strategy = strategy
+        self.starting_balance = starting_balance
+        self.quantity = quantity
+        self.price_column = price_column
+        self.periods_per_year = periods_per_year
+
+    def run(self, data: pd.DataFrame) -> BacktestResult:
+        """
+        Runs the strategy over the whole of 'data' and returns the equity curve,
+        the executed trades and summary statistics.
+        """
+        if self.price_column not in data.columns:
+            raise ValueError(f"DataFrame must contain a '{self.price_column}' column.")
+
+        signals = self.strategy.generate_signal_series(data)
+        prices = data[self.price_column].to_numpy(dtype=float)
+
+        # +1 lot for each buy signal, -1 lot for each sell signal
+        buy_mask = signals.isin(BUY_TYPES).to_numpy()
+        sell_mask = signals.isin(SELL_TYPES).to_numpy()
+        steps = buy_mask.astype(np.int64) - sell_mask.astype(np.int64)
+
+        # Position in lots is the running sum of steps, floored at zero because
+        # oversized sells are rejected. A sum reflected at zero equals the raw
+        # cumulative sum minus its running minimum (when that minimum is negative).
+        raw = np.cumsum(steps)
+        lots = raw - np.minimum(np.minimum.accumulate(raw), 0)
+
+        lot_changes = np.diff(lots, prepend=0)
+        filled_quantity = lot_changes * self.quantity
+        position = lots * self.quantity
+
+        cash = self.starting_balance - np.cumsum(filled_quantity * prices)
+        equity = pd.Series(cash + position * prices, index=data.index, name="equity")
+
+        fill_idx = np.flatnonzero(lot_changes)
+        trades = pd.DataFrame({
+            "order_type": signals.to_numpy()[fill_idx],
+            "quantity": np.abs(filled_quantity[fill_idx]),
+            "price": prices[fill_idx],
+            "position": position[fill_idx],
+        }, index=data.index[fill_idx])
+
+        stats = self._summarize(equity, len(fill_idx), position)
+        return BacktestResult(equity=equity, trades=trades, stats=stats)
+
+    def _summarize(self, equity: pd.Series, n_trades: int, position: np.ndarray) -> Dict[str, float]:
+        """
+        Computes summary statistics from the equity curve.
+        """
+        values = equity.to_numpy()
+        if len(values) == 0:
+            return {"final_equity": self.starting_balance, "total_return": 0.0,
+                    "max_drawdown": 0.0, "sharpe": 0.0, "n_trades": 0, "exposure": 0.0}
+
+        returns = np.diff(values) / values[:-1]
+        running_peak = np.maximum.accumulate(values)
+        drawdowns = (values - running_peak) / running_peak
+
+        std = returns.std() if len(returns) > 1 else 0.0
+        sharpe = float(returns.mean() / std * np.sqrt(self.periods_per_year)) if std > 0 else 0.0
+
+        return {
+            "final_equity": float(values[-1]),
+            "total_return": float(values[-1] / self.starting_balance - 1.0),
+            "max_drawdown": float(-drawdowns.min()),
+            "sharpe": sharpe,
+            "n_trades": int(n_trades),
+            "exposure": float(np.mean(position > 0)),
+        }
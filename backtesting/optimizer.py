@@ -0,0 +1,150 @@
+# backtesting/optimizer.py
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Type
+
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import Backtester
+from core.interfaces import IStrategy
+
+# Per-worker state, set once by _init_worker so tasks only carry parameters
+_worker: Dict[str, Any] = {}
+
+def _attach_shared_memory(name: str) -> shared_memory.SharedMemory:
+    """
+    Maps an existing block without registering it with the resource tracker.
+    The parent created it and unlinks it; a worker's registration would make
+    the tracker report the block as leaked, or unlink it early, at exit.
+    """
+    try:
+        return shared_memory.SharedMemory(name=name, track=False)  # Python 3.13+
+    except TypeError:
+        pass
+    # Older versions register every attachment, so skip that step while attaching
+    register = resource_tracker.register
+    resource_tracker.register = lambda name, rtype: None
+    try:
+        return shared_memory.SharedMemory(name=name)
+    finally:
+        resource_tracker.register = register
+
+def _init_worker(shm_name: str, shape: Tuple[int, int], index: pd.Index,
+                 strategy_cls: Type[IStrategy], fixed_params: Dict[str, Any],
+                 backtest_params: Dict[str, Any]) -> None:
+    shm = _attach_shared_memory(shm_name)
+    _worker['shm'] = shm  # keep the mapping alive for the worker's lifetime
+    _worker['panel'] = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+    _worker['index'] = index
+    _worker['strategy_cls'] = strategy_cls
+    _worker['fixed_params'] = fixed_params
+    _worker['backtest_params'] = backtest_params
+
+def _run_task(combo_id: int, params: Dict[str, Any], columns: Sequence[int]) -> List[Dict[str, Any]]:
+    panel = _worker['panel']
+    strategy = _worker['strategy_cls'](**_worker['fixed_params'], **params)
+    backtester = Backtester(strategy, price_column='close', **_worker['backtest_params'])
+
+    rows = []
+    for col in columns:
+        # A 2-D slice of the shared panel; pandas wraps it without copying
+        data = pd.DataFrame(panel[:, col:col + 1], index=_worker['index'], columns=['close'], copy=False)
+        stats = backtester.run(data).stats
+        rows.append({'combo_id': combo_id, 'symbol_idx': col, **stats})
+    return rows
+
+class ParameterSweep:
+    """
+    Grid-searches strategy parameters by backtesting every combination on
+    every symbol across a process pool.
+
+    Closes are copied once into a shared-memory block that every worker maps,
+    so tasks only pickle a parameter dict and a list of column numbers.
+    """
+
+    def __init__(
+        self,
+        strategy_cls: Type[IStrategy],
+        param_grid: Dict[str, Sequence[Any]],
+        fixed_params: Optional[Dict[str, Any]] = None,
+        backtest_params: Optional[Dict[str, Any]] = None,
+        max_workers: Optional[int] = None,
+        symbols_per_task: int = 16,
+    ):
+        """
+        :param strategy_cls: Strategy class, instantiated as strategy_cls(**fixed_params, **combo).
+        :param param_grid: Parameter name -> candidate values, e.g. {"period": [7, 14, 21]}.
+        :param fixed_params: Constructor arguments shared by every combination (e.g. config).
+        :param backtest_params: Extra Backtester arguments (starting_balance, quantity, ...).
+        :param max_workers: Process count; defaults to os.cpu_count().
+        :param symbols_per_task: How many symbols one task backtests for one combination.
+        """
+        self.strategy_cls = strategy_cls
+        self.param_grid = param_grid
+        self.fixed_params = fixed_params or {}
+        self.backtest_params = backtest_params or {}
+        self.max_workers = max_workers or os.cpu_count()
+        self.symbols_per_task = symbols_per_task
+
+    def combinations(self) -> List[Dict[str, Any]]:
+        names = list(self.param_grid)
+        return [dict(zip(names, values)) for values in itertools.product(*self.param_grid.values())]
+
+    def run(self, closes: pd.DataFrame, metric: str = 'sharpe', per_symbol: bool = False) -> pd.DataFrame:
+        """
+        Backtests every combination on every column of 'closes' (bars x symbols).
+
+        Returns one row per combination with the mean of each statistic across
+        symbols, ranked by 'metric' (best first). With per_symbol=True the
+        unaggregated (combination, symbol) rows are returned instead.
+        """
+        combos = self.combinations()
+        symbols = list(closes.columns)
+        panel = closes.to_numpy(dtype=np.float64)
+
+        shm = shared_memory.SharedMemory(create=True, size=max(panel.nbytes, 1))
+        try:
+            shared = np.ndarray(panel.shape, dtype=np.float64, buffer=shm.buf)
+            shared[:] = panel
+
+            column_chunks = [
+                range(start, min(start + self.symbols_per_task, len(symbols)))
+                for start in range(0, len(symbols), self.symbols_per_task)
+            ]
+
+            rows = []
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_init_worker,
+                initargs=(shm.name, panel.shape, closes.index, self.strategy_cls,
+                          self.fixed_params, self.backtest_params),
+            ) as executor:
+                futures = [
+                    executor.submit(_run_task, combo_id, params, list(chunk))
+                    for combo_id, params in enumerate(combos)
+                    for chunk in column_chunks
+                ]
+                for future in futures:
+                    rows.extend(future.result())
+            del shared
+        finally:
+            shm.close()
+            shm.unlink()
+
+        results = pd.DataFrame(rows)
+        params_table = pd.DataFrame(combos)
+        params_table.index.name = 'combo_id'
+
+        if per_symbol:
+            results['symbol'] = [symbols[i] for i in results.pop('symbol_idx')]
+            results = results.join(params_table, on='combo_id')
+            return results.sort_values(metric, ascending=False, ignore_index=True)
+
+        summary = results.drop(columns='symbol_idx').groupby('combo_id').mean()
+        summary['n_symbols'] = len(symbols)
+        ranked = params_table.join(summary).sort_values(metric, ascending=False)
+        return ranked.reset_index()
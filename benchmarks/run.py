@@ -0,0 +1,282 @@
+# benchmarks/run.py
+"""
+Benchmarks for the trading hot paths.
+
+Run a grid of universe sizes and history lengths and record the timings:
+
+    python -m benchmarks.run --symbols 1 100 --bars 1000 100000 --output bench.json
+
+Compare against a stored baseline, exiting non-zero on regressions:
+
+    python -m benchmarks.run --symbols 1 100 --bars 1000 100000 \\
+        --output bench.json --compare baseline.json --threshold 0.15
+
+Per-symbol benchmarks reuse --distinct generated series so large universes
+stay within memory. main_pipeline writes every symbol to a temporary bar
+store, so pick its grid with --bench when running the largest sizes.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from contextlib import contextmanager, nullcontext
+from datetime import datetime
+from typing import Callable, ContextManager, Dict, Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_bars, make_panel, make_trades, make_universe
+
+# A benchmark takes (n_symbols, n_bars, distinct series) and returns the
+# zero-argument function to time, or a context manager yielding it when the
+# setup needs cleaning up afterwards. Setup cost is excluded from the timings.
+Setup = Callable[[int, int, int], Union[Callable[[], None], ContextManager[Callable[[], None]]]]
+
+def bench_rsi_calculate(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from indicators.rsi import RsiIndicator
+    universe = make_universe(n_symbols, n_bars, distinct)
+    rsi = RsiIndicator()
+
+    def run():
+        for df in universe:
+            rsi.calculate(df)
+    return run
+
+def bench_rsi_panel(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from indicators.rsi import RsiIndicator
+    panel = make_panel(n_bars, n_symbols)
+    rsi = RsiIndicator()
+    return lambda: rsi.calculate_panel(panel)
+
+def bench_prepare_features(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from data.processing import prepare_features
+    universe = make_universe(n_symbols, n_bars, distinct)
+
+    def run():
+        for df in universe:
+            prepare_features(df)
+    return run
+
+def bench_classical_signal(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from strategies.classical_strategy import ClassicalStrategy
+    universe = make_universe(n_symbols, n_bars, distinct)
+    strategy = ClassicalStrategy()
+
+    def run():
+        for df in universe:
+            strategy.generate_signal(df)
+    return run
+
+def bench_classical_signal_fast(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from core.bars import BarWindow
+    from strategies.classical_strategy import ClassicalStrategy
+    windows = [BarWindow.from_dataframe(df) for df in make_universe(n_symbols, n_bars, distinct)]
+    strategy = ClassicalStrategy()
+
+    def run():
+        for window in windows:
+            strategy.generate_signal_fast(window)
+    return run
+
+def bench_ml_signal(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from strategies.ml_strategy import MLStrategy
+    universe = make_universe(n_symbols, n_bars, distinct)
+    strategy = MLStrategy({"ml_model": "random_forest"})
+
+    def run():
+        for df in universe:
+            strategy.generate_signal(df)
+    return run
+
+def bench_place_order(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from brokers.paper_broker import PaperBroker
+    trades = make_trades(n_bars, n_symbols)
+
+    def run():
+        broker = PaperBroker()
+        for trade in trades:
+            broker.place_order(trade.symbol, trade.order_type, trade.quantity)
+    return run
+
+def bench_matching_engine(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from brokers.matching_engine import LIMIT, MatchingEngine
+    from core.models import OrderType
+    rng = np.random.default_rng(0)
+    symbols = [f"SYM{i % n_symbols}" for i in range(n_bars)]
+    prices = (100.0 + rng.normal(0.0, 1.0, n_bars)).round(2).tolist()
+    sides = [OrderType.BUY if buy else OrderType.SELL for buy in (rng.random(n_bars) < 0.5)]
+
+    def run():
+        engine = MatchingEngine()
+        for symbol, side, price in zip(symbols, sides, prices):
+            engine.submit(symbol, side, 1.0, LIMIT, limit_price=price)
+    return run
+
+def bench_validate_order(n_symbols: int, n_bars: int, distinct: int) -> Callable[[], None]:
+    from brokers.paper_broker import PaperBroker
+    from core.models import OrderType
+    from risk_management.advanced_risk_manager import AdvancedRiskManager
+    broker = PaperBroker()
+    for i in range(n_symbols):
+        broker.place_order(f"SYM{i}", OrderType.BUY, 1)
+    config = {"risk": {"max_open_positions": n_symbols + 1, "max_total_exposure": 1e12, "leverage": 1e6}}
+    risk_manager = AdvancedRiskManager(config, broker)
+    trades = make_trades(n_bars, n_symbols)
+
+    def run():
+        for trade in trades:
+            risk_manager.validate_order(trade)
+    return run
+
+@contextmanager
+def bench_main_pipeline(n_symbols: int, n_bars: int, distinct: int) -> Iterator[Callable[[], None]]:
+    import main
+    from brokers.paper_broker import PaperBroker
+    from data.bar_store import BarStore
+    from data.ingestion import get_bar_store, set_bar_store
+    from risk_management.basic_risk_manager import BasicRiskManager
+    from strategies.ml_strategy import MLStrategy
+
+    # Serve synthetic bars through a temporary bar store, as main would in production
+    previous_store = get_bar_store()
+    with tempfile.TemporaryDirectory(prefix="bench_bars_") as directory:
+        store = BarStore(directory)
+        bars = make_bars(n_bars, freq="D")
+        for i in range(n_symbols):
+            store.write(f"SYM{i}", bars)
+        set_bar_store(store)
+        try:
+            config = {
+                "ml_model": "random_forest",
+                "history": {"start_date": str(bars["Date"].iloc[0]), "end_date": str(bars["Date"].iloc[-1])},
+            }
+            symbols = [f"SYM{i}" for i in range(n_symbols)]
+            strategy = MLStrategy(config)
+            risk_manager = BasicRiskManager(config)
+
+            def run():
+                broker = PaperBroker()
+                asyncio.run(main.run_trading_cycle(symbols, strategy, risk_manager, broker, config))
+            yield run
+        finally:
+            set_bar_store(previous_store)
+
+BENCHMARKS: Dict[str, Setup] = {
+    "rsi_calculate": bench_rsi_calculate,
+    "rsi_panel": bench_rsi_panel,
+    "prepare_features": bench_prepare_features,
+    "classical_generate_signal": bench_classical_signal,
+    "classical_generate_signal_fast": bench_classical_signal_fast,
+    "ml_generate_signal": bench_ml_signal,
+    "paper_place_order": bench_place_order,
+    "matching_engine_limit_orders": bench_matching_engine,
+    "advanced_validate_order": bench_validate_order,
+    "main_pipeline": bench_main_pipeline,
+}
+
+def time_benchmark(fn: Callable[[], None], repeat: int) -> List[float]:
+    fn()  # warm-up
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return timings
+
+def run_suite(names: List[str], symbol_counts: List[int], bar_counts: List[int],
+              repeat: int, distinct: int) -> dict:
+    results = []
+    for name in names:
+        for n_symbols in symbol_counts:
+            for n_bars in bar_counts:
+                case = BENCHMARKS[name](n_symbols, n_bars, distinct)
+                if not hasattr(case, "__enter__"):
+                    case = nullcontext(case)
+                with case as fn:
+                    timings = time_benchmark(fn, repeat)
+                result = {
+                    "name": name,
+                    "symbols": n_symbols,
+                    "bars": n_bars,
+                    "repeat": repeat,
+                    "min": min(timings),
+                    "median": statistics.median(timings),
+                    "mean": statistics.mean(timings),
+                }
+                results.append(result)
+                print(f"{name:<28} symbols={n_symbols:<6} bars={n_bars:<9} "
+                      f"median={result['median'] * 1000:10.2f} ms  min={result['min'] * 1000:10.2f} ms")
+    return {
+        "meta": {
+            "timestamp": datetime.now().isoformat(),
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "numpy": np.__version__,
+            "pandas": pd.__version__,
+        },
+        "results": results,
+    }
+
+def compare(current: dict, baseline: dict, threshold: float) -> List[dict]:
+    """
+    Returns the results whose median is more than 'threshold' (a fraction)
+    slower than the matching baseline entry.
+    """
+    baseline_by_key = {(r["name"], r["symbols"], r["bars"]): r for r in baseline["results"]}
+    regressions = []
+    for result in current["results"]:
+        base = baseline_by_key.get((result["name"], result["symbols"], result["bars"]))
+        if base is None or base["median"] <= 0:
+            continue
+        ratio = result["median"] / base["median"]
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"{status:<10} {result['name']:<28} symbols={result['symbols']:<6} bars={result['bars']:<9} "
+              f"{base['median'] * 1000:10.2f} ms -> {result['median'] * 1000:10.2f} ms ({ratio:.2f}x)")
+        if status == "REGRESSION":
+            regressions.append({**result, "baseline_median": base["median"], "ratio": ratio})
+    return regressions
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark the trading hot paths.")
+    parser.add_argument("--bench", nargs="+", choices=sorted(BENCHMARKS), default=list(BENCHMARKS),
+                        help="Benchmarks to run (default: all).")
+    parser.add_argument("--symbols", nargs="+", type=int, default=[1, 10],
+                        help="Universe sizes to run, e.g. 1 100 10000.")
+    parser.add_argument("--bars", nargs="+", type=int, default=[1000, 10000],
+                        help="History lengths to run, e.g. 1000 100000 10000000.")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per case.")
+    parser.add_argument("--distinct", type=int, default=4,
+                        help="Distinct synthetic series generated per universe (reused across symbols).")
+    parser.add_argument("--output", help="Write results as JSON to this path.")
+    parser.add_argument("--compare", help="Baseline JSON to compare against.")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="Allowed slowdown versus the baseline, as a fraction.")
+    args = parser.parse_args(argv)
+
+    # Keep per-order log lines out of the timings
+    logging.disable(logging.WARNING)
+
+    current = run_suite(args.bench, args.symbols, args.bars, args.repeat, args.distinct)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(current, f, indent=2)
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare(current, baseline, args.threshold)
+        if regressions:
+            print(f"{len(regressions)} benchmark(s) regressed by more than {args.threshold:.0%}.")
+            return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,57 @@
+# benchmarks/synthetic.py
+
+from datetime import datetime
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+from core.models import OrderType, Trade
+
+def make_bars(n_bars: int, seed: int = 0, freq: str = "min") -> pd.DataFrame:
+    """
+    Generates a reproducible random-walk OHLCV DataFrame with both the
+    fetch_data column names (Date/Open/High/Low/Close/Volume) and the
+    lowercase 'close' column RsiIndicator expects.
+    """
+    rng = np.random.default_rng(seed)
+    close = 100.0 + np.cumsum(rng.normal(0.0, 0.5, n_bars))
+    spread = np.abs(rng.normal(0.0, 0.3, n_bars))
+    return pd.DataFrame({
+        "Date": pd.date_range("2015-01-01", periods=n_bars, freq=freq),
+        "Open": close - rng.normal(0.0, 0.1, n_bars),
+        "High": close + spread,
+        "Low": close - spread,
+        "Close": close,
+        "Volume": rng.integers(100, 10000, n_bars).astype(float),
+        "close": close,
+    })
+
+def make_universe(n_symbols: int, n_bars: int, distinct: int = 4, seed: int = 0) -> List[pd.DataFrame]:
+    """
+    Returns one bar DataFrame per symbol. Only 'distinct' series are actually
+    generated and then reused, so memory stays bounded at large universe sizes.
+    """
+    series = [make_bars(n_bars, seed=seed + i) for i in range(min(distinct, n_symbols))]
+    return [series[i % len(series)] for i in range(n_symbols)]
+
+def make_panel(n_bars: int, n_symbols: int, seed: int = 0) -> np.ndarray:
+    """
+    Generates a (bars x symbols) array of random-walk closes.
+    """
+    rng = np.random.default_rng(seed)
+    return 100.0 + np.cumsum(rng.normal(0.0, 0.5, (n_bars, n_symbols)), axis=0)
+
+def make_trades(n_trades: int, n_symbols: int, seed: int = 0) -> List[Trade]:
+    """
+    Generates a reproducible list of BUY trades spread across n_symbols symbols.
+    """
+    rng = np.random.default_rng(seed)
+    symbols = rng.integers(0, n_symbols, n_trades)
+    quantities = rng.integers(1, 10, n_trades)
+    prices = rng.uniform(50.0, 150.0, n_trades)
+    now = datetime.now()
+    return [
+        Trade(symbol=f"SYM{s}", order_type=OrderType.BUY, quantity=float(q), price=float(p), timestamp=now)
+        for s, q, p in zip(symbols, quantities, prices)
+    ]
@@ -0,0 +1,397 @@
+# brokers/broker_client.py
+
+import asyncio
+import json
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from core.models import OrderType, Position
+
+class BrokerAPIError(Exception):
+    """
+    Raised when the broker API answers with an error status or an order is rejected.
+    """
+
+    def __init__(self, status: int, message: str):
+        super().__init__(f"Broker API error {status}: {message}")
+        self.status = status
+        self.message = message
+
+class _Connection:
+    """
+    One persistent HTTP/1.1 connection (keep-alive) over asyncio streams.
+    Handles Content-Length and chunked responses, which covers JSON APIs.
+    """
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+        self.reusable = True
+
+    async def request(self, method: str, target: str, headers: Dict[str, str],
+                      body: Optional[bytes]) -> Tuple[int, Dict[str, str], bytes]:
+        lines = [f"{method} {target} HTTP/1.1"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append(f"Content-Length: {len(body) if body else 0}")
+        self.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await self.writer.drain()
+
+        status, response_headers = await read_head(self.reader)
+        if response_headers.get("transfer-encoding", "").lower() == "chunked":
+            chunks = []
+            while True:
+                size = int((await self.reader.readuntil(b"\r\n")).split(b";")[0], 16)
+                chunk = await self.reader.readexactly(size + 2)
+                if size == 0:
+                    break
+                chunks.append(chunk[:-2])
+            payload = b"".join(chunks)
+        else:
+            payload = await self.reader.readexactly(int(response_headers.get("content-length", 0)))
+
+        if response_headers.get("connection", "").lower() == "close":
+            self.reusable = False
+        return status, response_headers, payload
+
+    def close(self) -> None:
+        self.reusable = False
+        self.writer.close()
+
+async def read_head(reader: asyncio.StreamReader) -> Tuple[int, Dict[str, str]]:
+    """
+    Reads an HTTP status line and headers. Returns (status, lower-cased headers).
+    """
+    status_line = await reader.readuntil(b"\r\n")
+    return int(status_line.split()[1]), await read_headers(reader)
+
+async def read_headers(reader: asyncio.StreamReader) -> Dict[str, str]:
+    """
+    Reads an HTTP header block up to the blank line, with lower-cased names.
+    """
+    headers: Dict[str, str] = {}
+    while True:
+        line = await reader.readuntil(b"\r\n")
+        if line == b"\r\n":
+            return headers
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+
+class ConnectionPool:
+    """
+    Up to 'max_connections' keep-alive connections to one host, reused
+    across requests so the TCP (and TLS) handshake is paid once per
+    connection, not once per call. A request that fails on a reused
+    connection (closed by the server while idle) is retried once on a new one.
+    """
+
+    def __init__(self, host: str, port: int, max_connections: int = 8, ssl=None):
+        self.host = host
+        self.port = port
+        self.ssl = ssl
+        self.connections_opened = 0
+        self._idle: List[_Connection] = []
+        self._slots = asyncio.Semaphore(max_connections)
+
+    async def _open(self) -> _Connection:
+        reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.ssl)
+        self.connections_opened += 1
+        return _Connection(reader, writer)
+
+    async def request(self, method: str, target: str, headers: Dict[str, str],
+                      body: Optional[bytes]) -> Tuple[int, Dict[str, str], bytes]:
+        async with self._slots:
+            for attempt in range(2):
+                reused = bool(self._idle)
+                connection = self._idle.pop() if reused else await self._open()
+                try:
+                    result = await connection.request(method, target, headers, body)
+                except (ConnectionError, asyncio.IncompleteReadError):
+                    connection.close()
+                    if reused and attempt == 0:
+                        continue
+                    raise
+                except BaseException:
+                    # e.g. a timeout: the connection's state is unknown
+                    connection.close()
+                    raise
+                if connection.reusable:
+                    self._idle.append(connection)
+                else:
+                    connection.close()
+                return result
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+class TokenBucket:
+    """
+    Client-side rate limiter: 'rate' requests per second on average, with
+    bursts of up to 'burst'. Callers wait in arrival order.
+    """
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.capacity = float(burst)
+        self.tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self.tokens >= 1.0:
+                    self.tokens -= 1.0
+                    return
+                await asyncio.sleep((1.0 - self.tokens) / self.rate)
+
+class SnapshotCache:
+    """
+    Caches the result of an async fetch for 'ttl' seconds. Concurrent readers
+    that miss share one in-flight fetch instead of each calling the API.
+    invalidate() drops the value; a fetch already in flight when that happens
+    still answers its waiters but is not cached.
+    """
+
+    def __init__(self, fetch: Callable[[], Awaitable[Any]], ttl: float):
+        self.fetch = fetch
+        self.ttl = ttl
+        self.fetches = 0
+        self._value: Any = None
+        self._fetched_at = 0.0
+        self._generation = 0
+        self._inflight: Optional[asyncio.Task] = None
+
+    async def get(self) -> Any:
+        if self._value is not None and time.monotonic() - self._fetched_at < self.ttl:
+            return self._value
+        if self._inflight is None:
+            self._inflight = asyncio.ensure_future(self._refresh(self._generation))
+        return await asyncio.shield(self._inflight)
+
+    async def _refresh(self, generation: int) -> Any:
+        try:
+            self.fetches += 1
+            value = await self.fetch()
+            if generation == self._generation:
+                self._value = value
+                self._fetched_at = time.monotonic()
+            return value
+        finally:
+            if self._inflight is asyncio.current_task():
+                self._inflight = None
+
+    def invalidate(self) -> None:
+        self._generation += 1
+        self._value = None
+        self._inflight = None
+
+class OrderBatcher:
+    """
+    Collects orders submitted within 'window' seconds of each other and sends
+    them as one batch request (at most 'max_size' orders). Each caller awaits
+    the result for its own order.
+    """
+
+    def __init__(self, send: Callable[[List[dict]], Awaitable[List[dict]]], window: float, max_size: int):
+        self.send = send
+        self.window = window
+        self.max_size = max_size
+        self._orders: List[dict] = []
+        self._futures: List[asyncio.Future] = []
+        self._timer: Optional[asyncio.TimerHandle] = None
+
+    async def submit(self, order: dict) -> dict:
+        future = asyncio.get_running_loop().create_future()
+        self._orders.append(order)
+        self._futures.append(future)
+        if len(self._orders) >= self.max_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = asyncio.get_running_loop().call_later(self.window, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        orders, futures = self._orders, self._futures
+        self._orders, self._futures = [], []
+        if orders:
+            asyncio.ensure_future(self._send(orders, futures))
+
+    async def _send(self, orders: List[dict], futures: List[asyncio.Future]) -> None:
+        try:
+            results = await self.send(orders)
+        except Exception as e:
+            for future in futures:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for future, result in zip(futures, results):
+            if not future.done():
+                future.set_result(result)
+        if len(results) != len(futures):
+            # Never leave a caller waiting on an order the response skipped
+            error = BrokerAPIError(502, f"Batch response has {len(results)} results for {len(futures)} orders.")
+            for future in futures[len(results):]:
+                if not future.done():
+                    future.set_exception(error)
+
+class AsyncBrokerClient:
+    """
+    Async client for a REST broker API.
+
+    Requests share a keep-alive ConnectionPool and pass a TokenBucket rate
+    limiter. Account reads (positions, balance) come from a SnapshotCache
+    refreshed at most once per 'snapshot_ttl' and invalidated whenever an
+    order is acknowledged or the event stream reports a change. Orders go
+    through an OrderBatcher to the batch endpoint.
+
+    API: GET /v1/account, POST /v1/orders/batch, GET /v1/stream
+    (newline-delimited JSON events). See brokers.stub_server for a local
+    implementation.
+    """
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, max_connections: int = 8,
+                 rate_limit: float = 50.0, burst: int = 100, snapshot_ttl: float = 1.0,
+                 batch_window: float = 0.002, max_batch_size: int = 100, timeout: float = 5.0):
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or (443 if url.scheme == "https" else 80)
+        self.base_path = url.path.rstrip("/")
+        self.timeout = timeout
+        self.max_batch_size = max_batch_size
+        self._headers = {
+            "Host": f"{self.host}:{self.port}",
+            "Connection": "keep-alive",
+            "Content-Type": "application/json",
+            "Accept": "application/json",
+        }
+        if api_key:
+            self._headers["Authorization"] = f"Bearer {api_key}"
+
+        self.pool = ConnectionPool(self.host, self.port, max_connections, ssl=url.scheme == "https" or None)
+        self.limiter = TokenBucket(rate_limit, burst)
+        self.snapshot = SnapshotCache(lambda: self.request("GET", "/v1/account"), snapshot_ttl)
+        self.batcher = OrderBatcher(self._send_batch, batch_window, max_batch_size)
+        self._stream_task: Optional[asyncio.Task] = None
+
+    async def request(self, method: str, path: str, payload: Any = None) -> Any:
+        """
+        Sends one rate-limited request and returns the decoded JSON body.
+        Raises BrokerAPIError on an HTTP error status.
+        """
+        await self.limiter.acquire()
+        body = json.dumps(payload).encode() if payload is not None else None
+        status, _, response = await asyncio.wait_for(
+            self.pool.request(method, self.base_path + path, self._headers, body), self.timeout
+        )
+        data = json.loads(response) if response else None
+        if status >= 400:
+            message = data.get("error", "") if isinstance(data, dict) else ""
+            raise BrokerAPIError(status, message)
+        return data
+
+    # ------------------------------------------------------------------
+    # Account
+    # ------------------------------------------------------------------
+
+    async def account(self) -> dict:
+        """
+        Returns the cached account snapshot: {"balance", "equity", "positions"}.
+        """
+        return await self.snapshot.get()
+
+    async def positions(self) -> List[Position]:
+        account = await self.account()
+        return [Position(symbol=p["symbol"], quantity=p["quantity"], avg_price=p["avg_price"])
+                for p in account["positions"]]
+
+    async def balance(self) -> float:
+        return (await self.account())["balance"]
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    async def place_order(self, symbol: str, order_type: OrderType, quantity: float) -> dict:
+        """
+        Submits one order through the batcher and returns its result.
+        Raises BrokerAPIError if the broker rejects it.
+        """
+        result = await self.batcher.submit(_order_payload(symbol, order_type, quantity))
+        if result.get("status") == "rejected":
+            raise BrokerAPIError(400, result.get("reason", "Order rejected."))
+        return result
+
+    async def place_orders(self, orders: List[Tuple[str, OrderType, float]]) -> List[dict]:
+        """
+        Submits (symbol, order_type, quantity) orders as batch requests of up to
+        max_batch_size each, sent concurrently. Returns one result per order;
+        rejections are reported in the results, not raised.
+        """
+        payloads = [_order_payload(*order) for order in orders]
+        chunks = [payloads[i:i + self.max_batch_size] for i in range(0, len(payloads), self.max_batch_size)]
+        results = await asyncio.gather(*(self._send_batch(chunk) for chunk in chunks))
+        return [result for chunk_results in results for result in chunk_results]
+
+    async def _send_batch(self, orders: List[dict]) -> List[dict]:
+        try:
+            response = await self.request("POST", "/v1/orders/batch", {"orders": orders})
+        finally:
+            # Positions and balance may have changed either way
+            self.snapshot.invalidate()
+        return response["results"]
+
+    # ------------------------------------------------------------------
+    # Event stream
+    # ------------------------------------------------------------------
+
+    def start_stream(self, on_event: Optional[Callable[[dict], None]] = None) -> None:
+        """
+        Follows GET /v1/stream on a dedicated connection. Every account event
+        invalidates the snapshot; 'on_event' also receives each event.
+        Reconnects after a second if the stream drops.
+        """
+        if self._stream_task is None:
+            self._stream_task = asyncio.ensure_future(self._follow_stream(on_event))
+
+    async def _follow_stream(self, on_event: Optional[Callable[[dict], None]]) -> None:
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(self.host, self.port, ssl=self.pool.ssl)
+                headers = dict(self._headers, Connection="close")
+                lines = [f"GET {self.base_path}/v1/stream HTTP/1.1"] + [f"{k}: {v}" for k, v in headers.items()]
+                writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+                await writer.drain()
+                status, _ = await read_head(reader)
+                if status >= 400:
+                    raise BrokerAPIError(status, "Event stream refused.")
+                async for line in reader:
+                    if not line.strip():
+                        continue
+                    event = json.loads(line)
+                    self.snapshot.invalidate()
+                    if on_event is not None:
+                        on_event(event)
+                writer.close()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logging.exception("Broker event stream failed; reconnecting")
+            await asyncio.sleep(1.0)
+
+    async def close(self) -> None:
+        if self._stream_task is not None:
+            self._stream_task.cancel()
+            self._stream_task = None
+        await self.pool.close()
+
+def _order_payload(symbol: str, order_type: OrderType, quantity: float) -> dict:
+    return {"symbol": symbol, "order_type": order_type.value, "quantity": quantity}
@@ -0,0 +1,480 @@
+# brokers/journal.py
+
+import glob
+import logging
+import os
+import re
+import struct
+import threading
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+# One fixed-size, little-endian record per fill. Besides the fill itself it
+# carries post-images of the state the fill changed (the symbol's position
+# and realized PnL, and the cash balance), so recovery only needs the last
+# record per symbol instead of replaying every fill.
+RECORD_DTYPE = np.dtype([
+    ('seq', '<i8'),
+    ('timestamp', '<i8'),       # microseconds since the epoch
+    ('symbol', 'S24'),
+    ('order_code', 'i1'),       # core.trade_log.ORDER_CODES
+    ('quantity', '<f8'),
+    ('price', '<f8'),
+    ('qty_after', '<f8'),
+    ('avg_after', '<f8'),
+    ('balance_after', '<f8'),
+    ('realized_after', '<f8'),
+])
+
+_RECORD = struct.Struct('<qq24sbdddddd')
+assert _RECORD.size == RECORD_DTYPE.itemsize
+
+# Trade history written by each compaction, in fill order. Chunks are
+# immutable once written, so a snapshot only writes the fills it folds.
+TRADE_DTYPE = np.dtype([
+    ('timestamp', '<i8'),
+    ('symbol_id', '<i4'),       # index into JournalState.symbols
+    ('order_code', 'i1'),
+    ('quantity', '<f8'),
+    ('price', '<f8'),
+])
+
+_SEGMENT = "wal-{:06d}.log"
+_SNAPSHOT = "snapshot-{:06d}.npz"
+_TRADES = "trades-{:06d}.npy"
+_GENERATION = re.compile(r"(?:wal|snapshot|trades)-(\d{6})\.(?:log|npz|npy)$")
+
+def _generation(path: str) -> int:
+    return int(_GENERATION.search(path).group(1))
+
+def _fsync_directory(directory: str) -> None:
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+def _write_atomic(path: str, write) -> None:
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        write(f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+def group_index(codes: np.ndarray, n_groups: int, last: bool = True) -> np.ndarray:
+    """
+    Returns the row index of the last (or first) occurrence of each code.
+    """
+    rows = np.arange(len(codes))
+    if last:
+        index = np.full(n_groups, -1)
+        np.maximum.at(index, codes, rows)
+    else:
+        index = np.full(n_groups, len(codes))
+        np.minimum.at(index, codes, rows)
+    return index
+
+def factorize_symbols(symbols: np.ndarray) -> Tuple[np.ndarray, List[str]]:
+    """
+    Maps an 'S24' symbol column to dense codes and the list of distinct symbols.
+
+    Hashes each 24-byte value as three 64-bit words and factorizes the
+    hashes, which is several times faster than factorizing byte strings,
+    then checks every row against its group's symbol and falls back to the
+    exact method on a (practically impossible) collision.
+    """
+    words = np.ascontiguousarray(symbols).view('<u8').reshape(-1, 3)
+    hashes = (words[:, 0] * np.uint64(0x9E3779B97F4A7C15)) ^ (words[:, 1] * np.uint64(0xC2B2AE3D27D4EB4F)) ^ words[:, 2]
+    codes, distinct = pd.factorize(hashes)
+    uniques = symbols[group_index(codes, len(distinct), last=False)]
+    if not np.array_equal(uniques[codes], symbols):
+        codes, uniques = pd.factorize(symbols)
+    return codes, [symbol.decode() for symbol in uniques]
+
+@dataclass
+class JournalState:
+    """
+    The broker state folded from every fill up to sequence number 'seq':
+    per-symbol position, last fill price and realized PnL (aligned with
+    'symbols'), the cash balance (None before the first fill) and the fills
+    themselves as TRADE_DTYPE chunks, whose symbol ids index 'symbols'.
+    The first len(chunk_generations) chunks are on disk as trades-<gen>.npy
+    and memory-mapped; the rest were folded since the last save.
+    """
+    seq: int
+    balance: Optional[float]
+    symbols: List[str]
+    quantities: np.ndarray
+    avg_prices: np.ndarray
+    last_prices: np.ndarray
+    realized: np.ndarray
+    trade_chunks: List[np.ndarray]
+    chunk_generations: List[int]
+
+    @classmethod
+    def empty(cls) -> 'JournalState':
+        return cls(0, None, [], np.zeros(0), np.zeros(0), np.zeros(0), np.zeros(0), [], [])
+
+    def __len__(self) -> int:
+        return sum(len(chunk) for chunk in self.trade_chunks)
+
+    def trade_column(self, name: str) -> np.ndarray:
+        """
+        Returns one TRADE_DTYPE field over every fill, as a new array.
+        """
+        if not self.trade_chunks:
+            return np.zeros(0, dtype=TRADE_DTYPE[name])
+        return np.concatenate([chunk[name] for chunk in self.trade_chunks])
+
+    def fold(self, records: np.ndarray) -> 'JournalState':
+        """
+        Returns the state after applying 'records', which must continue this
+        state's sequence. Each symbol takes the post-images of its last
+        record, so no fill is replayed.
+        """
+        if len(records) == 0:
+            return self
+        codes, new_symbols = factorize_symbols(records['symbol'])
+
+        # Map record symbols onto this state's table, appending new ones
+        symbols = list(self.symbols)
+        index = {symbol: i for i, symbol in enumerate(symbols)}
+        remap = np.empty(len(new_symbols), dtype=np.int32)
+        for code, symbol in enumerate(new_symbols):
+            if symbol not in index:
+                index[symbol] = len(symbols)
+                symbols.append(symbol)
+            remap[code] = index[symbol]
+
+        arrays = []
+        for values in (self.quantities, self.avg_prices, self.last_prices, self.realized):
+            array = np.zeros(len(symbols))
+            array[:len(values)] = values
+            arrays.append(array)
+        quantities, avg_prices, last_prices, realized = arrays
+
+        final = records[group_index(codes, len(new_symbols))]
+        quantities[remap] = final['qty_after']
+        avg_prices[remap] = final['avg_after']
+        last_prices[remap] = final['price']
+        realized[remap] = final['realized_after']
+
+        trades = np.empty(len(records), dtype=TRADE_DTYPE)
+        trades['timestamp'] = records['timestamp']
+        trades['symbol_id'] = remap[codes]
+        trades['order_code'] = records['order_code']
+        trades['quantity'] = records['quantity']
+        trades['price'] = records['price']
+
+        return JournalState(
+            seq=int(records['seq'][-1]),
+            balance=float(records['balance_after'][-1]),
+            symbols=symbols,
+            quantities=quantities,
+            avg_prices=avg_prices,
+            last_prices=last_prices,
+            realized=realized,
+            trade_chunks=self.trade_chunks + [trades],
+            chunk_generations=self.chunk_generations,
+        )
+
+    def save(self, directory: str, generation: int) -> None:
+        """
+        Writes the fills folded since the last save to trades-<generation>.npy,
+        then the rest of the state to snapshot-<generation>.npz, each
+        atomically (temporary file, fsync, rename). The snapshot is written
+        last and lists the trade chunks it covers, so it is the commit point.
+        """
+        saved = len(self.chunk_generations)
+        if len(self.trade_chunks) > saved:
+            trades = np.concatenate(self.trade_chunks[saved:])
+            _write_atomic(os.path.join(directory, _TRADES.format(generation)), lambda f: np.save(f, trades))
+            _fsync_directory(directory)
+            self.trade_chunks = self.trade_chunks[:saved] + [trades]
+            self.chunk_generations = self.chunk_generations + [generation]
+
+        _write_atomic(os.path.join(directory, _SNAPSHOT.format(generation)), lambda f: np.savez(
+            f,
+            seq=np.int64(self.seq),
+            balance=np.float64(np.nan if self.balance is None else self.balance),
+            symbols=np.array([symbol.encode() for symbol in self.symbols], dtype='S24'),
+            quantities=self.quantities,
+            avg_prices=self.avg_prices,
+            last_prices=self.last_prices,
+            realized=self.realized,
+            chunk_generations=np.array(self.chunk_generations, dtype=np.int64),
+        ))
+        _fsync_directory(directory)
+
+    @classmethod
+    def load(cls, directory: str, generation: int) -> 'JournalState':
+        """
+        Reads snapshot-<generation>.npz and memory-maps the trade chunks it lists.
+        """
+        with np.load(os.path.join(directory, _SNAPSHOT.format(generation))) as data:
+            balance = float(data['balance'])
+            chunk_generations = data['chunk_generations'].tolist()
+            return cls(
+                seq=int(data['seq']),
+                balance=None if np.isnan(balance) else balance,
+                symbols=[symbol.decode() for symbol in data['symbols']],
+                quantities=data['quantities'],
+                avg_prices=data['avg_prices'],
+                last_prices=data['last_prices'],
+                realized=data['realized'],
+                trade_chunks=[np.load(os.path.join(directory, _TRADES.format(chunk)), mmap_mode='r')
+                              for chunk in chunk_generations],
+                chunk_generations=chunk_generations,
+            )
+
+class Journal:
+    """
+    An append-only binary write-ahead log of broker fills with group commit.
+
+    append() packs a record into an in-memory buffer and returns (about a
+    microsecond); a background thread writes and fsyncs the buffer every
+    'flush_interval' seconds, so one fsync covers every fill since the last.
+    Call sync() to wait until everything appended so far is durable.
+
+    The log is split into generations. After 'snapshot_every' records the
+    writer switches to a new segment and hands the closed ones to a separate
+    compactor thread, so commits never wait for a snapshot. The compactor
+    folds the previous snapshot and the closed segments into a JournalState:
+    the fills of those segments go to trades-<gen>.npy as trade-log columns,
+    and positions and balance to snapshot-<gen>.npz. Earlier trades files are
+    never rewritten, so a snapshot costs the fills since the last one, not
+    the whole history, and load() memory-maps them. Superseded segments and
+    snapshots are only deleted once the new snapshot is on disk, so a crash
+    at any point leaves a recoverable set of files. A torn record at the end of a segment, and
+    anything after a break in the sequence numbers, is discarded on load.
+
+    If a write or fsync fails, the writer thread stops and the error is
+    raised from every later append() and sync(): nothing appended after it
+    can be made durable.
+    """
+
+    def __init__(self, directory: str, flush_interval: float = 0.005, snapshot_every: int = 1_000_000):
+        self.directory = directory
+        self.flush_interval = flush_interval
+        self.snapshot_every = snapshot_every
+        os.makedirs(directory, exist_ok=True)
+
+        generations = [_generation(path) for path in self._files("*")]
+        self._generation = max(generations, default=0) + 1
+        self._state, discarded = self._read_state(self._generation)
+        if discarded:
+            # Pin the recovered state, so records appended from here on
+            # never follow the discarded ones in a later recovery
+            self._state.save(directory, self._generation)
+            self._remove_before(self._generation)
+        # Trade chunks no snapshot lists are left over from an interrupted compaction
+        for path in self._files("trades-*.npy"):
+            if _generation(path) not in self._state.chunk_generations:
+                os.remove(path)
+        self._seq = self._state.seq
+        self.durable_seq = self._seq
+
+        # Always append to a fresh segment, so a torn tail is never extended
+        self._file = open(os.path.join(directory, _SEGMENT.format(self._generation)), "ab")
+        self._segment_records = 0
+
+        self._buffer = bytearray()
+        self._lock = threading.Lock()
+        self._durable = threading.Condition()
+        self._wake = threading.Event()
+        self._closed = False
+        self._error: Optional[BaseException] = None
+        self._thread = threading.Thread(target=self._run, name="journal-flusher", daemon=True)
+        self._thread.start()
+
+        self._compact_wake = threading.Event()
+        self._compact_pending = False
+        self._compactor_stopping = False
+        self._compactor = threading.Thread(target=self._run_compactor, name="journal-compactor", daemon=True)
+        self._compactor.start()
+
+    def _files(self, pattern: str) -> List[str]:
+        paths = [path for path in glob.glob(os.path.join(self.directory, pattern)) if _GENERATION.search(path)]
+        return sorted(paths, key=_generation)
+
+    def _remove_before(self, generation: int) -> None:
+        # Trade chunks are history, not superseded files, and are kept
+        for path in self._files("wal-*.log") + self._files("snapshot-*.npz"):
+            if _generation(path) < generation:
+                os.remove(path)
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+
+    def _read_state(self, before: int) -> Tuple[JournalState, bool]:
+        """
+        Folds the newest snapshot and the segments after it, up to generation
+        'before' (exclusive), into a JournalState. Also returns whether any
+        records were discarded as torn or out of sequence.
+        """
+        snapshots = [path for path in self._files("snapshot-*.npz") if _generation(path) <= before]
+        state = JournalState.load(self.directory, _generation(snapshots[-1])) if snapshots else JournalState.empty()
+        first_segment = _generation(snapshots[-1]) if snapshots else 0
+
+        parts = []
+        discarded = False
+        for path in self._files("wal-*.log"):
+            if not first_segment <= _generation(path) < before:
+                continue
+            size = os.path.getsize(path)
+            count = size // RECORD_DTYPE.itemsize
+            if count * RECORD_DTYPE.itemsize != size:
+                logging.warning(f"Discarding a torn record at the end of {path}.")
+                discarded = True
+            parts.append(np.fromfile(path, dtype=RECORD_DTYPE, count=count))
+        if not parts:
+            return state, discarded
+        records = parts[0] if len(parts) == 1 else np.concatenate(parts)
+
+        # Keep the longest prefix that continues the snapshot's sequence one
+        # by one; anything after a break was never acknowledged as durable.
+        expected = np.arange(state.seq + 1, state.seq + 1 + len(records))
+        breaks = np.flatnonzero(records['seq'] != expected)
+        if len(breaks):
+            logging.warning(f"Journal sequence break after record {state.seq + breaks[0]}; ignoring the rest.")
+            records = records[:breaks[0]]
+            discarded = True
+        return state.fold(records), discarded
+
+    def load(self) -> JournalState:
+        """
+        Returns the durable state found when the journal was opened.
+        """
+        return self._state
+
+    # ------------------------------------------------------------------
+    # Writing
+    # ------------------------------------------------------------------
+
+    def append(self, timestamp_us: int, symbol: str, order_code: int, quantity: float, price: float,
+               qty_after: float, avg_after: float, balance_after: float, realized_after: float) -> int:
+        """
+        Queues one fill record and returns its sequence number. It becomes
+        durable on the next group commit. Raises the writer's error if a
+        commit has failed.
+        """
+        encoded = symbol.encode()
+        if len(encoded) > 24:
+            raise ValueError(f"Symbol too long for the journal: {symbol}")
+        if self._error is not None:
+            raise self._error
+        with self._lock:
+            self._seq += 1
+            self._buffer += _RECORD.pack(self._seq, timestamp_us, encoded, order_code, quantity, price,
+                                         qty_after, avg_after, balance_after, realized_after)
+            return self._seq
+
+    def sync(self, timeout: Optional[float] = None) -> bool:
+        """
+        Blocks until every record appended so far is on disk.
+        Returns False on timeout, and raises the writer's error if a commit
+        failed before reaching them.
+        """
+        target = self._seq
+        self._wake.set()
+        with self._durable:
+            self._durable.wait_for(lambda: self.durable_seq >= target or self._error is not None, timeout)
+        if self.durable_seq >= target:
+            return True
+        if self._error is not None:
+            raise self._error
+        return False
+
+    def close(self) -> None:
+        """
+        Commits anything buffered, finishes any pending snapshot and stops
+        the background threads.
+        """
+        if self._closed:
+            return
+        self._closed = True
+        self._wake.set()
+        self._thread.join()
+        self._file.close()
+        self._compactor_stopping = True
+        self._compact_wake.set()
+        self._compactor.join()
+
+    def _run(self) -> None:
+        while True:
+            self._wake.wait(self.flush_interval)
+            self._wake.clear()
+            closing = self._closed
+            try:
+                self._commit()
+                if self._segment_records >= self.snapshot_every:
+                    self._rotate()
+            except Exception as e:
+                # The segment may now end in a partial write, so stop here
+                # rather than append after it; recovery drops the torn tail.
+                logging.exception("Journal commit failed; no further fills will be made durable")
+                with self._durable:
+                    self._error = e
+                    self._durable.notify_all()
+                break
+            if closing:
+                break
+
+    def _commit(self) -> None:
+        with self._lock:
+            if not self._buffer:
+                return
+            buffer, self._buffer = self._buffer, bytearray()
+            seq = self._seq
+
+        self._file.write(buffer)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._segment_records += len(buffer) // _RECORD.size
+
+        with self._durable:
+            self.durable_seq = seq
+            self._durable.notify_all()
+
+    def _rotate(self) -> None:
+        """
+        Starts a new segment and asks the compactor to snapshot the closed
+        ones. Runs on the writer thread, after a commit.
+        """
+        self._file.close()
+        self._generation += 1
+        self._file = open(os.path.join(self.directory, _SEGMENT.format(self._generation)), "ab")
+        self._segment_records = 0
+        self._compact_pending = True
+        self._compact_wake.set()
+
+    # ------------------------------------------------------------------
+    # Compaction
+    # ------------------------------------------------------------------
+
+    def _run_compactor(self) -> None:
+        while True:
+            self._compact_wake.wait()
+            self._compact_wake.clear()
+            while self._compact_pending:
+                self._compact_pending = False
+                try:
+                    self._compact(self._generation)
+                except Exception:
+                    logging.exception("Journal compaction failed; segments are kept for recovery")
+            if self._compactor_stopping:
+                break
+
+    def _compact(self, generation: int) -> None:
+        """
+        Folds every file older than 'generation' (all closed, since the
+        writer has moved on to that segment) into snapshot-<generation>.
+        """
+        state, _ = self._read_state(generation)
+        state.save(self.directory, generation)
+        self._remove_before(generation)
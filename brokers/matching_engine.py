@@ -0,0 +1,344 @@
+# brokers/matching_engine.py
+
+import heapq
+import itertools
+from collections import deque
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+
+import numpy as np
+
+from core.bars import BarWindow
+from core.models import OrderType
+
+MARKET = "market"
+LIMIT = "limit"
+STOP = "stop"
+STOP_LIMIT = "stop_limit"
+ORDER_KINDS = (MARKET, LIMIT, STOP, STOP_LIMIT)
+
+OPEN = "open"
+FILLED = "filled"
+CANCELLED = "cancelled"
+
+BUY_TYPES = frozenset({OrderType.BUY, OrderType.BUY_CALL, OrderType.BUY_PUT})
+SELL_TYPES = frozenset({OrderType.SELL, OrderType.SELL_CALL, OrderType.SELL_PUT})
+
+_INF = float("inf")
+
+@dataclass
+class Order:
+    __slots__ = ('order_id', 'symbol', 'order_type', 'is_buy', 'kind', 'quantity',
+                 'limit_price', 'stop_price', 'timestamp', 'filled', 'status')
+
+    order_id: int
+    symbol: str
+    order_type: OrderType
+    is_buy: bool
+    kind: str
+    quantity: float
+    limit_price: Optional[float]
+    stop_price: Optional[float]
+    timestamp: Optional[datetime]
+    filled: float
+    status: str
+
+    @property
+    def remaining(self) -> float:
+        return self.quantity - self.filled
+
+# Fill listener: (order, fill quantity, fill price, timestamp)
+FillListener = Callable[[Order, float, float, Optional[datetime]], None]
+
+class _OrderBook:
+    """
+    Resting orders for one symbol. Heap entries are (key, order_id, order), so
+    ties on price are broken by arrival order (price-time priority).
+    Cancelled orders stay in the heaps and are skipped when they reach the top.
+    """
+
+    __slots__ = ('bids', 'asks', 'buy_stops', 'sell_stops', 'pending', 'last_price')
+
+    def __init__(self):
+        self.bids: list = []        # (-limit, id, order)
+        self.asks: list = []        # (limit, id, order)
+        self.buy_stops: list = []   # (stop, id, order): trigger when price >= stop
+        self.sell_stops: list = []  # (-stop, id, order): trigger when price <= stop
+        self.pending: deque = deque()  # market orders waiting for a price
+        self.last_price: Optional[float] = None
+
+def _datetimes(timestamps, n: int) -> list:
+    """
+    Converts a timestamp array into a list of datetimes (None for NaT) once,
+    so fill listeners receive the same type as from submit/on_bar.
+    """
+    if timestamps is None:
+        return [None] * n
+    values = np.asarray(timestamps)
+    if np.issubdtype(values.dtype, np.datetime64):
+        return values.astype("datetime64[us]").tolist()
+    return list(values)
+
+def _top(heap: list):
+    while heap and heap[0][2].status != OPEN:
+        heapq.heappop(heap)
+    return heap[0] if heap else None
+
+class MatchingEngine:
+    """
+    A simulated exchange with a price-time-priority order book per symbol.
+
+    Orders are market, limit, stop or stop-limit, and may fill partially.
+    An incoming order first crosses resting orders on the other side at their
+    prices while those beat the last market price, then takes the market at
+    the last price (with unlimited size) if it is marketable; any remainder
+    rests in the book. Market data (on_tick, on_bar) triggers stops and fills
+    resting orders it trades through, limited to 'participation' of the event's
+    volume, so large orders fill partially across several bars.
+
+    The engine only matches; settlement is left to fill listeners such as
+    PaperBroker. Not thread-safe: drive it from one thread.
+    """
+
+    def __init__(self, participation: float = 1.0):
+        self.participation = participation
+        self.fill_count = 0
+        self._books: Dict[str, _OrderBook] = {}
+        self._orders: Dict[int, Order] = {}
+        self._ids = itertools.count(1)
+        self._listeners: List[FillListener] = []
+
+    def subscribe(self, listener: FillListener) -> None:
+        self._listeners.append(listener)
+
+    def _book(self, symbol: str) -> _OrderBook:
+        book = self._books.get(symbol)
+        if book is None:
+            book = self._books[symbol] = _OrderBook()
+        return book
+
+    # ------------------------------------------------------------------
+    # Orders
+    # ------------------------------------------------------------------
+
+    def submit(self, symbol: str, order_type: OrderType, quantity: float, kind: str = MARKET,
+               limit_price: Optional[float] = None, stop_price: Optional[float] = None,
+               timestamp: Optional[datetime] = None) -> Order:
+        """
+        Submits an order and matches it immediately where possible.
+        Returns the Order, whose 'filled' and 'status' reflect the result.
+        """
+        if order_type in BUY_TYPES:
+            is_buy = True
+        elif order_type in SELL_TYPES:
+            is_buy = False
+        else:
+            raise ValueError(f"Order type {order_type} cannot be submitted.")
+        if kind not in ORDER_KINDS:
+            raise ValueError(f"Unknown order kind: {kind}")
+        if quantity <= 0:
+            raise ValueError("Order quantity must be positive.")
+        if kind in (LIMIT, STOP_LIMIT) and limit_price is None:
+            raise ValueError(f"A {kind} order needs a limit_price.")
+        if kind in (STOP, STOP_LIMIT) and stop_price is None:
+            raise ValueError(f"A {kind} order needs a stop_price.")
+
+        order = Order(next(self._ids), symbol, order_type, is_buy, kind, float(quantity),
+                      limit_price, stop_price, timestamp, 0.0, OPEN)
+        self._orders[order.order_id] = order
+        book = self._book(symbol)
+
+        if kind == STOP or kind == STOP_LIMIT:
+            last = book.last_price
+            if last is not None and (last >= stop_price if is_buy else last <= stop_price):
+                self._trigger(book, order)
+            elif is_buy:
+                heapq.heappush(book.buy_stops, (stop_price, order.order_id, order))
+            else:
+                heapq.heappush(book.sell_stops, (-stop_price, order.order_id, order))
+            if order.kind == STOP or order.kind == STOP_LIMIT:
+                return order
+
+        self._activate(book, order, timestamp)
+        return order
+
+    def cancel(self, order_id: int) -> Optional[Order]:
+        """
+        Cancels an open order. Returns it, or None if it is no longer open.
+        """
+        order = self._orders.pop(order_id, None)
+        if order is None:
+            return None
+        order.status = CANCELLED
+        return order
+
+    def open_orders(self, symbol: Optional[str] = None) -> List[Order]:
+        return [order for order in self._orders.values() if symbol is None or order.symbol == symbol]
+
+    def last_price(self, symbol: str) -> Optional[float]:
+        book = self._books.get(symbol)
+        return None if book is None else book.last_price
+
+    def _trigger(self, book: _OrderBook, order: Order) -> None:
+        # A triggered stop becomes a market order, a stop-limit a limit order
+        order.kind = MARKET if order.kind == STOP else LIMIT
+
+    def _activate(self, book: _OrderBook, order: Order, timestamp: Optional[datetime]) -> None:
+        """
+        Matches a market or limit order on arrival, then rests any remainder.
+        """
+        is_buy = order.is_buy
+        limit = order.limit_price if order.kind == LIMIT else None
+        contra = book.asks if is_buy else book.bids
+        last = book.last_price
+        external = last is not None and (limit is None or (last <= limit if is_buy else last >= limit))
+
+        while order.status == OPEN:
+            top = _top(contra)
+            if top is not None:
+                resting = top[2]
+                price = resting.limit_price
+                crosses = limit is None or (price <= limit if is_buy else price >= limit)
+                beats_market = not external or (price <= last if is_buy else price >= last)
+                if crosses and beats_market:
+                    quantity = min(order.quantity - order.filled, resting.quantity - resting.filled)
+                    self._fill(resting, quantity, price, timestamp)
+                    self._fill(order, quantity, price, timestamp)
+                    continue
+            if external:
+                self._fill(order, order.quantity - order.filled, last, timestamp)
+            break
+
+        if order.status == OPEN:
+            if limit is None:
+                book.pending.append(order)
+            elif is_buy:
+                heapq.heappush(book.bids, (-limit, order.order_id, order))
+            else:
+                heapq.heappush(book.asks, (limit, order.order_id, order))
+
+    def _fill(self, order: Order, quantity: float, price: float, timestamp: Optional[datetime]) -> None:
+        order.filled += quantity
+        if order.filled >= order.quantity:
+            order.filled = order.quantity
+            order.status = FILLED
+            self._orders.pop(order.order_id, None)
+        self.fill_count += 1
+        for listener in self._listeners:
+            listener(order, quantity, price, timestamp)
+
+    # ------------------------------------------------------------------
+    # Market data
+    # ------------------------------------------------------------------
+
+    def on_tick(self, symbol: str, price: float, size: float = _INF,
+                timestamp: Optional[datetime] = None) -> None:
+        """
+        Processes one trade print: triggers stops at or through 'price' and
+        fills orders it trades through, up to participation * size.
+        """
+        self._on_market(self._book(symbol), price, price, price, price, size, timestamp)
+
+    def on_bar(self, symbol: str, open_price: float, high: float, low: float, close: float,
+               volume: float = _INF, timestamp: Optional[datetime] = None) -> None:
+        """
+        Processes one OHLCV bar. Waiting market orders fill at the open; stops
+        and limits fill at their price, or at the open when it gapped through.
+        A volume of zero or NaN means unlimited liquidity.
+        """
+        self._on_market(self._book(symbol), open_price, high, low, close, volume, timestamp)
+
+    def _on_market(self, book: _OrderBook, open_price: float, high: float, low: float,
+                   close: float, volume: float, timestamp: Optional[datetime]) -> None:
+        available = volume * self.participation if volume > 0 else _INF
+        book.last_price = open_price
+
+        if book.bids or book.asks or book.buy_stops or book.sell_stops or book.pending:
+            # 1. Market orders waiting for a price fill at the open
+            pending = book.pending
+            while pending and available > 0:
+                order = pending[0]
+                if order.status == OPEN:
+                    quantity = min(order.quantity - order.filled, available)
+                    available -= quantity
+                    self._fill(order, quantity, open_price, timestamp)
+                if order.status != OPEN:
+                    pending.popleft()
+
+            # 2. Stops traded through become market or limit orders
+            triggered = []
+            buy_stops, sell_stops = book.buy_stops, book.sell_stops
+            while _top(buy_stops) is not None and buy_stops[0][0] <= high:
+                triggered.append(heapq.heappop(buy_stops)[2])
+            while _top(sell_stops) is not None and -sell_stops[0][0] >= low:
+                triggered.append(heapq.heappop(sell_stops)[2])
+            triggered.sort(key=lambda order: order.order_id)
+            for order in triggered:
+                self._trigger(book, order)
+                is_buy = order.is_buy
+                price = max(open_price, order.stop_price) if is_buy else min(open_price, order.stop_price)
+                # A stop-limit that gapped past its limit rests without filling
+                within_limit = order.kind == MARKET or (price <= order.limit_price if is_buy else price >= order.limit_price)
+                if available > 0 and within_limit:
+                    quantity = min(order.quantity - order.filled, available)
+                    available -= quantity
+                    self._fill(order, quantity, price, timestamp)
+                if order.status != OPEN:
+                    continue
+                if order.kind == MARKET:
+                    pending.append(order)
+                elif is_buy:
+                    heapq.heappush(book.bids, (-order.limit_price, order.order_id, order))
+                else:
+                    heapq.heappush(book.asks, (order.limit_price, order.order_id, order))
+
+            # 3. Resting limits the price traded through, best price first
+            bids = book.bids
+            while available > 0 and _top(bids) is not None and -bids[0][0] >= low:
+                order = bids[0][2]
+                quantity = min(order.quantity - order.filled, available)
+                available -= quantity
+                self._fill(order, quantity, min(order.limit_price, open_price), timestamp)
+            asks = book.asks
+            while available > 0 and _top(asks) is not None and asks[0][0] <= high:
+                order = asks[0][2]
+                quantity = min(order.quantity - order.filled, available)
+                available -= quantity
+                self._fill(order, quantity, max(order.limit_price, open_price), timestamp)
+
+        book.last_price = close
+
+    # ------------------------------------------------------------------
+    # Replay
+    # ------------------------------------------------------------------
+
+    def replay_bars(self, symbol: str, bars: BarWindow,
+                    callback: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Feeds every bar of 'bars' through on_bar. After each bar, callback(i)
+        may submit or cancel orders, which then match against that bar's close.
+        """
+        book = self._book(symbol)
+        timestamps = _datetimes(bars.timestamp, len(bars.close))
+        columns = zip(bars.open.tolist(), bars.high.tolist(), bars.low.tolist(),
+                      bars.close.tolist(), bars.volume.tolist())
+        for i, (open_price, high, low, close, volume) in enumerate(columns):
+            self._on_market(book, open_price, high, low, close, volume, timestamps[i])
+            if callback is not None:
+                callback(i)
+
+    def replay_ticks(self, symbol: str, prices: np.ndarray, sizes: Optional[np.ndarray] = None,
+                     timestamps: Optional[np.ndarray] = None,
+                     callback: Optional[Callable[[int], None]] = None) -> None:
+        """
+        Feeds a tick series through on_tick; see replay_bars for 'callback'.
+        """
+        book = self._book(symbol)
+        prices = np.asarray(prices, dtype=float).tolist()
+        sizes = [_INF] * len(prices) if sizes is None else np.asarray(sizes, dtype=float).tolist()
+        timestamps = _datetimes(timestamps, len(prices))
+        for i, (price, size, timestamp) in enumerate(zip(prices, sizes, timestamps)):
+            self._on_market(book, price, price, price, price, size, timestamp)
+            if callback is not None:
+                callback(i)
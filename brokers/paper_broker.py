@@ -1,72 +1,189 @@
 # brokers/paper_broker.py
 
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
+import numpy as np
+
+from brokers.journal import Journal, JournalState
+from brokers.matching_engine import BUY_TYPES, MARKET, SELL_TYPES, MatchingEngine, Order
 from core.interfaces import IBroker
-from core.models import Trade, OrderType, Position
+from core.models import OrderType, Position
+from core.portfolio import QUANTITY_EPSILON, Portfolio
+from core.trade_log import ORDER_CODES, TradeLog, to_epoch_us
 
 class PaperBroker(IBroker):
     """
-    A paper trading broker that simulates trades in memory.
+    A paper trading broker that simulates trades in memory, optionally
+    routing orders through a MatchingEngine for realistic fills.
     """
 
-    def __init__(self, starting_balance: float = 100000.0):
+    def __init__(self, starting_balance: float = 100000.0, engine: Optional[MatchingEngine] = None,
+                 journal: Optional[Journal] = None):
         self.balance = starting_balance
-        self.trades: List[Trade] = []
+        # Columnar journal of every fill; indexes and iterates like a list of Trade
+        self.trades = TradeLog()
         # positions dict keyed by symbol, value is a Position object
         self.positions: Dict[str, Position] = {}
+        # Running portfolio aggregates, maintained on every fill so risk
+        # checks can read them in O(1) instead of walking every position.
+        self.gross_exposure = 0.0       # sum of quantity * avg_price
+        self.open_position_count = 0    # positions with quantity > 0
+        # Array-backed valuation of the same positions, for equity and PnL
+        self.portfolio = Portfolio(starting_balance)
+        # With a MatchingEngine, orders fill at simulated market prices and
+        # settle cash; without one, place_order keeps the instant mock fill.
+        self.engine = engine
+        # Sell quantity still working in the engine, per symbol, so open
+        # orders can never sell more than the position
+        self._working_sells: Dict[str, float] = {}
+        if engine is not None:
+            engine.subscribe(self._on_engine_fill)
+        # Optional write-ahead journal: every fill is logged, and state is
+        # restored from it on construction
+        self.journal = journal
+        if journal is not None:
+            self._restore(journal.load())
+
+    def _restore(self, state: JournalState) -> None:
+        """
+        Rebuilds trades, positions, balance and portfolio from the state the
+        journal recovered, in a few vectorized passes.
+        """
+        if len(state) == 0:
+            return
+
+        symbols = state.symbols
+        self.trades = TradeLog.from_columns(
+            state.trade_column('timestamp'), symbols, state.trade_column('symbol_id'),
+            state.trade_column('order_code'), state.trade_column('quantity'), state.trade_column('price'),
+        )
+        self.balance = state.balance
+        self.positions = {
+            symbol: Position(symbol=symbol, quantity=quantity, avg_price=avg_price)
+            for symbol, quantity, avg_price in zip(symbols, state.quantities.tolist(), state.avg_prices.tolist())
+        }
+        self.portfolio.load_state(symbols, state.quantities, state.avg_prices, state.last_prices, state.realized)
+        self.gross_exposure = float(np.dot(state.quantities, state.avg_prices))
+        self.open_position_count = int((state.quantities > 0).sum())
 
     def place_order(self, symbol: str, order_type: OrderType, quantity: float) -> None:
         """
-        Simulates placing an order by recording a Trade and updating positions.
-        For simplicity, assumes price is a mock or not tracked dynamically.
+        Simulates placing an order by recording a fill and updating positions.
+        With a MatchingEngine, this submits a market order instead (see submit_order).
         """
+        if self.engine is not None:
+            if order_type in BUY_TYPES or order_type in SELL_TYPES:
+                self.submit_order(symbol, order_type, quantity)
+            return
+
         # For a paper broker, we might simulate a fill price or assume a certain price.
         # Here, we'll just mock the price as 100.0 for illustration.
         mock_price = 100.0
-        
-        trade = Trade(
-            symbol=symbol,
-            order_type=order_type,
-            quantity=quantity,
-            price=mock_price,
-            timestamp=datetime.now()
-        )
-        self.trades.append(trade)
+
+        # Note: For a more complete paper trading simulation, we would
+        # also update self.balance based on the cost or proceeds of the trade
+        # (orders routed through a MatchingEngine do).
+        self._record_fill(symbol, order_type, quantity, mock_price, datetime.now(), settle_cash=False)
+
+    def submit_order(self, symbol: str, order_type: OrderType, quantity: float, kind: str = MARKET,
+                     limit_price: Optional[float] = None, stop_price: Optional[float] = None,
+                     timestamp: Optional[datetime] = None) -> Order:
+        """
+        Sends a market, limit, stop or stop-limit order to the MatchingEngine.
+        Fills, possibly partial and possibly later, settle through _record_fill.
+        """
+        if self.engine is None:
+            raise ValueError("submit_order requires a PaperBroker with a MatchingEngine.")
+
+        if order_type in SELL_TYPES:
+            position = self.positions.get(symbol)
+            held = position.quantity if position is not None else 0.0
+            working = self._working_sells.get(symbol, 0.0)
+            if quantity > held - working + QUANTITY_EPSILON:
+                raise ValueError("Cannot sell more than current position quantity.")
+            self._working_sells[symbol] = working + quantity
+
+        try:
+            return self.engine.submit(symbol, order_type, quantity, kind, limit_price, stop_price, timestamp)
+        except ValueError:
+            if order_type in SELL_TYPES:
+                self._working_sells[symbol] -= quantity
+            raise
+
+    def cancel_order(self, order_id: int) -> bool:
+        """
+        Cancels an open engine order. Returns False if it is no longer open.
+        """
+        order = self.engine.cancel(order_id) if self.engine is not None else None
+        if order is None:
+            return False
+        if not order.is_buy:
+            self._working_sells[order.symbol] -= order.quantity - order.filled
+        return True
+
+    def _on_engine_fill(self, order: Order, quantity: float, price: float, timestamp: Optional[datetime]) -> None:
+        if not order.is_buy:
+            self._working_sells[order.symbol] -= quantity
+        self._record_fill(order.symbol, order.order_type, quantity, price, timestamp or datetime.now())
+
+    def _record_fill(self, symbol: str, order_type: OrderType, quantity: float, price: float,
+                     timestamp: datetime, settle_cash: bool = True) -> None:
+        """
+        Journals one fill and applies it to the position, the running
+        aggregates and, if 'settle_cash', the cash balance.
+        """
+        self.trades.record(symbol, order_type, quantity, price, timestamp)
 
         # Update the position
         if symbol not in self.positions:
             self.positions[symbol] = Position(symbol=symbol, quantity=0.0, avg_price=0.0)
 
         position = self.positions[symbol]
+        old_exposure = position.quantity * position.avg_price
+        was_open = position.quantity > 0
 
-        if order_type in (OrderType.BUY, OrderType.BUY_CALL, OrderType.BUY_PUT):
+        if order_type in BUY_TYPES:
             # Increase position
             new_quantity = position.quantity + quantity
             # Recalculate avg price (weighted)
             if position.quantity == 0:
-                new_avg_price = mock_price
+                new_avg_price = price
             else:
                 new_avg_price = (
-                    (position.quantity * position.avg_price) + (quantity * mock_price)
+                    (position.quantity * position.avg_price) + (quantity * price)
                 ) / new_quantity
 
             position.quantity = new_quantity
             position.avg_price = new_avg_price
+            self.portfolio.apply_fill(symbol, quantity, price)
+            if settle_cash:
+                self.balance -= quantity * price
 
-        elif order_type in (OrderType.SELL, OrderType.SELL_CALL, OrderType.SELL_PUT):
+        elif order_type in SELL_TYPES:
             # Decrease position
             new_quantity = position.quantity - quantity
-            if new_quantity < 0:
+            if new_quantity <= -QUANTITY_EPSILON:
                 raise ValueError("Cannot sell more than current position quantity.")
-            position.quantity = new_quantity
+            position.quantity = new_quantity if new_quantity >= QUANTITY_EPSILON else 0.0
             # If we close out the position, reset avg_price
             if position.quantity == 0:
                 position.avg_price = 0.0
+            self.portfolio.apply_fill(symbol, -quantity, price)
+            if settle_cash:
+                self.balance += quantity * price
 
-        # Note: For a more complete paper trading simulation, we would
-        # also update self.balance based on the cost or proceeds of the trade.
+        # Keep the aggregates in step with the updated position
+        self.gross_exposure += position.quantity * position.avg_price - old_exposure
+        self.open_position_count += int(position.quantity > 0) - int(was_open)
+        if self.open_position_count == 0:
+            # Flat book: drop any floating-point residue from the running sum
+            self.gross_exposure = 0.0
+
+        if self.journal is not None:
+            realized = self.portfolio.realized[self.portfolio.symbol_id(symbol)]
+            self.journal.append(to_epoch_us(timestamp), symbol, ORDER_CODES[order_type], quantity, price,
+                                position.quantity, position.avg_price, self.balance, realized)
 
     def get_positions(self) -> List[Position]:
         """
@@ -74,6 +191,19 @@ class PaperBroker(IBroker):
         """
         return list(self.positions.values())
 
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """
+        Returns the position for 'symbol', or None if it has never been traded.
+        """
+        return self.positions.get(symbol)
+
+    def has_position(self, symbol: str) -> bool:
+        """
+        Returns True if there is an open (non-zero) position in 'symbol'.
+        """
+        position = self.positions.get(symbol)
+        return position is not None and position.quantity > 0
+
     def get_balance(self) -> float:
         """
         Returns the current cash balance (mock).
@@ -81,3 +211,18 @@ class PaperBroker(IBroker):
         unrealized PnL, or we could calculate it directly.
         """
         return self.balance
+
+    def get_equity(self) -> float:
+        """
+        Returns starting balance plus realized and unrealized PnL, with
+        positions valued at their latest marks (see update_prices).
+        """
+        return self.portfolio.equity
+
+    def update_prices(self, prices, timestamp: Optional[datetime] = None) -> float:
+        """
+        Revalues every position against 'prices' ({symbol: price}, a Series,
+        or an array aligned with portfolio.symbols) in one vectorized pass,
+        records a point in the equity history, and returns the equity.
+        """
+        return self.portfolio.mark_to_market(prices, timestamp)
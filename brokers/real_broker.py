@@ -1,24 +1,101 @@
 # brokers/real_broker.py
 
-from typing import List
+import asyncio
+import logging
+import os
+import threading
+from typing import List, Optional, Tuple
 
+from brokers.broker_client import AsyncBrokerClient
+from brokers.matching_engine import BUY_TYPES, SELL_TYPES
 from core.interfaces import IBroker
 from core.models import OrderType, Position
 
 class RealBroker(IBroker):
     """
-    A skeleton for a live broker implementation, e.g. Alpaca, Interactive Brokers, etc.
-    Currently, methods are stubs or raise NotImplementedError.
+    A live broker backed by a REST API through AsyncBrokerClient.
+
+    The client runs on a private event loop in a daemon thread; the IBroker
+    methods submit coroutines to it and block on the result, so the broker
+    can be called from any thread. Orders placed concurrently (e.g. by the
+    trading cycle's executor threads) are sent as one batch request, and
+    positions/balance reads are served from a short-lived account snapshot.
+
+    Settings come from the 'real_broker' config section; the API key is
+    read from the environment variable named by 'api_key_env'.
     """
 
+    concurrent_orders = True
+
+    def __init__(self, config: dict = None):
+        settings = (config or {}).get("real_broker", {})
+        api_key = os.environ.get(settings.get("api_key_env", "BROKER_API_KEY"))
+
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, name="real-broker", daemon=True)
+        self._thread.start()
+
+        async def create_client():
+            # The client's locks and semaphores bind to the loop they are created on
+            return AsyncBrokerClient(
+                settings.get("base_url", "http://127.0.0.1:8765"),
+                api_key=api_key,
+                max_connections=settings.get("max_connections", 8),
+                rate_limit=settings.get("rate_limit", 50.0),
+                burst=settings.get("burst", 100),
+                snapshot_ttl=settings.get("snapshot_ttl", 1.0),
+                batch_window=settings.get("batch_window_ms", 2) / 1000.0,
+                max_batch_size=settings.get("max_batch_size", 100),
+                timeout=settings.get("timeout", 5.0),
+            )
+
+        self.client = self._call(create_client())
+        if settings.get("stream_events", False):
+            self._loop.call_soon_threadsafe(self.client.start_stream, self._on_event)
+
+    def _call(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self._loop).result()
+
+    def _on_event(self, event: dict) -> None:
+        logging.debug(f"Broker event: {event}")
+
     def place_order(self, symbol: str, order_type: OrderType, quantity: float) -> None:
-        # Here you'd integrate with a real brokerage API to place the order.
-        raise NotImplementedError("Live order placement not implemented yet.")
+        if order_type not in BUY_TYPES and order_type not in SELL_TYPES:
+            return  # HOLD: nothing to send
+        result = self._call(self.client.place_order(symbol, order_type, quantity))
+        logging.info(
+            f"[RealBroker] {order_type.value} {quantity} of {symbol} "
+            f"-> order {result.get('order_id')} {result.get('status')}"
+        )
+
+    def place_orders(self, orders: List[Tuple[str, OrderType, float]]) -> List[Optional[dict]]:
+        """
+        Submits (symbol, order_type, quantity) orders in as few batch requests
+        as possible. Returns one result per order; rejections are reported in
+        the results, not raised. HOLD orders are not sent and get None.
+        """
+        tradable = [i for i, (_, order_type, _) in enumerate(orders)
+                    if order_type in BUY_TYPES or order_type in SELL_TYPES]
+        results: List[Optional[dict]] = [None] * len(orders)
+        if tradable:
+            sent = self._call(self.client.place_orders([orders[i] for i in tradable]))
+            for i, result in zip(tradable, sent):
+                results[i] = result
+        return results
 
     def get_positions(self) -> List[Position]:
-        # Here you'd fetch positions from the brokerage API.
-        raise NotImplementedError("Fetching live positions not implemented yet.")
+        return self._call(self.client.positions())
 
     def get_balance(self) -> float:
-        # Here you'd fetch the current account balance from the brokerage API.
-        raise NotImplementedError("Fetching live balance not implemented yet.")
+        return self._call(self.client.balance())
+
+    def get_equity(self) -> float:
+        return self._call(self.client.account())["equity"]
+
+    def close(self) -> None:
+        if self._loop.is_closed():
+            return
+        self._call(self.client.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
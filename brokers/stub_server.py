@@ -0,0 +1,237 @@
+# brokers/stub_server.py
+"""
+A local stand-in for a REST broker API, for exercising RealBroker and
+AsyncBrokerClient without a brokerage account:
+
+    python -m brokers.stub_server --port 8765
+
+Orders fill immediately at a fixed price per symbol. The server speaks
+HTTP/1.1 with keep-alive and counts connections and requests, so tests can
+check that clients reuse connections, batch orders and cache reads.
+"""
+
+import argparse
+import asyncio
+import json
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from brokers.broker_client import read_headers
+
+_REASONS = {200: "OK", 400: "Bad Request", 401: "Unauthorized", 404: "Not Found", 429: "Too Many Requests"}
+
+BUY_TYPES = {"BUY", "BUY_CALL", "BUY_PUT"}
+SELL_TYPES = {"SELL", "SELL_CALL", "SELL_PUT"}
+
+class StubBrokerServer:
+    """
+    In-memory broker behind GET /v1/account, POST /v1/orders,
+    POST /v1/orders/batch and GET /v1/stream (newline-delimited JSON fill
+    events). If 'api_key' is set, requests must send it as a bearer token;
+    if 'rate_limit' is set, more requests than that per second get 429.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, starting_balance: float = 100000.0,
+                 prices: Optional[Dict[str, float]] = None, default_price: float = 100.0,
+                 api_key: Optional[str] = None, rate_limit: Optional[float] = None, latency: float = 0.0):
+        self.host = host
+        self.port = port
+        self.balance = starting_balance
+        self.prices = dict(prices or {})
+        self.default_price = default_price
+        self.api_key = api_key
+        self.rate_limit = rate_limit
+        self.latency = latency
+        self.positions: Dict[str, Dict[str, float]] = {}
+        self.connections = 0
+        self.requests: Counter = Counter()
+        self._next_order_id = 1
+        self._window_start = time.monotonic()
+        self._window_count = 0
+        self._subscribers: List[asyncio.Queue] = []
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for queue in self._subscribers:
+                queue.put_nowait(None)  # ends the stream
+            await self._server.wait_closed()
+            self._server = None
+
+    def start_in_thread(self) -> str:
+        """
+        Runs the server on its own event loop thread and returns its base URL.
+        """
+        started = threading.Event()
+
+        def run():
+            self._loop = asyncio.new_event_loop()
+            self._loop.run_until_complete(self.start())
+            started.set()
+            self._loop.run_forever()
+
+        self._thread = threading.Thread(target=run, name="stub-broker", daemon=True)
+        self._thread.start()
+        started.wait()
+        return self.base_url
+
+    def stop_thread(self) -> None:
+        if self._loop is None:
+            return
+        asyncio.run_coroutine_threadsafe(self.stop(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop = None
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    request_line = await reader.readuntil(b"\r\n")
+                except (asyncio.IncompleteReadError, ConnectionError):
+                    break
+                method, target, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = await read_headers(reader)
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                self.requests[f"{method} {target}"] += 1
+
+                if target.endswith("/v1/stream") and method == "GET":
+                    await self._stream(writer)
+                    break
+
+                status, payload = self._route(method, target, headers, body)
+                if self.latency:
+                    await asyncio.sleep(self.latency)
+                data = json.dumps(payload).encode()
+                keep_alive = headers.get("connection", "keep-alive").lower() != "close"
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\nContent-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        finally:
+            writer.close()
+
+    async def _stream(self, writer: asyncio.StreamWriter) -> None:
+        writer.write(b"HTTP/1.1 200 OK\r\nContent-Type: application/x-ndjson\r\nConnection: close\r\n\r\n")
+        await writer.drain()
+        queue: asyncio.Queue = asyncio.Queue()
+        self._subscribers.append(queue)
+        try:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                writer.write(json.dumps(event).encode() + b"\n")
+                await writer.drain()
+        except (ConnectionError, asyncio.CancelledError):
+            pass
+        finally:
+            self._subscribers.remove(queue)
+
+    def _route(self, method: str, target: str, headers: Dict[str, str], body: bytes):
+        if self.api_key and headers.get("authorization") != f"Bearer {self.api_key}":
+            return 401, {"error": "Invalid API key."}
+        if self.rate_limit is not None and not self._admit():
+            return 429, {"error": "Rate limit exceeded."}
+
+        payload = json.loads(body) if body else None
+        if method == "GET" and target.endswith("/v1/account"):
+            return 200, self._account()
+        if method == "POST" and target.endswith("/v1/orders"):
+            return 200, self._execute(payload)
+        if method == "POST" and target.endswith("/v1/orders/batch"):
+            return 200, {"results": [self._execute(order) for order in payload["orders"]]}
+        return 404, {"error": f"No route for {method} {target}."}
+
+    def _admit(self) -> bool:
+        now = time.monotonic()
+        if now - self._window_start >= 1.0:
+            self._window_start = now
+            self._window_count = 0
+        self._window_count += 1
+        return self._window_count <= self.rate_limit
+
+    # ------------------------------------------------------------------
+    # Broker state
+    # ------------------------------------------------------------------
+
+    def _account(self) -> dict:
+        positions = [
+            {"symbol": symbol, "quantity": p["quantity"], "avg_price": p["avg_price"]}
+            for symbol, p in self.positions.items() if p["quantity"] > 0
+        ]
+        market_value = sum(p["quantity"] * self.prices.get(p["symbol"], self.default_price) for p in positions)
+        return {"balance": self.balance, "equity": self.balance + market_value, "positions": positions}
+
+    def _execute(self, order: dict) -> dict:
+        symbol, order_type, quantity = order["symbol"], order["order_type"], float(order["quantity"])
+        order_id = self._next_order_id
+        self._next_order_id += 1
+        price = self.prices.get(symbol, self.default_price)
+        position = self.positions.setdefault(symbol, {"quantity": 0.0, "avg_price": 0.0})
+
+        if quantity <= 0 or (order_type not in BUY_TYPES and order_type not in SELL_TYPES):
+            return {"order_id": order_id, "status": "rejected", "reason": "Invalid order."}
+        if order_type in BUY_TYPES:
+            total = position["quantity"] + quantity
+            position["avg_price"] = (position["quantity"] * position["avg_price"] + quantity * price) / total
+            position["quantity"] = total
+            self.balance -= quantity * price
+        else:
+            if quantity > position["quantity"]:
+                return {"order_id": order_id, "status": "rejected", "reason": "Insufficient position."}
+            position["quantity"] -= quantity
+            if position["quantity"] == 0:
+                position["avg_price"] = 0.0
+            self.balance += quantity * price
+
+        fill = {"order_id": order_id, "status": "filled", "symbol": symbol, "order_type": order_type,
+                "quantity": quantity, "price": price}
+        for queue in self._subscribers:
+            queue.put_nowait({"type": "fill", **fill})
+        return fill
+
+def main(argv: List[str] = None) -> None:
+    parser = argparse.ArgumentParser(description="Run a local stub broker API.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--balance", type=float, default=100000.0)
+    parser.add_argument("--price", type=float, default=100.0, help="Fill price for every symbol.")
+    parser.add_argument("--api-key", help="Require this bearer token.")
+    parser.add_argument("--rate-limit", type=float, help="Requests per second before answering 429.")
+    args = parser.parse_args(argv)
+
+    server = StubBrokerServer(args.host, args.port, args.balance, default_price=args.price,
+                              api_key=args.api_key, rate_limit=args.rate_limit)
+
+    async def serve():
+        await server.start()
+        print(f"Stub broker listening on {server.base_url}")
+        await asyncio.Event().wait()
+
+    asyncio.run(serve())
+
+if __name__ == "__main__":
+    main()
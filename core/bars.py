@@ -0,0 +1,129 @@
+# core/bars.py
+
+from typing import Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+# The canonical bar schema, in column order
+BAR_FIELDS = ("timestamp", "open", "high", "low", "close", "volume")
+
+# Fields passed to ML models as the feature vector of a bar
+FEATURE_FIELDS = ("open", "high", "low", "close", "volume")
+
+# Lower-cased source column name -> canonical field. Covers fetch_data's
+# Date/Open/.../Volume columns and MarketData's *_price attribute names.
+_COLUMN_ALIASES = {
+    "timestamp": "timestamp",
+    "date": "timestamp",
+    "datetime": "timestamp",
+    "time": "timestamp",
+    "open": "open",
+    "open_price": "open",
+    "high": "high",
+    "high_price": "high",
+    "low": "low",
+    "low_price": "low",
+    "close": "close",
+    "close_price": "close",
+    "volume": "volume",
+}
+
+def _float_array(values, n: int) -> np.ndarray:
+    if values is None:
+        return np.full(n, np.nan)
+    return np.ascontiguousarray(values, dtype=np.float64)
+
+class BarWindow:
+    """
+    A window of OHLCV bars for one symbol, stored as contiguous NumPy arrays
+    (one per field of BAR_FIELDS) under a single lower-case schema.
+
+    Strategies read fields as plain arrays (window.close[-1], window.close[-15:])
+    without pandas indexing. Arrays are shared, not copied, wherever the source
+    already holds float64 data, and tail() returns views. 'symbol' is optional;
+    when set, an IndicatorEngine memoizes results for the window by symbol.
+    """
+
+    __slots__ = BAR_FIELDS + ("symbol",)
+
+    def __init__(self, close, timestamp=None, open=None, high=None, low=None, volume=None,
+                 symbol: Optional[str] = None):
+        self.symbol = symbol
+        self.close = _float_array(close, 0)
+        n = len(self.close)
+        self.open = _float_array(open, n)
+        self.high = _float_array(high, n)
+        self.low = _float_array(low, n)
+        self.volume = _float_array(volume, n)
+        if timestamp is None:
+            self.timestamp = np.full(n, np.datetime64("NaT"), dtype="datetime64[ns]")
+        else:
+            self.timestamp = np.asarray(timestamp, dtype="datetime64[ns]")
+
+        for field in BAR_FIELDS:
+            if len(getattr(self, field)) != n:
+                raise ValueError(f"Field '{field}' has {len(getattr(self, field))} rows, expected {n}.")
+
+    @classmethod
+    def from_dataframe(cls, df: pd.DataFrame, symbol: Optional[str] = None) -> "BarWindow":
+        """
+        Builds a window from a DataFrame, matching column names case-insensitively
+        (so fetch_data's 'Close' and RsiIndicator's 'close' both map to 'close').
+        Only 'close' is required; without a date column, a DatetimeIndex is used.
+        """
+        columns: Dict[str, str] = {}
+        for column in df.columns:
+            field = _COLUMN_ALIASES.get(str(column).lower())
+            # An exact canonical name wins over an alias
+            if field is not None and (field not in columns or column == field):
+                columns[field] = column
+
+        if "close" not in columns:
+            raise ValueError("DataFrame must contain a 'close' column (any case).")
+
+        arrays = {field: df[column].to_numpy() for field, column in columns.items()}
+        if "timestamp" not in arrays and isinstance(df.index, pd.DatetimeIndex):
+            arrays["timestamp"] = df.index.to_numpy()
+        return cls(**arrays, symbol=symbol)
+
+    @classmethod
+    def from_records(cls, bars: np.ndarray, symbol: Optional[str] = None) -> "BarWindow":
+        """
+        Builds a window from a structured array with BAR_FIELDS names, such as
+        data.realtime.BarRingBuffer.last(), whose timestamps are epoch seconds.
+        """
+        timestamp = (bars["timestamp"] * 1e9).astype("int64").astype("datetime64[ns]")
+        return cls(
+            close=bars["close"],
+            timestamp=timestamp,
+            open=bars["open"],
+            high=bars["high"],
+            low=bars["low"],
+            volume=bars["volume"],
+            symbol=symbol,
+        )
+
+    def __len__(self) -> int:
+        return len(self.close)
+
+    def tail(self, n: int) -> "BarWindow":
+        """
+        Returns the last n bars as a window of views.
+        """
+        start = max(len(self) - n, 0)
+        return BarWindow(**{field: getattr(self, field)[start:] for field in BAR_FIELDS}, symbol=self.symbol)
+
+    def features(self, n: Optional[int] = 1) -> np.ndarray:
+        """
+        Returns the last n bars (all if n is None) as a (n x 5) float matrix of
+        FEATURE_FIELDS, the row layout ML models receive on the fast path.
+        """
+        start = 0 if n is None else max(len(self) - n, 0)
+        return np.column_stack([getattr(self, field)[start:] for field in FEATURE_FIELDS])
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Returns the window as a DataFrame with BAR_FIELDS columns.
+        """
+        return pd.DataFrame({field: getattr(self, field) for field in BAR_FIELDS}, copy=False)
@@ -0,0 +1,194 @@
+# core/instrumentation.py
+
+import asyncio
+import logging
+import math
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+class LatencyHistogram:
+    """
+    An HDR-style log-linear histogram of integer nanosecond latencies.
+
+    Values below 2**sub_bucket_bits are counted exactly; above that, each
+    power-of-two range is split into 2**(sub_bucket_bits - 1) equal buckets,
+    giving a bounded relative error (about 3% with the default 6 bits) over
+    any range of values. Buckets are stored sparsely, so an idle histogram
+    costs almost nothing.
+    """
+
+    def __init__(self, sub_bucket_bits: int = 6):
+        self.sub_bucket_bits = sub_bucket_bits
+        self._exact_limit = 1 << sub_bucket_bits
+        self._half = 1 << (sub_bucket_bits - 1)
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.total = 0
+        self.min = None
+        self.max = 0
+
+    def _index(self, value: int) -> int:
+        if value < self._exact_limit:
+            return value
+        shift = value.bit_length() - self.sub_bucket_bits
+        return (shift + 1) * self._half + (value >> shift) - self._half
+
+    def _upper_bound(self, index: int) -> int:
+        """
+        The largest value that maps to bucket 'index'.
+        """
+        if index < self._exact_limit:
+            return index
+        shift = index // self._half - 1
+        sub = index % self._half + self._half
+        return ((sub + 1) << shift) - 1
+
+    def record(self, value: int) -> None:
+        if value < 0:
+            value = 0
+        index = self._index(value)
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        if self.min is None or value < self.min:
+            self.min = value
+
+    def percentile(self, q: float) -> int:
+        """
+        Returns the value at percentile q (0-100), reported as the upper bound
+        of its bucket and capped at the exact recorded maximum.
+        """
+        if self.count == 0:
+            return 0
+        target = max(1, math.ceil(q / 100.0 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= target:
+                return min(self._upper_bound(index), self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "count": self.count,
+            "p50_us": self.percentile(50) / 1000.0,
+            "p99_us": self.percentile(99) / 1000.0,
+            "max_us": self.max / 1000.0,
+            "mean_us": (self.total / self.count / 1000.0) if self.count else 0.0,
+        }
+
+class LatencyRecorder:
+    """
+    Records per-stage pipeline latencies into histograms per symbol and per strategy.
+
+    Timings are taken by the caller with time.perf_counter_ns (a monotonic
+    clock) and passed to record(). dump() builds a report of p50/p99/max per
+    stage and hands it to every listener; maybe_dump() does so at most once per
+    'dump_interval' seconds, and dump_periodically() calls it on a timer.
+    Not thread-safe: record from one thread (main's event loop does).
+    """
+
+    enabled = True
+
+    def __init__(self, dump_interval: float = 60.0):
+        self.dump_interval = dump_interval
+        self._histograms: Dict[Tuple[str, str, str], LatencyHistogram] = {}
+        self._listeners: List[Callable[[dict], None]] = []
+        self._last_dump = time.monotonic()
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        self._listeners.append(listener)
+
+    def record(self, stage: str, elapsed_ns: int, symbol: Optional[str] = None, strategy: Optional[str] = None) -> None:
+        for key in ((stage, "all", ""), (stage, "symbol", symbol), (stage, "strategy", strategy)):
+            if key[2] is None:
+                continue
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = LatencyHistogram()
+            histogram.record(elapsed_ns)
+
+    def report(self) -> dict:
+        """
+        Returns {stage: {"all": summary, "by_symbol": {...}, "by_strategy": {...}}}.
+        """
+        report: dict = {}
+        for (stage, scope, name), histogram in self._histograms.items():
+            stage_report = report.setdefault(stage, {"all": None, "by_symbol": {}, "by_strategy": {}})
+            if scope == "all":
+                stage_report["all"] = histogram.summary()
+            else:
+                stage_report[f"by_{scope}"][name] = histogram.summary()
+        return report
+
+    def dump(self) -> dict:
+        self._last_dump = time.monotonic()
+        report = self.report()
+        for stage, stage_report in report.items():
+            overall = stage_report["all"]
+            logging.info(
+                f"Latency {stage}: n={overall['count']} p50={overall['p50_us']:.1f}us "
+                f"p99={overall['p99_us']:.1f}us max={overall['max_us']:.1f}us"
+            )
+        for listener in self._listeners:
+            listener(report)
+        return report
+
+    def maybe_dump(self) -> None:
+        if time.monotonic() - self._last_dump >= self.dump_interval:
+            self.dump()
+
+    async def dump_periodically(self) -> None:
+        """
+        Dumps every 'dump_interval' seconds until cancelled. Run it as a task
+        on the event loop that records.
+        """
+        while True:
+            await asyncio.sleep(max(self.dump_interval - (time.monotonic() - self._last_dump), 0.0))
+            self.maybe_dump()
+
+    def reset(self) -> None:
+        self._histograms.clear()
+
+class NullLatencyRecorder(LatencyRecorder):
+    """
+    The disabled recorder: every method is a no-op.
+    """
+
+    enabled = False
+
+    def __init__(self, dump_interval: float = 60.0):
+        pass
+
+    def add_listener(self, listener: Callable[[dict], None]) -> None:
+        pass
+
+    def record(self, stage: str, elapsed_ns: int, symbol: Optional[str] = None, strategy: Optional[str] = None) -> None:
+        pass
+
+    def report(self) -> dict:
+        return {}
+
+    def dump(self) -> dict:
+        return {}
+
+    def maybe_dump(self) -> None:
+        pass
+
+    async def dump_periodically(self) -> None:
+        pass
+
+    def reset(self) -> None:
+        pass
+
+def build_latency_recorder(config: dict) -> LatencyRecorder:
+    """
+    Returns a LatencyRecorder if 'instrumentation.enabled' is set in config,
+    otherwise the no-op NullLatencyRecorder.
+    """
+    instrumentation_config = config.get("instrumentation", {})
+    if not instrumentation_config.get("enabled", False):
+        return NullLatencyRecorder()
+    return LatencyRecorder(dump_interval=instrumentation_config.get("dump_interval", 60.0))
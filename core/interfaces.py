@@ -1,9 +1,21 @@
 from abc import ABC, abstractmethod
-from typing import List, Union, Optional
+from datetime import datetime
+from typing import Dict, List, Union, Optional
 
-from core.models import OrderType, Trade, Position
+import pandas as pd
+
+import numpy as np
+
+from core.bars import BarWindow
+from core.models import OrderType, Trade, Position, OrderValidation
 
 class IBroker(ABC):
+    # True when place_order may be called from several threads at once and
+    # concurrent orders are best sent together (e.g. batched by a remote
+    # client). The trading cycle then places orders without holding its
+    # order lock; otherwise placement is serialized with risk validation.
+    concurrent_orders: bool = False
+
     @abstractmethod
     def place_order(self, symbol: str, order_type: OrderType, quantity: float) -> None:
         pass
@@ -16,12 +28,54 @@ class IBroker(ABC):
     def get_balance(self) -> float:
         pass
 
+    def get_equity(self) -> float:
+        """
+        Returns account equity (cash plus the market value of positions).
+        This default returns get_balance(); brokers that value their
+        positions should override it.
+        """
+        return self.get_balance()
+
+    def update_prices(self, prices: Dict[str, float], timestamp: Optional[datetime] = None) -> None:
+        """
+        Marks positions to the given {symbol: price}. Brokers that don't value
+        positions locally can ignore it.
+        """
+        pass
+
+    def close(self) -> None:
+        """
+        Releases connections, threads or files held by the broker.
+        """
+        pass
+
 
 class IStrategy(ABC):
     @abstractmethod
     def generate_signal(self, data) -> OrderType:
         pass
 
+    def generate_signal_series(self, data):
+        """
+        Returns a pandas Series with the signal generate_signal would emit at
+        every row of 'data' (using only rows up to and including that one).
+
+        This default re-runs generate_signal on growing slices, which is O(n^2);
+        strategies that can compute their signals vectorized should override it.
+        """
+        signals = [self.generate_signal(data.iloc[:i + 1]) for i in range(len(data))]
+        return pd.Series(signals, index=data.index, dtype=object)
+
+    def generate_signal_fast(self, window: BarWindow) -> OrderType:
+        """
+        Returns the signal for the latest bar of 'window', reading its NumPy
+        arrays directly instead of indexing a DataFrame.
+
+        This default converts the window back to a DataFrame and calls
+        generate_signal; strategies on the live path should override it.
+        """
+        return self.generate_signal(window.to_dataframe())
+
 
 class IIndicator(ABC):
     @abstractmethod
@@ -34,6 +88,15 @@ class IRiskManager(ABC):
     def validate_order(self, trade: Trade) -> bool:
         pass
 
+    def validate_orders(self, trades: List[Trade]) -> OrderValidation:
+        """
+        Validates a batch of orders. This default calls validate_order once per
+        trade; risk managers that can check a batch vectorized should override it.
+        """
+        accepted = np.array([self.validate_order(trade) for trade in trades], dtype=bool)
+        reasons = [None if ok else "Rejected by validate_order." for ok in accepted]
+        return OrderValidation(accepted=accepted, reasons=reasons)
+
 
 class IPlugin(ABC):
     """
@@ -78,3 +141,11 @@ class IPlugin(ABC):
         Called whenever a trade is executed.
         """
         pass
+
+    def on_latency_report(self, report: dict) -> None:
+        """
+        Called periodically with pipeline latency statistics when instrumentation
+        is enabled: {stage: {"all": {...}, "by_symbol": {...}, "by_strategy": {...}}},
+        where each summary holds count, p50_us, p99_us, max_us and mean_us.
+        """
+        pass
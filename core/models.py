@@ -1,6 +1,9 @@
 from enum import Enum
 from dataclasses import dataclass
 from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
 
 class OrderType(Enum):
     BUY = "BUY"
@@ -11,8 +14,12 @@ class OrderType(Enum):
     SELL_PUT = "SELL_PUT"
     HOLD = "HOLD"
 
+# Trade and Position declare __slots__ so the many small instances created
+# per fill and per symbol carry no per-instance __dict__.
 @dataclass
 class Trade:
+    __slots__ = ('symbol', 'order_type', 'quantity', 'price', 'timestamp')
+
     symbol: str
     order_type: OrderType
     quantity: float
@@ -21,6 +28,8 @@ class Trade:
 
 @dataclass
 class Position:
+    __slots__ = ('symbol', 'quantity', 'avg_price')
+
     symbol: str
     quantity: float
     avg_price: float
@@ -34,3 +43,12 @@ class MarketData:
     close_price: float
     volume: float
     timestamp: datetime
+
+@dataclass
+class OrderValidation:
+    """
+    Result of validating a batch of orders: a boolean mask with one entry per
+    order, and the rejection reason for each rejected order (None if accepted).
+    """
+    accepted: np.ndarray
+    reasons: List[Optional[str]]
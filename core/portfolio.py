@@ -0,0 +1,224 @@
+# core/portfolio.py
+
+from datetime import datetime
+from typing import Dict, List, Mapping, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.trade_log import to_epoch_us
+
+# Positions smaller than this after a fill are treated as closed, so rounding
+# leftovers from partial fills don't linger as open positions
+QUANTITY_EPSILON = 1e-9
+
+class Portfolio:
+    """
+    Positions stored as parallel NumPy arrays (one slot per symbol), valued
+    against a price vector in a single vectorized pass.
+
+    Fills update one slot in O(1): quantity, average cost and realized PnL.
+    mark() writes new prices for many symbols at once, and the valuation
+    (market value, unrealized PnL) is a handful of array operations over
+    the whole book. Total realized and unrealized PnL are also kept as
+    running sums, adjusted by each fill and mark, so equity is O(1) for
+    per-order risk checks; mark_to_market() resyncs them with a full pass. Every mark_to_market() call appends one row to the
+    equity history, which grows geometrically like TradeLog.
+
+    Equity is starting capital plus realized and unrealized PnL, which equals
+    settled cash plus market value; symbols never marked are valued at their
+    last fill price.
+    """
+
+    def __init__(self, starting_capital: float = 100000.0, capacity: int = 64, history_capacity: int = 1024):
+        self.starting_capital = starting_capital
+        self.symbols: List[str] = []
+        self._index: Dict[str, int] = {}
+        capacity = max(int(capacity), 1)
+        self.quantities = np.zeros(capacity)
+        self.avg_prices = np.zeros(capacity)
+        self.last_prices = np.zeros(capacity)
+        self.realized = np.zeros(capacity)
+        self._size = 0
+        # Running sums of realized and unrealized PnL over the book
+        self._realized_total = 0.0
+        self._unrealized_total = 0.0
+
+        # Equity history columns, filled by mark_to_market
+        history_capacity = max(int(history_capacity), 1)
+        self._history_timestamps = np.empty(history_capacity, dtype=np.int64)
+        self._history = np.empty((history_capacity, 3))  # equity, unrealized, realized
+        self._history_size = 0
+
+    def symbol_id(self, symbol: str) -> int:
+        """
+        Returns the array slot of 'symbol', allocating one on first use.
+        """
+        index = self._index.get(symbol)
+        if index is None:
+            index = self._size
+            if index == len(self.quantities):
+                self._grow()
+            self._index[symbol] = index
+            self.symbols.append(symbol)
+            self._size += 1
+        return index
+
+    def _grow(self) -> None:
+        capacity = 2 * len(self.quantities)
+        for name in ("quantities", "avg_prices", "last_prices", "realized"):
+            old = getattr(self, name)
+            new = np.zeros(capacity)
+            new[:len(old)] = old
+            setattr(self, name, new)
+
+    def load_state(self, symbols: List[str], quantities: np.ndarray, avg_prices: np.ndarray,
+                   last_prices: np.ndarray, realized: np.ndarray) -> None:
+        """
+        Replaces the book with the given per-symbol arrays, e.g. after recovery.
+        """
+        n = len(symbols)
+        capacity = max(n, 1)
+        self.symbols = list(symbols)
+        self._index = {symbol: i for i, symbol in enumerate(self.symbols)}
+        for name, values in (("quantities", quantities), ("avg_prices", avg_prices),
+                             ("last_prices", last_prices), ("realized", realized)):
+            array = np.zeros(capacity)
+            array[:n] = values
+            setattr(self, name, array)
+        self._size = n
+        self._resync_totals()
+
+    def _resync_totals(self) -> None:
+        n = self._size
+        self._realized_total = float(self.realized[:n].sum())
+        self._unrealized_total = float(self.unrealized_pnl().sum())
+
+    def _unrealized_sum(self, ids: np.ndarray) -> float:
+        return float(np.dot(self.quantities[ids], self.last_prices[ids] - self.avg_prices[ids]))
+
+    def apply_fill(self, symbol: str, quantity: float, price: float) -> None:
+        """
+        Applies a fill of signed 'quantity' (positive buys, negative sells).
+        Sells realize (price - average cost) on the quantity closed.
+        """
+        i = self.symbol_id(symbol)
+        held = self.quantities[i]
+        old_unrealized = held * (self.last_prices[i] - self.avg_prices[i])
+        if quantity > 0:
+            total = held + quantity
+            self.avg_prices[i] = (held * self.avg_prices[i] + quantity * price) / total
+            self.quantities[i] = total
+        else:
+            realized = (price - self.avg_prices[i]) * -quantity
+            self.realized[i] += realized
+            self._realized_total += realized
+            self.quantities[i] = held + quantity
+            if abs(self.quantities[i]) < QUANTITY_EPSILON:
+                self.quantities[i] = 0.0
+                self.avg_prices[i] = 0.0
+        self.last_prices[i] = price
+        self._unrealized_total += self.quantities[i] * (price - self.avg_prices[i]) - old_unrealized
+
+    def mark(self, prices: Union[np.ndarray, Mapping[str, float], pd.Series]) -> None:
+        """
+        Updates last prices. An array must be aligned with self.symbols; a
+        mapping or Series is matched by symbol, ignoring symbols not held.
+        NaN prices leave the previous mark in place.
+        """
+        if isinstance(prices, np.ndarray):
+            prices = prices[:self._size]
+            ids = np.flatnonzero(~np.isnan(prices))
+            old_unrealized = self._unrealized_sum(ids)
+            self.last_prices[ids] = prices[ids]
+            self._unrealized_total += self._unrealized_sum(ids) - old_unrealized
+            return
+
+        if isinstance(prices, pd.Series):
+            symbols, values = prices.index, prices.to_numpy(dtype=float)
+        else:
+            symbols = list(prices)
+            values = np.array([prices[symbol] for symbol in symbols], dtype=float)
+        ids = np.array([self._index.get(symbol, -1) for symbol in symbols], dtype=np.int64)
+        keep = (ids >= 0) & ~np.isnan(values)
+        touched = np.unique(ids[keep])
+        old_unrealized = self._unrealized_sum(touched)
+        self.last_prices[ids[keep]] = values[keep]
+        self._unrealized_total += self._unrealized_sum(touched) - old_unrealized
+
+    def market_value(self) -> float:
+        n = self._size
+        return float(np.dot(self.quantities[:n], self.last_prices[:n]))
+
+    def unrealized_pnl(self) -> np.ndarray:
+        """
+        Per-symbol unrealized PnL, aligned with self.symbols.
+        """
+        n = self._size
+        return self.quantities[:n] * (self.last_prices[:n] - self.avg_prices[:n])
+
+    @property
+    def realized_pnl(self) -> float:
+        return self._realized_total
+
+    @property
+    def cash(self) -> float:
+        """
+        Settled cash implied by the fills: capital plus realized PnL minus
+        the cost of open positions.
+        """
+        n = self._size
+        return self.starting_capital + self.realized_pnl - float(np.dot(self.quantities[:n], self.avg_prices[:n]))
+
+    @property
+    def equity(self) -> float:
+        """
+        Starting capital plus realized and unrealized PnL, in O(1).
+        """
+        return self.starting_capital + self._realized_total + self._unrealized_total
+
+    def mark_to_market(self, prices=None, timestamp: Optional[datetime] = None) -> float:
+        """
+        Optionally applies 'prices' (see mark), revalues the whole book and
+        records equity, unrealized and realized PnL in the history.
+        Returns the equity.
+        """
+        if prices is not None:
+            self.mark(prices)
+        # The full revaluation also clears rounding drift from the running sums
+        self._resync_totals()
+        unrealized = self._unrealized_total
+        realized = self._realized_total
+        equity = self.starting_capital + realized + unrealized
+
+        if self._history_size == len(self._history):
+            capacity = 2 * len(self._history)
+            self._history_timestamps = np.resize(self._history_timestamps, capacity)
+            self._history = np.resize(self._history, (capacity, 3))
+        row = self._history_size
+        self._history_timestamps[row] = to_epoch_us(timestamp or datetime.now())
+        self._history[row] = (equity, unrealized, realized)
+        self._history_size += 1
+        return equity
+
+    def positions_frame(self) -> pd.DataFrame:
+        """
+        The book as a DataFrame indexed by symbol.
+        """
+        n = self._size
+        return pd.DataFrame({
+            "quantity": self.quantities[:n],
+            "avg_price": self.avg_prices[:n],
+            "last_price": self.last_prices[:n],
+            "market_value": self.quantities[:n] * self.last_prices[:n],
+            "unrealized_pnl": self.unrealized_pnl(),
+            "realized_pnl": self.realized[:n],
+        }, index=pd.Index(self.symbols, name="symbol"))
+
+    def history(self) -> pd.DataFrame:
+        """
+        The equity history recorded by mark_to_market, indexed by timestamp.
+        """
+        n = self._history_size
+        index = pd.DatetimeIndex(pd.to_datetime(self._history_timestamps[:n], unit="us"), name="timestamp")
+        return pd.DataFrame(self._history[:n], columns=["equity", "unrealized_pnl", "realized_pnl"], index=index)
@@ -0,0 +1,121 @@
+# core/registry.py
+
+import importlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, Tuple
+
+@dataclass
+class LoadTiming:
+    kind: str
+    name: str
+    target: str
+    seconds: float
+
+# Every lazy import performed by any registry, in load order
+_load_timings: List[LoadTiming] = []
+
+class Registry:
+    """
+    A name -> class registry that imports implementation modules lazily.
+
+    Entries are registered as "package.module:ClassName" strings, so nothing is
+    imported until config actually selects that name. The import time of each
+    load is recorded for startup_report().
+    """
+
+    def __init__(self, kind: str):
+        self.kind = kind
+        self._targets: Dict[str, Tuple[str, bool]] = {}
+        self._classes: Dict[str, type] = {}
+        self._shared: Dict[Tuple, Any] = {}
+
+    def register(self, name: str, target: str, takes_config: bool = False) -> None:
+        """
+        Registers 'name' as the class at 'target' ("module.path:ClassName").
+        If takes_config is True, create() passes the config dict as the first argument.
+        """
+        self._targets[name] = (target, takes_config)
+        self._classes.pop(name, None)
+
+    def names(self) -> List[str]:
+        return sorted(self._targets)
+
+    def get(self, name: str) -> type:
+        """
+        Returns the class registered as 'name', importing its module on first use.
+        """
+        cls = self._classes.get(name)
+        if cls is not None:
+            return cls
+
+        if name not in self._targets:
+            raise ValueError(f"Unknown {self.kind}: {name}")
+        target, _ = self._targets[name]
+        module_name, class_name = target.split(":")
+
+        start = time.perf_counter()
+        module = importlib.import_module(module_name)
+        elapsed = time.perf_counter() - start
+        _load_timings.append(LoadTiming(self.kind, name, target, elapsed))
+        logging.debug(f"Loaded {self.kind} '{name}' from {module_name} in {elapsed * 1000:.1f} ms")
+
+        cls = getattr(module, class_name)
+        self._classes[name] = cls
+        return cls
+
+    def create(self, name: str, config: dict = None, *args, **kwargs) -> Any:
+        """
+        Instantiates 'name', passing config first if the entry takes it.
+        """
+        cls = self.get(name)
+        _, takes_config = self._targets[name]
+        if takes_config:
+            return cls(config or {}, *args, **kwargs)
+        return cls(*args, **kwargs)
+
+    def shared(self, name: str, config: dict = None, **kwargs) -> Any:
+        """
+        Like create(), but returns one cached instance per (name, kwargs) for the
+        life of the process, so expensive state such as loaded model weights is
+        only built once however many strategies ask for it.
+        """
+        key = (name, tuple(sorted(kwargs.items())))
+        instance = self._shared.get(key)
+        if instance is None:
+            instance = self.create(name, config, **kwargs)
+            self._shared[key] = instance
+        return instance
+
+def startup_report() -> str:
+    """
+    Returns a human-readable summary of the lazy imports done so far, slowest first.
+    """
+    if not _load_timings:
+        return "No components loaded."
+    lines = [f"Loaded {len(_load_timings)} components in {sum(t.seconds for t in _load_timings) * 1000:.1f} ms:"]
+    for timing in sorted(_load_timings, key=lambda t: t.seconds, reverse=True):
+        lines.append(f"  {timing.kind:<13} {timing.name:<24} {timing.seconds * 1000:8.1f} ms  ({timing.target})")
+    return "\n".join(lines)
+
+STRATEGIES = Registry("strategy")
+STRATEGIES.register("classical_strategy", "strategies.classical_strategy:ClassicalStrategy")
+STRATEGIES.register("ml_strategy", "strategies.ml_strategy:MLStrategy", takes_config=True)
+STRATEGIES.register("multi_action_strategy", "strategies.multi_action_strategy:MultiActionStrategy", takes_config=True)
+
+BROKERS = Registry("broker")
+BROKERS.register("paper", "brokers.paper_broker:PaperBroker")
+BROKERS.register("real", "brokers.real_broker:RealBroker", takes_config=True)
+
+RISK_MANAGERS = Registry("risk manager")
+RISK_MANAGERS.register("basic", "risk_management.basic_risk_manager:BasicRiskManager", takes_config=True)
+RISK_MANAGERS.register("advanced", "risk_management.advanced_risk_manager:AdvancedRiskManager", takes_config=True)
+
+ML_MODELS = Registry("ml model")
+ML_MODELS.register("random_forest", "ml.model_selector:RandomForestModel")
+ML_MODELS.register("deep_rl", "ml.model_selector:DeepRLModel")
+
+PLUGINS = Registry("plugin")
+PLUGINS.register("logger", "plugins.logger_plugin:LoggerPlugin")
+PLUGINS.register("notification", "plugins.notification_plugin:NotificationPlugin")
@@ -0,0 +1,186 @@
+# core/trade_log.py
+
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterator, List, Union
+
+import numpy as np
+import pandas as pd
+
+from core.models import OrderType, Trade
+
+# Enum <-> compact integer code used in the order_codes column
+ORDER_TYPES: List[OrderType] = list(OrderType)
+ORDER_CODES: Dict[OrderType, int] = {order_type: code for code, order_type in enumerate(ORDER_TYPES)}
+
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+def to_epoch_us(dt: datetime) -> int:
+    """
+    Converts a datetime into integer microseconds since the epoch.
+    Naive datetimes are taken as-is; aware ones are converted to UTC.
+    """
+    if dt.tzinfo is None:
+        return (dt - _EPOCH) // _MICROSECOND
+    return (dt - _EPOCH_UTC) // _MICROSECOND
+
+def from_epoch_us(value: int) -> datetime:
+    """
+    Inverse of to_epoch_us, returning a naive datetime.
+    """
+    return _EPOCH + timedelta(microseconds=int(value))
+
+class TradeLog:
+    """
+    An append-only, array-backed trade journal.
+
+    Each fill is stored column-wise as int64 microsecond timestamps, int32
+    interned symbol ids, int8 order-type codes and float64 quantity and price,
+    about 29 bytes per fill versus several hundred for a Trade object.
+    Arrays grow geometrically, so appends are amortized O(1).
+
+    The log behaves like a read-only list of Trade for existing callers:
+    len(), iteration and integer indexing build Trade objects on demand,
+    and slicing returns a TradeLog view over the same arrays.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        capacity = max(int(capacity), 1)
+        self._timestamps = np.empty(capacity, dtype=np.int64)
+        self._symbol_ids = np.empty(capacity, dtype=np.int32)
+        self._order_codes = np.empty(capacity, dtype=np.int8)
+        self._quantities = np.empty(capacity, dtype=np.float64)
+        self._prices = np.empty(capacity, dtype=np.float64)
+        self._size = 0
+        # Interned symbol table, shared with any slices of this log
+        self.symbols: List[str] = []
+        self._symbol_index: Dict[str, int] = {}
+
+    @classmethod
+    def from_columns(cls, timestamps: np.ndarray, symbols: List[str], symbol_ids: np.ndarray,
+                     order_codes: np.ndarray, quantities: np.ndarray, prices: np.ndarray) -> 'TradeLog':
+        """
+        Builds a log from whole columns at once, e.g. when recovering from a journal.
+        'symbol_ids' index into 'symbols'.
+        """
+        log = cls(capacity=len(timestamps))
+        n = len(timestamps)
+        log._timestamps[:n] = timestamps
+        log._symbol_ids[:n] = symbol_ids
+        log._order_codes[:n] = order_codes
+        log._quantities[:n] = quantities
+        log._prices[:n] = prices
+        log._size = n
+        for symbol in symbols:
+            log.symbol_id(symbol)
+        return log
+
+    def symbol_id(self, symbol: str) -> int:
+        """
+        Returns the interned id for 'symbol', assigning a new one if needed.
+        """
+        symbol_id = self._symbol_index.get(symbol)
+        if symbol_id is None:
+            symbol_id = len(self.symbols)
+            self.symbols.append(symbol)
+            self._symbol_index[symbol] = symbol_id
+        return symbol_id
+
+    def record(self, symbol: str, order_type: OrderType, quantity: float, price: float, timestamp: datetime) -> None:
+        """
+        Appends one fill without building a Trade object.
+        """
+        i = self._size
+        if i == len(self._timestamps):
+            self._grow(2 * i)
+        self._timestamps[i] = to_epoch_us(timestamp)
+        self._symbol_ids[i] = self.symbol_id(symbol)
+        self._order_codes[i] = ORDER_CODES[order_type]
+        self._quantities[i] = quantity
+        self._prices[i] = price
+        self._size = i + 1
+
+    def append(self, trade: Trade) -> None:
+        """
+        Appends a Trade, for code written against the old list-based log.
+        """
+        self.record(trade.symbol, trade.order_type, trade.quantity, trade.price, trade.timestamp)
+
+    def _grow(self, capacity: int) -> None:
+        for name in ('_timestamps', '_symbol_ids', '_order_codes', '_quantities', '_prices'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+
+    # Column views over the filled part of the log
+    @property
+    def timestamps(self) -> np.ndarray:
+        return self._timestamps[:self._size]
+
+    @property
+    def symbol_ids(self) -> np.ndarray:
+        return self._symbol_ids[:self._size]
+
+    @property
+    def order_codes(self) -> np.ndarray:
+        return self._order_codes[:self._size]
+
+    @property
+    def quantities(self) -> np.ndarray:
+        return self._quantities[:self._size]
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices[:self._size]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def __iter__(self) -> Iterator[Trade]:
+        for i in range(self._size):
+            yield self._trade_at(i)
+
+    def __getitem__(self, key: Union[int, slice]) -> Union[Trade, 'TradeLog']:
+        if isinstance(key, slice):
+            start, stop, step = key.indices(self._size)
+            view = TradeLog.__new__(TradeLog)
+            view._timestamps = self._timestamps[start:stop:step]
+            view._symbol_ids = self._symbol_ids[start:stop:step]
+            view._order_codes = self._order_codes[start:stop:step]
+            view._quantities = self._quantities[start:stop:step]
+            view._prices = self._prices[start:stop:step]
+            view._size = len(view._timestamps)
+            view.symbols = self.symbols
+            view._symbol_index = self._symbol_index
+            return view
+
+        if key < 0:
+            key += self._size
+        if not 0 <= key < self._size:
+            raise IndexError("TradeLog index out of range")
+        return self._trade_at(key)
+
+    def _trade_at(self, i: int) -> Trade:
+        return Trade(
+            symbol=self.symbols[self._symbol_ids[i]],
+            order_type=ORDER_TYPES[self._order_codes[i]],
+            quantity=float(self._quantities[i]),
+            price=float(self._prices[i]),
+            timestamp=from_epoch_us(self._timestamps[i]),
+        )
+
+    def to_dataframe(self) -> pd.DataFrame:
+        """
+        Exports the log as a DataFrame with categorical symbol and order_type columns.
+        """
+        symbol_categories = pd.Index(self.symbols)
+        order_categories = pd.Index([order_type.value for order_type in ORDER_TYPES])
+        return pd.DataFrame({
+            'timestamp': pd.to_datetime(self.timestamps, unit='us'),
+            'symbol': pd.Categorical.from_codes(self.symbol_ids, categories=symbol_categories),
+            'order_type': pd.Categorical.from_codes(self.order_codes, categories=order_categories),
+            'quantity': self.quantities,
+            'price': self.prices,
+        })
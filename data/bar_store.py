@@ -0,0 +1,102 @@
+# data/bar_store.py
+
+import os
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Column name -> on-disk dtype. Every symbol is stored as one .npy file per column.
+BAR_COLUMNS = {
+    'Date': 'datetime64[ns]',
+    'Open': 'float64',
+    'High': 'float64',
+    'Low': 'float64',
+    'Close': 'float64',
+    'Volume': 'float64',
+}
+
+class BarStore:
+    """
+    A local on-disk columnar store for OHLCV bars.
+
+    Each symbol lives in its own directory under 'root' with one fixed-dtype
+    .npy file per column, sorted by the 'Date' column. Reads memory-map the
+    files, so a range query is two binary searches plus array slicing: nothing
+    is parsed or copied, and many processes share the same page cache.
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        # symbol -> {column: memory-mapped array}
+        self._columns: Dict[str, Dict[str, np.ndarray]] = {}
+
+    def _symbol_dir(self, symbol: str) -> str:
+        return os.path.join(self.root, symbol)
+
+    def has_symbol(self, symbol: str) -> bool:
+        return os.path.exists(os.path.join(self._symbol_dir(symbol), 'Date.npy'))
+
+    def symbols(self) -> List[str]:
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(name for name in os.listdir(self.root) if self.has_symbol(name))
+
+    def write(self, symbol: str, df: pd.DataFrame) -> None:
+        """
+        Writes (or replaces) the bars for 'symbol'. 'df' must contain the
+        Date/Open/High/Low/Close/Volume columns; rows are sorted by Date.
+        """
+        missing = [col for col in BAR_COLUMNS if col not in df.columns]
+        if missing:
+            raise ValueError(f"DataFrame is missing columns: {missing}")
+
+        df = df.sort_values('Date', kind='stable')
+        symbol_dir = self._symbol_dir(symbol)
+        os.makedirs(symbol_dir, exist_ok=True)
+
+        # Drop any open maps before replacing the files underneath them
+        self._columns.pop(symbol, None)
+
+        for col, dtype in BAR_COLUMNS.items():
+            values = np.ascontiguousarray(df[col].to_numpy(dtype=dtype))
+            path = os.path.join(symbol_dir, f'{col}.npy')
+            tmp_path = path + '.tmp'
+            with open(tmp_path, 'wb') as f:
+                np.save(f, values)
+            os.replace(tmp_path, path)
+
+    def ingest_csv(self, symbol: str, csv_path: str) -> None:
+        """
+        One-time conversion of a per-symbol CSV (with a 'Date' column) into the store.
+        """
+        df = pd.read_csv(csv_path, parse_dates=['Date'])
+        self.write(symbol, df)
+
+    def _load(self, symbol: str) -> Dict[str, np.ndarray]:
+        columns = self._columns.get(symbol)
+        if columns is None:
+            if not self.has_symbol(symbol):
+                raise KeyError(f"No bars stored for symbol: {symbol}")
+            symbol_dir = self._symbol_dir(symbol)
+            columns = {
+                col: np.load(os.path.join(symbol_dir, f'{col}.npy'), mmap_mode='r')
+                for col in BAR_COLUMNS
+            }
+            self._columns[symbol] = columns
+        return columns
+
+    def fetch(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Returns the bars for 'symbol' with start_date <= Date <= end_date.
+        The DataFrame columns are read-only views into the memory-mapped files.
+        """
+        columns = self._load(symbol)
+        dates = columns['Date']
+
+        start = np.datetime64(pd.Timestamp(start_date).to_datetime64(), 'ns')
+        end = np.datetime64(pd.Timestamp(end_date).to_datetime64(), 'ns')
+        lo = int(np.searchsorted(dates, start, side='left'))
+        hi = int(np.searchsorted(dates, end, side='right'))
+
+        return pd.DataFrame({col: values[lo:hi] for col, values in columns.items()}, copy=False)
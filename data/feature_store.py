@@ -0,0 +1,235 @@
+# data/feature_store.py
+
+import math
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Mapping, Sequence, Union
+
+import numpy as np
+import pandas as pd
+
+from core.models import MarketData
+
+ROLLING_FUNCS = ("mean", "sum", "std", "min", "max")
+
+# Bar column -> MarketData attribute, so both dict-like bars and MarketData work
+_MARKET_DATA_FIELDS = {
+    "Open": "open_price",
+    "High": "high_price",
+    "Low": "low_price",
+    "Close": "close_price",
+    "Volume": "volume",
+}
+
+@dataclass(frozen=True)
+class RollingFeature:
+    """
+    Declarative definition of a rolling-window feature, e.g.
+    RollingFeature("MA_5", "Close", 5) is the 5-bar mean of Close.
+    """
+    name: str
+    column: str
+    window: int
+    func: str = "mean"
+
+    def __post_init__(self):
+        if self.func not in ROLLING_FUNCS:
+            raise ValueError(f"Unknown rolling function: {self.func}")
+        if self.window < 1:
+            raise ValueError("window must be at least 1.")
+
+# The features produced by data.processing.prepare_features
+DEFAULT_FEATURES = (
+    RollingFeature("MA_5", "Close", 5),
+    RollingFeature("MA_10", "Close", 10),
+)
+
+class _RollingState:
+    """
+    O(1) rolling statistic over a fixed window, backed by a ring buffer.
+    Matches pandas' rolling(window) with the default min_periods: NaN until
+    the window is full, and while it holds any NaN. NaNs are counted rather
+    than added to the running sums, so output resumes as soon as the last
+    one leaves the window.
+    """
+
+    def __init__(self, window: int, func: str):
+        self.window = window
+        self.func = func
+        self.values = np.zeros(window)
+        self.pos = 0
+        self.count = 0
+        self.nan_count = 0
+        self.total = 0.0
+        self.total_sq = 0.0
+        self.since_resync = 0
+        # Monotonic deque of (sequence number, value) for min/max, without NaNs
+        self.extremes: deque = deque()
+        self.seq = 0
+
+    def update(self, value: float) -> float:
+        window = self.window
+        if self.count == window:
+            old = self.values[self.pos]
+            if old != old:
+                self.nan_count -= 1
+            else:
+                self.total -= old
+                self.total_sq -= old * old
+        else:
+            self.count += 1
+        self.values[self.pos] = value
+        self.pos = (self.pos + 1) % window
+        is_nan = value != value
+        if is_nan:
+            self.nan_count += 1
+        else:
+            self.total += value
+            self.total_sq += value * value
+
+        # Re-sum once per full window to keep running-sum drift bounded
+        self.since_resync += 1
+        if self.since_resync >= window and self.count == window:
+            valid = self.values[~np.isnan(self.values)] if self.nan_count else self.values
+            self.total = float(valid.sum())
+            self.total_sq = float(np.dot(valid, valid))
+            self.since_resync = 0
+
+        if self.func in ("min", "max"):
+            extremes = self.extremes
+            if not is_nan:
+                if self.func == "min":
+                    while extremes and extremes[-1][1] >= value:
+                        extremes.pop()
+                else:
+                    while extremes and extremes[-1][1] <= value:
+                        extremes.pop()
+                extremes.append((self.seq, value))
+            if extremes and extremes[0][0] <= self.seq - window:
+                extremes.popleft()
+            self.seq += 1
+
+        if self.count < window or self.nan_count:
+            return math.nan
+        if self.func == "mean":
+            return self.total / window
+        if self.func == "sum":
+            return self.total
+        if self.func == "std":
+            if window < 2:
+                return math.nan
+            variance = (self.total_sq - self.total * self.total / window) / (window - 1)
+            return math.sqrt(variance) if variance > 0 else 0.0
+        return self.extremes[0][1]
+
+class _SymbolFeatures:
+    """
+    Per-symbol rolling states plus a ring of computed feature vectors.
+
+    The ring is stored twice back to back, so the most recent 'n' vectors are
+    always one contiguous slice and window() can return a view.
+    """
+
+    def __init__(self, features: Sequence[RollingFeature], capacity: int):
+        self.states = [_RollingState(feature.window, feature.func) for feature in features]
+        self.columns = [feature.column for feature in features]
+        self.capacity = capacity
+        self.history = np.full((2 * capacity, len(features)), np.nan)
+        self.pos = 0      # next slot to write, in [0, capacity)
+        self.count = 0    # number of vectors written, capped at capacity
+
+    def update(self, bar: Union[Mapping, MarketData]) -> np.ndarray:
+        if isinstance(bar, MarketData):
+            values = [getattr(bar, _MARKET_DATA_FIELDS[column]) for column in self.columns]
+        else:
+            values = [bar[column] for column in self.columns]
+
+        row = self.history[self.pos]
+        for j, (state, value) in enumerate(zip(self.states, values)):
+            row[j] = state.update(float(value))
+        self.history[self.pos + self.capacity] = row
+
+        self.pos = (self.pos + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+        return self.latest()
+
+    def latest(self) -> np.ndarray:
+        if self.count == 0:
+            raise LookupError("No bars have been added for this symbol.")
+        return self.history[self.pos + self.capacity - 1]
+
+    def window(self, n: int) -> np.ndarray:
+        n = min(n, self.count)
+        end = self.pos + self.capacity
+        return self.history[end - n:end]
+
+class FeatureStore:
+    """
+    Keeps rolling features per symbol and updates them incrementally as bars arrive.
+
+    Each update costs O(number of features), independent of history length, and
+    latest()/window() return read-only views into preallocated buffers instead
+    of copies. Use it in place of data.processing.prepare_features on live feeds.
+    """
+
+    def __init__(self, features: Sequence[RollingFeature] = DEFAULT_FEATURES, capacity: int = 256):
+        names = [feature.name for feature in features]
+        if len(set(names)) != len(names):
+            raise ValueError("Feature names must be unique.")
+        self.features = tuple(features)
+        self.feature_names: List[str] = names
+        self.capacity = capacity
+        self._symbols: Dict[str, _SymbolFeatures] = {}
+
+    def _state(self, symbol: str) -> _SymbolFeatures:
+        state = self._symbols.get(symbol)
+        if state is None:
+            state = _SymbolFeatures(self.features, self.capacity)
+            self._symbols[symbol] = state
+        return state
+
+    def update(self, symbol: str, bar: Union[Mapping, MarketData]) -> np.ndarray:
+        """
+        Adds one bar (a mapping with the feature columns, e.g. a dict or a row
+        Series, or a MarketData) and returns the new latest feature vector.
+        """
+        vector = self._state(symbol).update(bar)
+        return self._read_only(vector)
+
+    def seed(self, symbol: str, df: pd.DataFrame) -> None:
+        """
+        Rebuilds a symbol's state from history. Only the rows that can still
+        influence the buffers (longest window + capacity) are replayed.
+        """
+        self._symbols.pop(symbol, None)
+        state = self._state(symbol)
+        keep = max(feature.window for feature in self.features) + self.capacity
+        columns = sorted({feature.column for feature in self.features})
+        tail = df[columns].iloc[-keep:]
+        for row in tail.to_dict("records"):
+            state.update(row)
+
+    def latest(self, symbol: str) -> np.ndarray:
+        """
+        The most recent feature vector for 'symbol', ordered as feature_names.
+        """
+        return self._read_only(self._state(symbol).latest())
+
+    def latest_dict(self, symbol: str) -> Dict[str, float]:
+        return dict(zip(self.feature_names, self.latest(symbol).tolist()))
+
+    def window(self, symbol: str, n: int) -> np.ndarray:
+        """
+        The last 'n' feature vectors (oldest first) as an (n x features) view.
+        At most 'capacity' vectors are retained.
+        """
+        return self._read_only(self._state(symbol).window(n))
+
+    def symbols(self) -> Iterable[str]:
+        return self._symbols.keys()
+
+    @staticmethod
+    def _read_only(array: np.ndarray) -> np.ndarray:
+        view = array.view()
+        view.flags.writeable = False
+        return view
@@ -1,15 +1,64 @@
 # data/ingestion.py
 
-import pandas as pd
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
 from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from data.bar_store import BarStore
+
+# Optional on-disk bar store consulted by fetch_data before falling back to mock data
+_bar_store: Optional[BarStore] = None
+# Optional range-aware cache in front of load_data, consulted by fetch_data
+_data_cache: Optional["HistoricalDataCache"] = None
+
+def set_bar_store(store: Optional[BarStore]) -> None:
+    """
+    Installs (or with None, removes) the BarStore that fetch_data reads from.
+    """
+    global _bar_store
+    _bar_store = store
+
+def get_bar_store() -> Optional[BarStore]:
+    """
+    Returns the BarStore installed with set_bar_store, if any.
+    """
+    return _bar_store
+
+def set_data_cache(cache: Optional["HistoricalDataCache"]) -> None:
+    """
+    Installs (or with None, removes) the HistoricalDataCache that fetch_data
+    serves requests from. The cache's loader must not be fetch_data itself;
+    the default, load_data, is the uncached path.
+    """
+    global _data_cache
+    _data_cache = cache
 
 def fetch_data(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
     """
-    Fetches historical market data for a given symbol. This example fetches data from a CSV file.
-    In a real scenario, this could be replaced with an API call.
+    Fetches historical market data for a given symbol. If a HistoricalDataCache
+    has been installed with set_data_cache, the request goes through it, so
+    overlapping windows only load the missing dates; otherwise see load_data.
+    """
+    if _data_cache is not None:
+        return _data_cache.fetch(symbol, start_date, end_date)
+    return load_data(symbol, start_date, end_date)
+
+def load_data(symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+    """
+    Loads historical market data without consulting the cache. If a BarStore
+    has been installed with set_bar_store and holds the symbol, the range is
+    served from its memory-mapped files. In a real scenario, this could be
+    replaced with an API call.
     """
-    # Placeholder: Replace with actual CSV or API logic
-    # Example (CSV): df = pd.read_csv(f"{symbol}.csv", parse_dates=['Date'])
+    if _bar_store is not None and _bar_store.has_symbol(symbol):
+        return _bar_store.fetch(symbol, start_date, end_date)
+
+    # Placeholder: Replace with actual API logic
+    # CSV history can be converted once with BarStore.ingest_csv(symbol, f"{symbol}.csv")
     # For now, we'll create a mock DataFrame:
     dates = pd.date_range(start=start_date, end=end_date, freq='D')
     df = pd.DataFrame({
@@ -26,6 +75,8 @@ def fetch_realtime_data(symbol: str) -> pd.DataFrame:
     """
     Fetches real-time market data for a given symbol. Currently returns mock data.
     Replace with actual real-time data API logic when available.
+    For tick-rate feeds, use data.realtime.BarAggregator instead of building
+    a DataFrame per update.
     """
     now = datetime.now()
     df = pd.DataFrame({
@@ -37,3 +88,146 @@ def fetch_realtime_data(symbol: str) -> pd.DataFrame:
         'Volume': [1500]
     })
     return df
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0          # requests served entirely from cache
+    partial_hits: int = 0  # requests that only needed the missing gaps fetched
+    misses: int = 0        # requests with nothing cached for the range
+    gap_fetches: int = 0   # loader calls made to fill gaps
+    evictions: int = 0     # symbols evicted to stay under the memory budget
+    bytes_cached: int = 0
+
+@dataclass
+class _Segment:
+    start: pd.Timestamp
+    end: pd.Timestamp
+    df: pd.DataFrame
+    nbytes: int
+
+class HistoricalDataCache:
+    """
+    A range-aware LRU cache in front of a fetch_data-style loader (load_data
+    by default). Install it with set_data_cache to serve fetch_data from it.
+
+    For each symbol the cache keeps contiguous, non-overlapping date segments.
+    A request that overlaps cached segments only loads the uncovered gaps and
+    merges everything into a single segment, so rolling windows cost one small
+    fetch per call instead of a full reload. Whole symbols are evicted in
+    least-recently-used order once 'max_bytes' is exceeded.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str, str, str], pd.DataFrame] = load_data,
+        max_bytes: int = 256 * 1024 * 1024,
+    ):
+        self.loader = loader
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        # symbol -> segments sorted by start, in LRU order (oldest first)
+        self._segments: "OrderedDict[str, List[_Segment]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._symbol_locks: Dict[str, threading.Lock] = {}
+
+    def fetch(self, symbol: str, start_date: str, end_date: str) -> pd.DataFrame:
+        """
+        Same contract as fetch_data: returns the bars with start_date <= Date <= end_date.
+        """
+        start = pd.Timestamp(start_date)
+        end = pd.Timestamp(end_date)
+
+        # Loading is done under a per-symbol lock so different symbols can load concurrently
+        with self._symbol_lock(symbol):
+            with self._lock:
+                segments = list(self._segments.get(symbol, []))
+
+            overlapping = [seg for seg in segments if seg.end >= start and seg.start <= end]
+            gaps = self._find_gaps(overlapping, start, end)
+
+            if not gaps:
+                segment = overlapping[0]
+                self._record(hit=True)
+            else:
+                self._record(hit=False, partial=bool(overlapping), gap_fetches=len(gaps))
+                loaded = [self.loader(symbol, str(gap_start), str(gap_end)) for gap_start, gap_end in gaps]
+                segment = self._merge(overlapping, loaded, start, end)
+                remaining = [seg for seg in segments if not any(seg is old for old in overlapping)]
+                remaining.append(segment)
+                remaining.sort(key=lambda seg: seg.start)
+                self._store(symbol, remaining)
+
+            with self._lock:
+                if symbol in self._segments:
+                    self._segments.move_to_end(symbol)
+
+        dates = segment.df['Date']
+        lo = dates.searchsorted(start, side='left')
+        hi = dates.searchsorted(end, side='right')
+        return segment.df.iloc[lo:hi].reset_index(drop=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._segments.clear()
+            self.stats.bytes_cached = 0
+
+    def _symbol_lock(self, symbol: str) -> threading.Lock:
+        with self._lock:
+            return self._symbol_locks.setdefault(symbol, threading.Lock())
+
+    @staticmethod
+    def _find_gaps(overlapping: List[_Segment], start: pd.Timestamp, end: pd.Timestamp) -> List[Tuple[pd.Timestamp, pd.Timestamp]]:
+        """
+        Returns the (inclusive) sub-ranges of [start, end] not covered by 'overlapping'.
+        Gap bounds touch the neighbouring segments; duplicate boundary rows are
+        dropped when merging.
+        """
+        gaps = []
+        cursor = start
+        cursor_covered = False
+        for seg in overlapping:
+            if seg.start > cursor:
+                gaps.append((cursor, seg.start))
+            cursor = max(cursor, seg.end)
+            cursor_covered = True
+        if cursor < end or not cursor_covered:
+            gaps.append((cursor, end))
+        return gaps
+
+    @staticmethod
+    def _merge(overlapping: List[_Segment], loaded: List[pd.DataFrame], start: pd.Timestamp, end: pd.Timestamp) -> _Segment:
+        frames = [seg.df for seg in overlapping] + [df for df in loaded if len(df)]
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+            df = df.sort_values('Date', kind='stable').drop_duplicates('Date', keep='first')
+            df = df.reset_index(drop=True)
+        else:
+            df = loaded[0]
+
+        seg_start = min([start] + [seg.start for seg in overlapping])
+        seg_end = max([end] + [seg.end for seg in overlapping])
+        return _Segment(seg_start, seg_end, df, int(df.memory_usage(index=True).sum()))
+
+    def _store(self, symbol: str, segments: List[_Segment]) -> None:
+        with self._lock:
+            old = self._segments.pop(symbol, [])
+            self.stats.bytes_cached -= sum(seg.nbytes for seg in old)
+            self._segments[symbol] = segments
+            self.stats.bytes_cached += sum(seg.nbytes for seg in segments)
+
+            # Evict least-recently-used symbols, never the one just stored
+            while self.stats.bytes_cached > self.max_bytes and len(self._segments) > 1:
+                _, evicted = self._segments.popitem(last=False)
+                self.stats.bytes_cached -= sum(seg.nbytes for seg in evicted)
+                self.stats.evictions += 1
+
+    def _record(self, hit: bool, partial: bool = False, gap_fetches: int = 0) -> None:
+        with self._lock:
+            if hit:
+                self.stats.hits += 1
+            elif partial:
+                self.stats.partial_hits += 1
+            else:
+                self.stats.misses += 1
+            self.stats.gap_fetches += gap_fetches
@@ -1,15 +1,23 @@
 # data/processing.py
 
+from typing import Iterator, Optional, Sequence, Tuple
+
 import pandas as pd
 
+from data.feature_store import DEFAULT_FEATURES
+
 def prepare_features(df: pd.DataFrame) -> pd.DataFrame:
     """
     Prepares features for machine learning or other analytics by
     calculating moving averages or performing normalization, etc.
+
+    This is the batch path over a whole DataFrame. For live bars, use
+    data.feature_store.FeatureStore, which maintains the same DEFAULT_FEATURES
+    incrementally.
     """
     df = df.copy()
-    df['MA_5'] = df['Close'].rolling(window=5).mean()
-    df['MA_10'] = df['Close'].rolling(window=10).mean()
+    for feature in DEFAULT_FEATURES:
+        df[feature.name] = getattr(df[feature.column].rolling(window=feature.window), feature.func)()
     # Example of normalization (commented out):
     # df['Close_norm'] = (df['Close'] - df['Close'].min()) / (df['Close'].max() - df['Close'].min())
     return df
@@ -22,3 +30,66 @@ def split_train_test(df: pd.DataFrame, test_size: float = 0.2):
     train_df = df.iloc[:split_idx].copy()
     test_df = df.iloc[split_idx:].copy()
     return train_df, test_df
+
+# A fold is (train row ranges, test row range). Train is a tuple of slices
+# because purged k-fold training sets are split around the test block.
+Fold = Tuple[Tuple[slice, ...], slice]
+
+def walk_forward_splits(
+    n_samples: int,
+    n_splits: int = 5,
+    test_size: Optional[int] = None,
+    train_size: Optional[int] = None,
+    gap: int = 0,
+) -> Iterator[Fold]:
+    """
+    Yields walk-forward folds over n_samples time-ordered rows. Each test block
+    follows its training window; the window expands from the start unless
+    train_size fixes its length. 'gap' rows between train and test are skipped
+    to avoid leakage from overlapping labels.
+
+    Folds are slices, so rows can be selected with select_rows without copying.
+    """
+    test_size = test_size or n_samples // (n_splits + 1)
+    if test_size <= 0:
+        raise ValueError("Not enough samples for the requested number of splits.")
+
+    first_test_start = n_samples - n_splits * test_size
+    for k in range(n_splits):
+        test_start = first_test_start + k * test_size
+        train_end = test_start - gap
+        train_start = 0 if train_size is None else max(0, train_end - train_size)
+        if train_end <= train_start:
+            raise ValueError("Not enough samples before the first test block.")
+        yield (slice(train_start, train_end),), slice(test_start, test_start + test_size)
+
+def purged_kfold_splits(n_samples: int, n_splits: int = 5, purge: int = 0, embargo: int = 0) -> Iterator[Fold]:
+    """
+    Yields k-fold splits with contiguous test blocks. Training rows within
+    'purge' rows before a test block, and 'embargo' rows after it, are dropped
+    so labels that span the boundary can't leak into training. Raises
+    ValueError if that leaves a fold with no training rows.
+    """
+    bounds = [n_samples * k // n_splits for k in range(n_splits + 1)]
+    for test_start, test_end in zip(bounds[:-1], bounds[1:]):
+        train = []
+        if test_start - purge > 0:
+            train.append(slice(0, test_start - purge))
+        if test_end + embargo < n_samples:
+            train.append(slice(test_end + embargo, n_samples))
+        if not train:
+            raise ValueError("Purge and embargo leave no training rows for a fold.")
+        yield tuple(train), slice(test_start, test_end)
+
+def select_rows(df: pd.DataFrame, rows: Sequence[slice]) -> pd.DataFrame:
+    """
+    Selects fold rows from df. A single range is a positional slice, which
+    pandas returns as a view; only split training sets need to be concatenated.
+    """
+    if isinstance(rows, slice):
+        return df.iloc[rows]
+    if len(rows) == 0:
+        return df.iloc[0:0]
+    if len(rows) == 1:
+        return df.iloc[rows[0]]
+    return pd.concat([df.iloc[r] for r in rows])
@@ -0,0 +1,171 @@
+# data/realtime.py
+
+import math
+import time
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Union
+
+import numpy as np
+
+from core.models import MarketData
+
+# One completed bar; timestamp is the bar's start in epoch seconds
+BAR_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('open', 'f8'),
+    ('high', 'f8'),
+    ('low', 'f8'),
+    ('close', 'f8'),
+    ('volume', 'f8'),
+])
+
+Timestamp = Union[float, datetime, None]
+
+def _to_epoch(timestamp: Timestamp) -> float:
+    if timestamp is None:
+        return time.time()
+    if isinstance(timestamp, datetime):
+        return timestamp.timestamp()
+    return float(timestamp)
+
+class BarRingBuffer:
+    """
+    A fixed-capacity ring of OHLCV bars in one preallocated structured array.
+
+    The ring is stored twice back to back, so the most recent n bars are always
+    a single contiguous slice and last() can return a view without copying.
+    Memory is bounded by 'capacity' regardless of how long the feed runs.
+    """
+
+    def __init__(self, capacity: int = 1024):
+        self.capacity = capacity
+        self._data = np.zeros(2 * capacity, dtype=BAR_DTYPE)
+        self._pos = 0
+        self._count = 0
+
+    def append(self, timestamp: float, open_price: float, high: float, low: float, close: float, volume: float) -> None:
+        row = (timestamp, open_price, high, low, close, volume)
+        self._data[self._pos] = row
+        self._data[self._pos + self.capacity] = row
+        self._pos = (self._pos + 1) % self.capacity
+        if self._count < self.capacity:
+            self._count += 1
+
+    def last(self, n: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the most recent n bars (default: all retained), oldest first, as a view.
+        """
+        n = self._count if n is None else min(n, self._count)
+        end = self._pos + self.capacity
+        return self._data[end - n:end]
+
+    def __len__(self) -> int:
+        return self._count
+
+class BarAggregator:
+    """
+    Builds fixed-interval OHLCV bars per symbol from raw ticks or quotes.
+
+    The open bar of each symbol is kept as plain floats and updated in place on
+    every tick, so the per-tick cost is a few comparisons with no allocation.
+    When a tick falls into a later interval, the open bar is written to that
+    symbol's BarRingBuffer and emitted as MarketData to every subscriber.
+    Ticks older than the open bar, or at or before the last bar already
+    closed (e.g. by flush()), are counted in 'late_ticks' and dropped.
+    """
+
+    def __init__(self, interval_seconds: float, capacity: int = 1024):
+        if interval_seconds <= 0:
+            raise ValueError("interval_seconds must be positive.")
+        self.interval = float(interval_seconds)
+        self.capacity = capacity
+        self.late_ticks = 0
+        # symbol -> [bucket, open, high, low, close, volume] of the open bar
+        self._open_bars: Dict[str, list] = {}
+        # symbol -> bucket of the last closed bar; nothing at or before it reopens
+        self._closed_buckets: Dict[str, int] = {}
+        self._buffers: Dict[str, BarRingBuffer] = {}
+        self._subscribers: List[Callable[[MarketData], None]] = []
+
+    def subscribe(self, callback: Callable[[MarketData], None]) -> None:
+        """
+        Registers a callback (e.g. a strategy's bar handler) for completed bars.
+        """
+        self._subscribers.append(callback)
+
+    def on_tick(self, symbol: str, price: float, size: float = 0.0, timestamp: Timestamp = None) -> None:
+        """
+        Adds a trade tick. 'timestamp' is epoch seconds or a datetime (default: now).
+        """
+        bucket = math.floor(_to_epoch(timestamp) / self.interval)
+        bar = self._open_bars.get(symbol)
+
+        if bar is None:
+            closed = self._closed_buckets.get(symbol)
+            if closed is not None and bucket <= closed:
+                self.late_ticks += 1
+                return
+            self._open_bars[symbol] = [bucket, price, price, price, price, size]
+            return
+
+        if bucket == bar[0]:
+            if price > bar[2]:
+                bar[2] = price
+            if price < bar[3]:
+                bar[3] = price
+            bar[4] = price
+            bar[5] += size
+        elif bucket > bar[0]:
+            self._close_bar(symbol, bar)
+            bar[:] = (bucket, price, price, price, price, size)
+        else:
+            self.late_ticks += 1
+
+    def on_quote(self, symbol: str, bid: float, ask: float, timestamp: Timestamp = None) -> None:
+        """
+        Adds a quote update as a zero-volume tick at the mid price.
+        """
+        self.on_tick(symbol, (bid + ask) / 2.0, 0.0, timestamp)
+
+    def flush(self, now: Timestamp = None) -> None:
+        """
+        Closes open bars whose interval has ended by 'now', so quiet symbols
+        still emit their bar on time. Call it from a timer.
+        """
+        current_bucket = math.floor(_to_epoch(now) / self.interval)
+        for symbol, bar in list(self._open_bars.items()):
+            if bar[0] < current_bucket:
+                self._close_bar(symbol, bar)
+                del self._open_bars[symbol]
+
+    def bars(self, symbol: str, n: Optional[int] = None) -> np.ndarray:
+        """
+        Returns the last n completed bars for 'symbol' as a structured array view.
+        """
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            return np.zeros(0, dtype=BAR_DTYPE)
+        return buffer.last(n)
+
+    def _close_bar(self, symbol: str, bar: list) -> None:
+        bucket, open_price, high, low, close, volume = bar
+        bar_start = bucket * self.interval
+        self._closed_buckets[symbol] = bucket
+
+        buffer = self._buffers.get(symbol)
+        if buffer is None:
+            buffer = self._buffers[symbol] = BarRingBuffer(self.capacity)
+        buffer.append(bar_start, open_price, high, low, close, volume)
+
+        if self._subscribers:
+            market_data = MarketData(
+                symbol=symbol,
+                open_price=open_price,
+                high_price=high,
+                low_price=low,
+                close_price=close,
+                volume=volume,
+                timestamp=datetime.fromtimestamp(bar_start),
+            )
+            for callback in self._subscribers:
+                callback(market_data)
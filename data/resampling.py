@@ -0,0 +1,187 @@
+# data/resampling.py
+
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from core.bars import BarWindow
+from core.models import MarketData
+from data.realtime import BAR_DTYPE, BarRingBuffer
+
+# Supported timeframes, in seconds
+TIMEFRAMES = {
+    "1m": 60,
+    "5m": 300,
+    "15m": 900,
+    "1h": 3600,
+    "1d": 86400,
+}
+
+DEFAULT_TIMEFRAMES = ("5m", "15m", "1h", "1d")
+
+def _to_seconds(timestamp: Union[float, datetime, np.datetime64]) -> float:
+    """
+    Float timestamps are epoch seconds. datetimes are taken at wall-clock value
+    (naive, as in fetch_data's Date column), so daily bars follow calendar days.
+    """
+    if isinstance(timestamp, (int, float, np.integer, np.floating)):
+        return float(timestamp)
+    return np.datetime64(timestamp, "ns").astype(np.int64) / 1e9
+
+class _TimeframeSeries:
+    """
+    Completed bars of one timeframe for one symbol, plus the bar still forming.
+    """
+
+    def __init__(self, interval: int, capacity: int):
+        self.interval = interval
+        self.completed = BarRingBuffer(capacity)
+        # [bucket, open, high, low, close, volume] of the open bar, or None
+        self.open_bar: Optional[list] = None
+        self.version = 0
+        self.cached_window: Optional[Tuple[int, bool, Optional[int], BarWindow]] = None
+
+    def update(self, seconds: float, open_price: float, high: float, low: float, close: float, volume: float) -> bool:
+        bucket = seconds // self.interval
+        bar = self.open_bar
+
+        if bar is None:
+            self.open_bar = [bucket, open_price, high, low, close, volume]
+        elif bucket == bar[0]:
+            if high > bar[2]:
+                bar[2] = high
+            if low < bar[3]:
+                bar[3] = low
+            bar[4] = close
+            bar[5] += volume
+        elif bucket > bar[0]:
+            self.completed.append(bar[0] * self.interval, *bar[1:])
+            bar[:] = (bucket, open_price, high, low, close, volume)
+        else:
+            return False
+        self.version += 1
+        return True
+
+    def records(self, n: Optional[int], include_open: bool) -> np.ndarray:
+        if not include_open or self.open_bar is None:
+            return self.completed.last(n)
+
+        bar = self.open_bar
+        open_row = np.array([(bar[0] * self.interval, *bar[1:])], dtype=BAR_DTYPE)
+        history = self.completed.last(None if n is None else max(n - 1, 0))
+        return np.concatenate([history, open_row])
+
+class MultiTimeframeResampler:
+    """
+    Derives higher-timeframe OHLCV bars (default 5m/15m/1h/1d) from a base
+    minute series, incrementally and per symbol.
+
+    Each new base bar only touches the open bar of each timeframe (a few
+    comparisons); when a base bar falls into a later interval, the open bar
+    is moved into that timeframe's BarRingBuffer. Nothing is re-resampled,
+    so adding timeframes costs O(timeframes) per bar, not O(history).
+    Base bars older than a timeframe's open bar are counted in 'late_bars'
+    and dropped. Not thread-safe: feed each symbol from one thread.
+    """
+
+    def __init__(self, timeframes: Iterable[str] = DEFAULT_TIMEFRAMES, capacity: int = 1024):
+        for timeframe in timeframes:
+            if timeframe not in TIMEFRAMES:
+                raise ValueError(f"Unknown timeframe: {timeframe}")
+        self.timeframes = tuple(timeframes)
+        self.capacity = capacity
+        self.late_bars = 0
+        self._series: Dict[str, Dict[str, _TimeframeSeries]] = {}
+
+    def _symbol_series(self, symbol: str) -> Dict[str, _TimeframeSeries]:
+        series = self._series.get(symbol)
+        if series is None:
+            series = self._series[symbol] = {
+                timeframe: _TimeframeSeries(TIMEFRAMES[timeframe], self.capacity)
+                for timeframe in self.timeframes
+            }
+        return series
+
+    def update(self, symbol: str, timestamp, open_price: float, high: float, low: float,
+               close: float, volume: float) -> None:
+        """
+        Folds one base bar into every timeframe of 'symbol'. 'timestamp' is the
+        base bar's start (epoch seconds or a datetime).
+        """
+        seconds = _to_seconds(timestamp)
+        for series in self._symbol_series(symbol).values():
+            if not series.update(seconds, open_price, high, low, close, volume):
+                self.late_bars += 1
+
+    def on_bar(self, bar: MarketData) -> None:
+        """
+        MarketData callback, so the resampler can subscribe to a
+        data.realtime.BarAggregator emitting minute bars.
+        """
+        self.update(bar.symbol, bar.timestamp, bar.open_price, bar.high_price,
+                    bar.low_price, bar.close_price, bar.volume)
+
+    def seed(self, symbol: str, data: Union[pd.DataFrame, BarWindow]) -> None:
+        """
+        Replaces the state of 'symbol' with bars resampled from base history in
+        one vectorized pass per timeframe. The last group stays open, so live
+        updates continue it.
+        """
+        window = data if isinstance(data, BarWindow) else BarWindow.from_dataframe(data)
+        self._series.pop(symbol, None)
+        series_by_timeframe = self._symbol_series(symbol)
+        if len(window) == 0:
+            return
+
+        seconds = window.timestamp.astype(np.int64) / 1e9
+        for series in series_by_timeframe.values():
+            buckets = seconds // series.interval
+            starts = np.flatnonzero(np.r_[True, buckets[1:] != buckets[:-1]])
+            ends = np.r_[starts[1:], len(window)] - 1
+
+            opens = window.open[starts]
+            highs = np.maximum.reduceat(window.high, starts)
+            lows = np.minimum.reduceat(window.low, starts)
+            closes = window.close[ends]
+            volumes = np.add.reduceat(window.volume, starts)
+            bar_starts = buckets[starts] * series.interval
+
+            # Only the last 'capacity' completed groups fit in the ring
+            first = max(len(starts) - 1 - self.capacity, 0)
+            for i in range(first, len(starts) - 1):
+                series.completed.append(bar_starts[i], opens[i], highs[i], lows[i], closes[i], volumes[i])
+            series.open_bar = [buckets[starts[-1]], opens[-1], highs[-1], lows[-1], closes[-1], volumes[-1]]
+            series.version += 1
+
+    def bars(self, symbol: str, timeframe: str, n: Optional[int] = None, include_open: bool = True) -> np.ndarray:
+        """
+        Returns the last n bars of 'timeframe' for 'symbol' as a structured
+        array (BAR_DTYPE, epoch-second timestamps), oldest first. With
+        include_open, the last row is the bar still forming.
+        """
+        series = self._symbol_series(symbol).get(timeframe)
+        if series is None:
+            raise ValueError(f"Timeframe not tracked: {timeframe}")
+        return series.records(n, include_open)
+
+    def window(self, symbol: str, timeframe: str, n: Optional[int] = None, include_open: bool = True) -> BarWindow:
+        """
+        Returns bars() as a BarWindow for generate_signal_fast. The window is
+        cached until the next update of 'symbol', so strategies reading the
+        same timeframe on the same bar share one conversion.
+        """
+        series = self._symbol_series(symbol).get(timeframe)
+        if series is None:
+            raise ValueError(f"Timeframe not tracked: {timeframe}")
+
+        cached = series.cached_window
+        if cached is not None and cached[:3] == (series.version, include_open, n):
+            return cached[3]
+        window = BarWindow.from_records(series.records(n, include_open))
+        series.cached_window = (series.version, include_open, n, window)
+        return window
+
+    def symbols(self) -> Tuple[str, ...]:
+        return tuple(self._series)
@@ -0,0 +1,264 @@
+# indicators/engine.py
+
+import weakref
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from core.bars import BAR_FIELDS, BarWindow
+
+@dataclass(frozen=True)
+class Node:
+    """
+    One step in the indicator graph. Nodes are hashable values, so two
+    consumers that build the same node (e.g. Rsi(14) in two strategies) share
+    it, and so do all their common sub-nodes.
+    """
+    op: str
+    inputs: Tuple['Node', ...] = ()
+    params: Tuple = ()
+
+    def __hash__(self) -> int:
+        # Nodes are hashed on every cache lookup, and a dataclass hash would
+        # walk the whole graph each time, so compute it once per node
+        cached = self.__dict__.get("_hash")
+        if cached is None:
+            cached = hash((self.op, self.inputs, self.params))
+            object.__setattr__(self, "_hash", cached)
+        return cached
+
+    def __getstate__(self) -> dict:
+        # String hashes differ between processes; recompute after unpickling
+        state = dict(self.__dict__)
+        state.pop("_hash", None)
+        return state
+
+def Column(name: str) -> Node:
+    return Node("column", (), (name,))
+
+def Diff(source: Node) -> Node:
+    return Node("diff", (source,))
+
+def Gain(source: Node) -> Node:
+    return Node("gain", (source,))
+
+def Loss(source: Node) -> Node:
+    return Node("loss", (source,))
+
+def RollingMean(source: Node, window: int) -> Node:
+    return Node("rolling_mean", (source,), (window,))
+
+def Sma(window: int, column: str = "close") -> Node:
+    return RollingMean(Column(column), window)
+
+def Rsi(period: int = 14, column: str = "close") -> Node:
+    """
+    RSI as computed by RsiIndicator: simple rolling means of gains and losses.
+    """
+    delta = Diff(Column(column))
+    return Node("rsi", (RollingMean(Gain(delta), period), RollingMean(Loss(delta), period)))
+
+def _column(data: pd.DataFrame, inputs: List[pd.Series], params: Tuple) -> pd.Series:
+    name = params[0]
+    if name not in data.columns:
+        raise ValueError(f"DataFrame must contain a '{name}' column.")
+    return data[name]
+
+def _rsi(data: pd.DataFrame, inputs: List[pd.Series], params: Tuple) -> pd.Series:
+    avg_gain, avg_loss = inputs
+    # Avoid division by zero
+    avg_loss = avg_loss.replace(to_replace=0, value=1e-10)
+    return 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+# op -> function(data, evaluated inputs, params) returning a Series aligned with data
+OPS: Dict[str, Callable[[pd.DataFrame, List[pd.Series], Tuple], pd.Series]] = {
+    "column": _column,
+    "diff": lambda data, inputs, params: inputs[0].diff(),
+    "gain": lambda data, inputs, params: inputs[0].clip(lower=0),
+    "loss": lambda data, inputs, params: -1 * inputs[0].clip(upper=0),
+    "rolling_mean": lambda data, inputs, params: inputs[0].rolling(window=params[0], min_periods=params[0]).mean(),
+    "rsi": _rsi,
+}
+
+def _window_column(window: BarWindow, inputs: List[np.ndarray], params: Tuple, start: int) -> np.ndarray:
+    name = params[0].lower()
+    if name not in BAR_FIELDS:
+        raise ValueError(f"BarWindow has no '{params[0]}' field.")
+    return getattr(window, name)[start:]
+
+def _window_diff(x: np.ndarray) -> np.ndarray:
+    result = np.empty(len(x))
+    result[:1] = np.nan
+    np.subtract(x[1:], x[:-1], out=result[1:])
+    return result
+
+def _window_rolling_mean(x: np.ndarray, window: int) -> np.ndarray:
+    # Like rolling(window, min_periods=window): NaN until full, or with a NaN inside
+    result = np.full(len(x), np.nan)
+    if len(x) >= window:
+        result[window - 1:] = np.convolve(x, np.full(window, 1.0 / window), mode="valid")
+    return result
+
+def _window_rsi(window: BarWindow, inputs: List[np.ndarray], params: Tuple, start: int) -> np.ndarray:
+    avg_gain, avg_loss = inputs
+    avg_loss = np.where(avg_loss == 0, 1e-10, avg_loss)
+    return 100.0 - (100.0 / (1.0 + avg_gain / avg_loss))
+
+# NumPy counterparts of OPS over the tail of a BarWindow starting at 'start':
+# function(window, evaluated inputs, params, start) returning an array
+WINDOW_OPS: Dict[str, Callable[[BarWindow, List[np.ndarray], Tuple, int], np.ndarray]] = {
+    "column": _window_column,
+    "diff": lambda window, inputs, params, start: _window_diff(inputs[0]),
+    "gain": lambda window, inputs, params, start: np.clip(inputs[0], 0, None),
+    "loss": lambda window, inputs, params, start: -1 * np.clip(inputs[0], None, 0),
+    "rolling_mean": lambda window, inputs, params, start: _window_rolling_mean(inputs[0], params[0]),
+    "rsi": _window_rsi,
+}
+
+# op -> extra rows of history the node needs beyond its inputs', for latest_fast
+LOOKBACK: Dict[str, Callable[[Tuple], int]] = {
+    "diff": lambda params: 1,
+    "rolling_mean": lambda params: params[0] - 1,
+}
+
+class _FrameCache:
+    def __init__(self, data: pd.DataFrame):
+        self.data_ref = weakref.ref(data)
+        self.bar_key = _bar_key(data)
+        self.series: Dict[Node, pd.Series] = {}
+
+def _bar_key(data: pd.DataFrame) -> Tuple:
+    return (len(data), data.index[-1] if len(data) else None)
+
+class _WindowCache:
+    def __init__(self, window: Optional[BarWindow], bar_key: Tuple, start: int):
+        self.window = window
+        self.bar_key = bar_key
+        self.start = start  # first row of the tail every node is evaluated over
+        self.values: Dict[Node, np.ndarray] = {}
+
+def _window_bar_key(window: BarWindow) -> Tuple:
+    return (len(window), int(window.timestamp[-1].astype(np.int64)) if len(window) else None)
+
+class IndicatorEngine:
+    """
+    Computes indicator nodes once per bar and shares the results between consumers.
+
+    Results are memoized per symbol (or, without a symbol, per DataFrame object)
+    until a new bar arrives, so several strategies running on the same feed pay
+    for each distinct intermediate (diffs, gains/losses, rolling means) once.
+
+    latest_fast() serves the NumPy fast path (generate_signal_fast): it reads
+    only the tail of a BarWindow that the node's lookback needs, and memoizes
+    by the window's symbol, or by the window object when it has none.
+    """
+
+    def __init__(self):
+        self._registered: List[Node] = []
+        self._frames: Dict[object, _FrameCache] = {}
+        self._windows: Dict[Optional[str], _WindowCache] = {}
+        self._lookbacks: Dict[Node, int] = {}
+        self.evaluations = 0  # number of node computations actually performed
+
+    def register(self, nodes: Iterable[Node]) -> None:
+        """
+        Declares nodes a consumer needs, so evaluate() computes them together.
+        """
+        for node in nodes:
+            if node not in self._registered:
+                self._registered.append(node)
+
+    def series(self, node: Node, data: pd.DataFrame, symbol: Optional[str] = None) -> pd.Series:
+        """
+        Returns the full series for 'node' over 'data', computing it (and any
+        missing inputs) only if this bar hasn't been seen for this symbol yet.
+        """
+        return self._evaluate(node, data, self._frame(data, symbol))
+
+    def latest(self, node: Node, data: pd.DataFrame, symbol: Optional[str] = None) -> float:
+        """
+        Returns the most recent value of 'node' over 'data'.
+        """
+        return self.series(node, data, symbol).iloc[-1]
+
+    def evaluate(self, data: pd.DataFrame, symbol: Optional[str] = None) -> Dict[Node, float]:
+        """
+        Computes every registered node for the current bar and returns the latest values.
+        """
+        frame = self._frame(data, symbol)
+        return {node: self._evaluate(node, data, frame).iloc[-1] for node in self._registered}
+
+    def _frame(self, data: pd.DataFrame, symbol: Optional[str]) -> _FrameCache:
+        key = symbol if symbol is not None else id(data)
+        frame = self._frames.get(key)
+        bar_key = _bar_key(data)
+
+        if frame is not None:
+            same_bar = frame.bar_key == bar_key
+            # Without a symbol, the cache is only valid for the very same DataFrame
+            if same_bar and (symbol is not None or frame.data_ref() is data):
+                return frame
+
+        frame = _FrameCache(data)
+        self._frames[key] = frame
+        if symbol is None:
+            # Drop id-keyed entries once their DataFrame is garbage collected
+            frame.data_ref = weakref.ref(data, lambda _, key=key: self._frames.pop(key, None))
+        return frame
+
+    def latest_fast(self, node: Node, window: BarWindow) -> float:
+        """
+        Returns the most recent value of 'node' over 'window', computed from
+        only the bars its lookback needs unless this bar was already seen.
+        """
+        if len(window) == 0:
+            return np.nan
+        cache = self._window_cache(window, self.lookback(node))
+        return float(self._evaluate_window(node, window, cache)[-1])
+
+    def lookback(self, node: Node) -> int:
+        """
+        Returns how many bars before the latest one the node's value depends on.
+        """
+        lookback = self._lookbacks.get(node)
+        if lookback is None:
+            extra = LOOKBACK.get(node.op)
+            lookback = max((self.lookback(source) for source in node.inputs), default=0)
+            lookback += extra(node.params) if extra is not None else 0
+            self._lookbacks[node] = lookback
+        return lookback
+
+    def _window_cache(self, window: BarWindow, lookback: int) -> _WindowCache:
+        # Windows without a symbol share a single slot, valid for that same object
+        symbol = window.symbol
+        cache = self._windows.get(symbol)
+        bar_key = _window_bar_key(window)
+        if (cache is not None and cache.bar_key == bar_key and (symbol is not None or cache.window is window)
+                and len(window) - cache.start > min(lookback, len(window) - 1)):
+            return cache
+        # Evaluate every node of this bar over one tail, long enough for all
+        # registered nodes, so they share their intermediates
+        lookback = max([lookback] + [self.lookback(node) for node in self._registered])
+        start = max(len(window) - lookback - 1, 0)
+        cache = self._windows[symbol] = _WindowCache(window if symbol is None else None, bar_key, start)
+        return cache
+
+    def _evaluate_window(self, node: Node, window: BarWindow, cache: _WindowCache) -> np.ndarray:
+        result = cache.values.get(node)
+        if result is None:
+            inputs = [self._evaluate_window(source, window, cache) for source in node.inputs]
+            result = WINDOW_OPS[node.op](window, inputs, node.params, cache.start)
+            cache.values[node] = result
+            self.evaluations += 1
+        return result
+
+    def _evaluate(self, node: Node, data: pd.DataFrame, frame: _FrameCache) -> pd.Series:
+        result = frame.series.get(node)
+        if result is None:
+            inputs = [self._evaluate(source, data, frame) for source in node.inputs]
+            result = OPS[node.op](data, inputs, node.params)
+            frame.series[node] = result
+            self.evaluations += 1
+        return result
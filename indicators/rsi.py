@@ -1,19 +1,34 @@
 # indicators/rsi.py
 
+from collections import deque
+from typing import Iterable, Union
+
+import numpy as np
 import pandas as pd
 from core.interfaces import IIndicator
 
 class RsiIndicator(IIndicator):
     def __init__(self, period: int = 14):
         self.period = period
+        self.reset()
 
     def calculate(self, data: pd.DataFrame) -> float:
         """
         Calculates the RSI (Relative Strength Index) for the provided data.
         Assumes 'data' is a DataFrame with a 'close' column.
-        
+
         Returns the most recent RSI value as a float.
         """
+        # Return the latest RSI value
+        return self.calculate_series(data).iloc[-1]
+
+    def calculate_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Calculates the RSI for every row of 'data' in one vectorized pass.
+        Assumes 'data' is a DataFrame with a 'close' column.
+
+        Returns a Series aligned with data.index; the first 'period' rows are NaN.
+        """
         if 'close' not in data.columns:
             raise ValueError("DataFrame must contain a 'close' column.")
 
@@ -35,7 +50,148 @@ class RsiIndicator(IIndicator):
         rs = avg_gain / avg_loss
 
         # Calculate RSI
-        rsi = 100.0 - (100.0 / (1.0 + rs))
+        return 100.0 - (100.0 / (1.0 + rs))
 
-        # Return the latest RSI value
-        return rsi.iloc[-1]
+    def calculate_panel(self, prices: Union[np.ndarray, pd.DataFrame]) -> Union[np.ndarray, pd.Series]:
+        """
+        Calculates the latest RSI for many symbols at once.
+        'prices' is a 2-D array or wide DataFrame of closes shaped (bars x symbols).
+
+        Only the last period + 1 bars are touched, and every symbol is handled
+        in the same vectorized NumPy operations. Returns an array of RSI values
+        (or a Series indexed by the DataFrame's columns). Symbols with too little
+        history or a NaN inside the window get NaN, as calculate() would.
+        """
+        if isinstance(prices, pd.DataFrame):
+            values = self.calculate_panel(prices.to_numpy(dtype=float))
+            return pd.Series(values, index=prices.columns, name='rsi')
+
+        closes = np.asarray(prices, dtype=float)
+        if closes.ndim != 2:
+            raise ValueError("prices must be 2-D (bars x symbols).")
+
+        if closes.shape[0] < self.period + 1:
+            return np.full(closes.shape[1], np.nan)
+
+        delta = np.diff(closes[-(self.period + 1):], axis=0)
+
+        # Separate gains and losses; NaN deltas propagate into the means
+        gains = np.where(delta > 0, delta, np.where(np.isnan(delta), np.nan, 0.0))
+        losses = np.where(delta < 0, -delta, np.where(np.isnan(delta), np.nan, 0.0))
+
+        avg_gain = gains.mean(axis=0)
+        avg_loss = losses.mean(axis=0)
+
+        # Avoid division by zero
+        avg_loss = np.where(avg_loss == 0, 1e-10, avg_loss)
+
+        rs = avg_gain / avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
+
+    # ------------------------------------------------------------------
+    # Streaming mode
+    # ------------------------------------------------------------------
+
+    def reset(self) -> None:
+        """
+        Clears the streaming state. After a reset, at least period + 1
+        closes must be fed through seed() or update() before a value is available.
+        """
+        self._last_close = None
+        self._gains = deque(maxlen=self.period)
+        self._losses = deque(maxlen=self.period)
+        self._gain_sum = 0.0
+        self._loss_sum = 0.0
+        # Deltas in the window that involve a NaN close; they are kept out of
+        # the sums and make the value NaN until they leave, as in calculate()
+        self._nan_count = 0
+        self._updates_since_resync = 0
+
+    def seed(self, data: Union[pd.DataFrame, Iterable[float]]) -> float:
+        """
+        Seeds the streaming state from history in one pass.
+        Accepts a DataFrame with a 'close' column or any iterable of closes.
+        Only the last period + 1 closes are needed, so long histories are cheap to seed.
+
+        Returns the current RSI value (NaN if there is not enough history).
+        """
+        if isinstance(data, pd.DataFrame):
+            if 'close' not in data.columns:
+                raise ValueError("DataFrame must contain a 'close' column.")
+            closes = data['close'].iloc[-(self.period + 1):].tolist()
+        else:
+            closes = list(data)[-(self.period + 1):]
+
+        self.reset()
+        for close in closes:
+            self.update(close)
+        return self.value
+
+    def update(self, close: float) -> float:
+        """
+        Feeds one new close into the streaming state and returns the latest RSI.
+        Uses the same simple moving averages as calculate(), maintained as running
+        sums over the last 'period' gains and losses, so each update is O(1).
+        """
+        close = float(close)
+        if self._last_close is not None:
+            delta = close - self._last_close
+            if delta != delta:
+                gain = loss = delta
+            else:
+                gain = delta if delta > 0 else 0.0
+                loss = -delta if delta < 0 else 0.0
+
+            if len(self._gains) == self.period:
+                old_gain = self._gains[0]
+                if old_gain != old_gain:
+                    self._nan_count -= 1
+                else:
+                    self._gain_sum -= old_gain
+                    self._loss_sum -= self._losses[0]
+            self._gains.append(gain)
+            self._losses.append(loss)
+            if gain != gain:
+                self._nan_count += 1
+            else:
+                self._gain_sum += gain
+                self._loss_sum += loss
+
+            # Re-sum once per full window so floating-point drift in the
+            # running sums can't accumulate (amortized O(1)).
+            self._updates_since_resync += 1
+            if self._updates_since_resync >= self.period:
+                self._gain_sum = sum(g for g in self._gains if g == g)
+                self._loss_sum = sum(l for l in self._losses if l == l)
+                self._updates_since_resync = 0
+
+        self._last_close = close
+        return self.value
+
+    @property
+    def is_ready(self) -> bool:
+        """
+        True once enough closes have been seen to produce an RSI value.
+        """
+        return len(self._gains) == self.period
+
+    @property
+    def value(self) -> float:
+        """
+        The RSI for the most recent close fed to the streaming state.
+        """
+        if not self.is_ready or self._nan_count:
+            return float('nan')
+
+        avg_gain = self._gain_sum / self.period
+        avg_loss = self._loss_sum / self.period
+
+        # Running sums can leave tiny negative residue; clamp, and mirror
+        # calculate()'s division-by-zero guard.
+        if avg_gain < 0:
+            avg_gain = 0.0
+        if avg_loss <= 0:
+            avg_loss = 1e-10
+
+        rs = avg_gain / avg_loss
+        return 100.0 - (100.0 / (1.0 + rs))
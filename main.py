@@ -1,81 +1,305 @@
 # main.py
 
+import asyncio
 import logging
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
+from typing import List, Optional
 
 from config.config_loader import load_config
-from brokers.paper_broker import PaperBroker
-from brokers.real_broker import RealBroker
-from strategies.classical_strategy import ClassicalStrategy
-from strategies.ml_strategy import MLStrategy
-from strategies.multi_action_strategy import MultiActionStrategy
-from risk_management.basic_risk_manager import BasicRiskManager
-from data.ingestion import fetch_data
-from core.models import Trade
+from core.bars import BarWindow
+from data.bar_store import BarStore
+from data.ingestion import HistoricalDataCache, fetch_data, set_bar_store, set_data_cache
+from plugins.event_bus import PluginEventBus
+from core.instrumentation import LatencyRecorder, NullLatencyRecorder, build_latency_recorder
+from core.interfaces import IBroker, IRiskManager, IStrategy
+from core.registry import BROKERS, PLUGINS, RISK_MANAGERS, STRATEGIES, startup_report
+from core.models import OrderType, Trade
+
+@dataclass
+class SymbolResult:
+    symbol: str
+    order_type: Optional[OrderType] = None
+    placed: bool = False
+    error: Optional[str] = None
+    last_price: Optional[float] = None
+
+# Strategy instance installed once per signal worker process, so tasks
+# only need to pickle the bar window.
+_worker_strategy: Optional[IStrategy] = None
+
+def _init_signal_worker(strategy: IStrategy) -> None:
+    global _worker_strategy
+    _worker_strategy = strategy
+
+def _generate_signal_in_worker(window: BarWindow) -> OrderType:
+    return _worker_strategy.generate_signal_fast(window)
+
+def build_event_bus(config: dict) -> PluginEventBus:
+    """Creates the plugin event bus from the 'plugins' config section."""
+    plugin_config = config.get("plugins", {})
+    plugins = [PLUGINS.create(name) for name in plugin_config.get("enabled", [])]
+    return PluginEventBus(
+        plugins,
+        maxsize=plugin_config.get("queue_size", 1024),
+        overflow_policy=plugin_config.get("overflow_policy", "drop"),
+    )
+
+def parse_interval(interval: str) -> int:
+    """Converts a schedule interval such as '30s', '5m', '1h' or '1d' into seconds."""
+    units = {"s": 1, "m": 60, "h": 3600, "d": 86400}
+    unit = interval[-1].lower()
+    if unit not in units:
+        raise ValueError(f"Invalid schedule interval: {interval}")
+    return int(interval[:-1]) * units[unit]
+
+async def trade_symbol(
+    symbol: str,
+    strategy: IStrategy,
+    risk_manager: IRiskManager,
+    broker: IBroker,
+    io_executor: Executor,
+    signal_executor: Optional[Executor],
+    semaphore: asyncio.Semaphore,
+    order_lock: asyncio.Lock,
+    event_bus: Optional[PluginEventBus] = None,
+    start_date: str = "2023-01-01",
+    end_date: str = "2023-01-10",
+    recorder: LatencyRecorder = NullLatencyRecorder(),
+) -> SymbolResult:
+    """
+    Runs fetch -> generate_signal -> validate_order -> place_order for one symbol.
+    Any exception is logged and reported in the result instead of propagating,
+    so one bad symbol can't take down the rest of the cycle.
+    Stage latencies go to 'recorder' (a no-op unless instrumentation is enabled).
+    """
+    loop = asyncio.get_running_loop()
+    result = SymbolResult(symbol=symbol)
+    strategy_name = type(strategy).__name__
+
+    async with semaphore:
+        try:
+            # Fetch some historical data (mock or real) off the event loop
+            t_start = time.perf_counter_ns()
+            df = await loop.run_in_executor(io_executor, fetch_data, symbol, start_date, end_date)
+            t_fetched = time.perf_counter_ns()
+            recorder.record("fetch", t_fetched - t_start, symbol, strategy_name)
+            if event_bus is not None:
+                event_bus.publish("on_data_fetched", df)
+
+            # Generate a trading signal on the NumPy fast path, in the worker
+            # pool when one is configured
+            # The symbol lets a shared IndicatorEngine reuse this bar's results
+            window = BarWindow.from_dataframe(df, symbol=symbol)
+            if signal_executor is None:
+                order_type = strategy.generate_signal_fast(window)
+            else:
+                order_type = await loop.run_in_executor(signal_executor, _generate_signal_in_worker, window)
+            t_signal = time.perf_counter_ns()
+            recorder.record("signal", t_signal - t_fetched, symbol, strategy_name)
+            result.order_type = order_type
+
+            # Use the last close as the price for demonstration
+            last_close = window.close[-1]
+            result.last_price = float(last_close)
+
+            # Create a trade object (mock quantity)
+            trade = Trade(
+                symbol=symbol,
+                order_type=order_type,
+                quantity=10,
+                price=float(last_close),
+                timestamp=datetime.now()
+            )
+
+            async def place_order() -> None:
+                await loop.run_in_executor(io_executor, broker.place_order, symbol, order_type, trade.quantity)
+                t_placed = time.perf_counter_ns()
+                recorder.record("order", t_placed - t_validated, symbol, strategy_name)
+                recorder.record("tick_to_order", t_placed - t_start, symbol, strategy_name)
+                result.placed = True
+
+            # Risk checks read broker state, so validation is serialized across
+            # symbols. Placement is too, unless the broker takes concurrent
+            # orders (RealBroker batches them into one request), in which case
+            # holding the lock would send them one at a time.
+            async with order_lock:
+                t_validate = time.perf_counter_ns()
+                is_valid = risk_manager.validate_order(trade)
+                t_validated = time.perf_counter_ns()
+                recorder.record("validate", t_validated - t_validate, symbol, strategy_name)
+                if is_valid and not broker.concurrent_orders:
+                    await place_order()
+            if is_valid and broker.concurrent_orders:
+                await place_order()
+
+            # Plugins are notified after the order is out, off the order path
+            # (a full queue under the "block" policy must not delay it)
+            if event_bus is not None:
+                event_bus.publish("on_signal_generated", order_type, df)
+                event_bus.publish("on_order_validated", trade, is_valid)
+                if is_valid:
+                    event_bus.publish("on_trade_executed", trade)
+
+            if is_valid:
+                logging.info(f"Order placed: {trade}")
+            else:
+                logging.warning(f"Trade for {symbol} not placed due to risk constraints.")
+        except Exception as e:
+            logging.exception(f"Trading pipeline failed for {symbol}")
+            result.error = str(e)
+
+    return result
+
+async def run_trading_cycle(
+    symbols: List[str],
+    strategy: IStrategy,
+    risk_manager: IRiskManager,
+    broker: IBroker,
+    config: dict,
+    event_bus: Optional[PluginEventBus] = None,
+    recorder: LatencyRecorder = NullLatencyRecorder(),
+) -> List[SymbolResult]:
+    """
+    Runs the trading pipeline for every symbol concurrently.
+
+    I/O-bound stages (fetching, order placement) run in a thread pool; signal
+    generation runs in a process pool when 'signal_workers' > 0. At most
+    'max_concurrency' symbols are in flight at once. Afterwards the broker
+    revalues its positions against the closes seen in this cycle.
+    """
+    concurrency_config = config.get("concurrency", {})
+    max_concurrency = concurrency_config.get("max_concurrency", 32)
+    signal_workers = concurrency_config.get("signal_workers", 0)
+
+    # Historical window fetched for each symbol
+    history_config = config.get("history", {})
+    start_date = history_config.get("start_date", "2023-01-01")
+    end_date = history_config.get("end_date", "2023-01-10")
+
+    semaphore = asyncio.Semaphore(max_concurrency)
+    order_lock = asyncio.Lock()
+
+    with ThreadPoolExecutor(max_workers=max_concurrency) as io_executor:
+        signal_executor = None
+        if signal_workers > 0:
+            signal_executor = ProcessPoolExecutor(
+                max_workers=signal_workers,
+                initializer=_init_signal_worker,
+                initargs=(strategy,),
+            )
+        # Latency reports go out every dump_interval while the cycle runs
+        dump_task = asyncio.ensure_future(recorder.dump_periodically()) if recorder.enabled else None
+        try:
+            results = await asyncio.gather(*(
+                trade_symbol(symbol, strategy, risk_manager, broker,
+                             io_executor, signal_executor, semaphore, order_lock, event_bus,
+                             start_date, end_date, recorder)
+                for symbol in symbols
+            ))
+        finally:
+            if dump_task is not None:
+                dump_task.cancel()
+            if signal_executor is not None:
+                signal_executor.shutdown()
+
+    # Revalue the whole book against this cycle's closes in one pass
+    broker.update_prices({result.symbol: result.last_price for result in results if result.last_price is not None})
+    return results
 
 def main():
     # 1. Load config
     config = load_config()
     
-    # 2. Pick broker based on config
+    # 2. Pick broker based on config. Components are imported lazily by
+    #    the registries, so only the configured implementations are loaded.
     broker_type = config.get("broker", "paper")
-    if broker_type == "paper":
-        broker = PaperBroker()
+    journal = None
+    journal_dir = config.get("paper", {}).get("journal_dir")
+    if broker_type == "paper" and journal_dir:
+        # Persist fills so a restart recovers trades, positions and balance
+        from brokers.journal import Journal
+        journal = Journal(journal_dir, flush_interval=config["paper"].get("journal_flush_ms", 5) / 1000.0)
+        broker = BROKERS.create("paper", journal=journal)
     else:
-        broker = RealBroker()
+        broker = BROKERS.create(broker_type if broker_type == "paper" else "real", config)
 
     # 3. Pick strategy based on config
     strategy_type = config.get("strategy", "classical_strategy")
-    if strategy_type == "classical_strategy":
-        strategy = ClassicalStrategy()
-    elif strategy_type == "ml_strategy":
-        strategy = MLStrategy(config)
-    elif strategy_type == "multi_action_strategy":
-        strategy = MultiActionStrategy(config)
+    strategy = STRATEGIES.create(strategy_type, config)
+
+    # Serve historical data from a local bar store if one is configured
+    bar_store_path = config.get("bar_store")
+    if bar_store_path:
+        set_bar_store(BarStore(bar_store_path))
+
+    # Keep fetched history in memory, so overlapping windows from later
+    # cycles only load the dates they don't already have
+    cache_config = config.get("data_cache", {})
+    if cache_config.get("enabled", False):
+        set_data_cache(HistoricalDataCache(max_bytes=int(cache_config.get("max_mb", 256)) * 1024 * 1024))
+
+    # 4. Create the risk manager (BasicRiskManager unless configured otherwise)
+    risk_manager_type = config.get("risk_manager", "basic")
+    if risk_manager_type == "advanced":
+        risk_manager = RISK_MANAGERS.create(risk_manager_type, config, broker)
     else:
-        raise ValueError(f"Unknown strategy: {strategy_type}")
+        risk_manager = RISK_MANAGERS.create(risk_manager_type, config)
 
-    # 4. Create instance of BasicRiskManager
-    risk_manager = BasicRiskManager(config)
+    report = startup_report()
+    if config.get("logging", {}).get("startup_report", False):
+        logging.info(report)
+    else:
+        logging.debug(report)
 
-    # 5. Simple trading logic:
+    # 5. Trading loop, run concurrently for every configured symbol:
     #    - Fetch data
     #    - Generate signal
     #    - Create Trade object
     #    - Risk check
     #    - Place order if valid
-    
-    # Example: pick the first symbol from config
     symbols = config.get("symbols", ["AAPL"])
     if not symbols:
         raise ValueError("No symbols configured.")
-    symbol = symbols[0]
 
-    # Fetch some historical data (mock or real)
-    df = fetch_data(symbol, "2023-01-01", "2023-01-10")
+    # Plugin hooks run on background workers fed by bounded queues
+    event_bus = build_event_bus(config)
+    event_bus.start()
+    event_bus.publish("on_app_start")
 
-    # Generate a trading signal
-    order_type = strategy.generate_signal(df)
+    # Per-stage latency histograms, reported to plugins through on_latency_report
+    recorder = build_latency_recorder(config)
+    recorder.add_listener(lambda report: event_bus.publish("on_latency_report", report))
 
-    # Use the last close as the price for demonstration
-    last_close = df.iloc[-1]["Close"]
+    try:
+        cycle_start = time.monotonic()
+        results = asyncio.run(run_trading_cycle(symbols, strategy, risk_manager, broker, config, event_bus, recorder))
+        cycle_seconds = time.monotonic() - cycle_start
+    finally:
+        # One final report covering the whole run
+        if recorder.enabled:
+            recorder.dump()
+        event_bus.publish("on_app_stop")
+        event_bus.stop()
+        broker.close()
+        if journal is not None:
+            journal.close()
+        logging.debug(f"Plugin queue metrics: {event_bus.metrics()}")
 
-    # Create a trade object (mock quantity)
-    trade = Trade(
-        symbol=symbol,
-        order_type=order_type,
-        quantity=10,
-        price=float(last_close),
-        timestamp=datetime.now()
+    failed = [result for result in results if result.error]
+    logging.info(
+        f"Trading cycle finished for {len(results)} symbols in {cycle_seconds:.3f}s "
+        f"({len(failed)} failed)."
     )
 
-    # Validate the trade
-    if risk_manager.validate_order(trade):
-        # If valid, place the order
-        broker.place_order(symbol, order_type, trade.quantity)
-        logging.info(f"Order placed: {trade}")
-    else:
-        logging.warning("Trade not placed due to risk constraints.")
+    interval_seconds = parse_interval(config.get("schedule", {}).get("interval", "5m"))
+    if cycle_seconds > interval_seconds:
+        logging.warning(
+            f"Trading cycle took {cycle_seconds:.3f}s, longer than the {interval_seconds}s bar interval."
+        )
+    return results
 
 if __name__ == "__main__":
     main()
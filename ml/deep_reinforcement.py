@@ -1,7 +1,18 @@
 # ml/deep_reinforcement.py
 
+from typing import List
+
 from ml.model_interfaces import IMLModel
 
+# Policy output -> action string
+ACTIONS = {
+    0: "BUY",
+    1: "SELL",
+    2: "HOLD",
+    3: "BUY_CALL",
+    4: "SELL_CALL",
+}
+
 # For demonstration, we'll mock a deep RL model. In practice, you'd
 # load or define a PyTorch model or use a stable_baselines3 model.
 class MockDeepRLModel:
@@ -31,16 +42,12 @@ class DeepReinforcementModel(IMLModel):
         # We'll take the first prediction for demonstration
         pred_value = prediction[0]
 
-        if pred_value == 0:
-            return "BUY"
-        elif pred_value == 1:
-            return "SELL"
-        elif pred_value == 2:
-            return "HOLD"
-        elif pred_value == 3:
-            return "BUY_CALL"
-        elif pred_value == 4:
-            return "SELL_CALL"
-        else:
-            # Default fallback
-            return "HOLD"
+        # Default fallback is HOLD
+        return ACTIONS.get(pred_value, "HOLD")
+
+    def predict_actions(self, feature_matrix) -> List[str]:
+        """
+        Predicts one action per row with a single policy call.
+        """
+        predictions = self.rl_model.predict(feature_matrix)
+        return [ACTIONS.get(pred_value, "HOLD") for pred_value in predictions]
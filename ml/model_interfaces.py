@@ -1,7 +1,7 @@
 # ml/model_interfaces.py
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, List
 
 class IMLModel(ABC):
     @abstractmethod
@@ -11,6 +11,16 @@ class IMLModel(ABC):
         """
         pass
 
+    def predict_actions(self, feature_matrix: Any) -> List[str]:
+        """
+        Predicts one action per row of 'feature_matrix' (a DataFrame or 2-D array).
+        This default calls predict_action row by row; models backed by a
+        vectorized predictor should override it to score all rows in one call.
+        """
+        if hasattr(feature_matrix, "iloc"):
+            return [self.predict_action(feature_matrix.iloc[[i]]) for i in range(len(feature_matrix))]
+        return [self.predict_action(feature_matrix[i:i + 1]) for i in range(len(feature_matrix))]
+
 class IMLTrainer(ABC):
     @abstractmethod
     def train(self, data: Any) -> None:
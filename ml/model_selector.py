@@ -1,5 +1,6 @@
 # ml/model_selector.py
 
+from core.registry import ML_MODELS
 from ml.model_interfaces import IMLModel
 
 # Placeholder classes for demonstration. In a real implementation,
@@ -8,19 +9,25 @@ class RandomForestModel(IMLModel):
     def predict_action(self, features):
         return "BUY"  # Placeholder logic
 
+    def predict_actions(self, feature_matrix):
+        return ["BUY"] * len(feature_matrix)
+
 class DeepRLModel(IMLModel):
     def predict_action(self, features):
         return "HOLD"  # Placeholder logic
 
+    def predict_actions(self, feature_matrix):
+        return ["HOLD"] * len(feature_matrix)
+
 def get_ml_model(config: dict) -> IMLModel:
     """
     Returns an instance of an IMLModel based on the 'ml_model' key in the config.
+
+    Models are looked up in the ML_MODELS registry, so a backend's module (and
+    its heavy dependencies) is only imported when selected, and one loaded
+    instance is shared by every strategy in the process.
     """
     ml_model_type = config.get("ml_model", "random_forest")
-
-    if ml_model_type == "random_forest":
-        return RandomForestModel()
-    elif ml_model_type == "deep_rl":
-        return DeepRLModel()
-    else:
+    if ml_model_type not in ML_MODELS.names():
         raise ValueError(f"Unknown ML model type: {ml_model_type}")
+    return ML_MODELS.shared(ml_model_type)
@@ -1,7 +1,16 @@
 # ml/random_forest_model.py
 
+from typing import List
+
 from ml.model_interfaces import IMLModel
 
+# Classifier output -> action string
+ACTIONS = {
+    0: "BUY",
+    1: "SELL",
+    2: "HOLD",
+}
+
 # For demonstration, we'll mock the RandomForestClassifier.
 # In a real implementation, you'd import and train or load
 # a pre-trained RandomForest model from sklearn.
@@ -26,16 +35,16 @@ class RandomForestModel(IMLModel):
             2 -> HOLD
         """
         prediction = self.clf.predict(features)  # Expecting a list/array of predictions
-        
+
         # We'll take the first prediction for demonstration
         pred_value = prediction[0]
-        
-        if pred_value == 0:
-            return "BUY"
-        elif pred_value == 1:
-            return "SELL"
-        elif pred_value == 2:
-            return "HOLD"
-        else:
-            # You could add more mapping or raise an error
-            return "HOLD"
+
+        # You could add more mapping or raise an error
+        return ACTIONS.get(pred_value, "HOLD")
+
+    def predict_actions(self, feature_matrix) -> List[str]:
+        """
+        Predicts one action per row with a single classifier call.
+        """
+        predictions = self.clf.predict(feature_matrix)
+        return [ACTIONS.get(pred_value, "HOLD") for pred_value in predictions]
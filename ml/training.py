@@ -0,0 +1,71 @@
+# ml/training.py
+
+import os
+import statistics
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Iterable, List, Optional
+
+import pandas as pd
+
+from data.processing import Fold, select_rows
+from ml.model_interfaces import IMLTrainer
+
+# Per-worker training data, set once by _init_worker so each fold task only
+# carries its row ranges.
+_worker_data: Optional[pd.DataFrame] = None
+_worker_factory: Optional[Callable[[], IMLTrainer]] = None
+
+def _init_worker(data: pd.DataFrame, trainer_factory: Callable[[], IMLTrainer]) -> None:
+    global _worker_data, _worker_factory
+    _worker_data = data
+    _worker_factory = trainer_factory
+
+def _fit_and_score(data: pd.DataFrame, trainer_factory: Callable[[], IMLTrainer], fold: Fold) -> float:
+    train_rows, test_rows = fold
+    trainer = trainer_factory()
+    trainer.train(select_rows(data, train_rows))
+    return trainer.evaluate(select_rows(data, test_rows))
+
+def _run_fold(fold: Fold) -> float:
+    return _fit_and_score(_worker_data, _worker_factory, fold)
+
+@dataclass
+class CrossValidationResult:
+    scores: List[float]
+    mean: float
+    std: float
+
+def cross_validate(
+    trainer_factory: Callable[[], IMLTrainer],
+    data: pd.DataFrame,
+    folds: Iterable[Fold],
+    max_workers: Optional[int] = None,
+) -> CrossValidationResult:
+    """
+    Trains a fresh IMLTrainer on every fold and aggregates the evaluate() scores.
+
+    Folds come from data.processing.walk_forward_splits or purged_kfold_splits
+    and are resolved to row views inside the worker, so no per-fold copies of
+    the data are made up front. Folds run in parallel across processes; the
+    data is sent to each worker once. 'trainer_factory' must be picklable
+    (e.g. the trainer class itself). With max_workers=1 folds run in-process.
+    """
+    folds = list(folds)
+    max_workers = max_workers or min(len(folds), os.cpu_count() or 1)
+
+    if max_workers <= 1:
+        scores = [_fit_and_score(data, trainer_factory, fold) for fold in folds]
+    else:
+        with ProcessPoolExecutor(
+            max_workers=max_workers,
+            initializer=_init_worker,
+            initargs=(data, trainer_factory),
+        ) as executor:
+            scores = list(executor.map(_run_fold, folds))
+
+    return CrossValidationResult(
+        scores=scores,
+        mean=statistics.mean(scores) if scores else float("nan"),
+        std=statistics.pstdev(scores) if len(scores) > 1 else 0.0,
+    )
@@ -0,0 +1,128 @@
+# plugins/event_bus.py
+
+import logging
+import queue
+import threading
+from dataclasses import dataclass
+from typing import Dict, List
+
+from core.interfaces import IPlugin
+
+# Hooks that may be published through the bus
+PLUGIN_HOOKS = (
+    "on_app_start",
+    "on_app_stop",
+    "on_data_fetched",
+    "on_signal_generated",
+    "on_order_validated",
+    "on_trade_executed",
+    "on_latency_report",
+)
+
+OVERFLOW_POLICIES = ("drop", "block")
+
+_STOP = object()
+
+@dataclass
+class QueueMetrics:
+    depth: int = 0
+    max_depth: int = 0
+    published: int = 0
+    processed: int = 0
+    dropped: int = 0
+    errors: int = 0
+
+class _PluginWorker:
+    """
+    A bounded queue plus a daemon thread that calls one plugin's hooks in order.
+    """
+
+    def __init__(self, plugin: IPlugin, maxsize: int):
+        self.plugin = plugin
+        self.queue: "queue.Queue" = queue.Queue(maxsize=maxsize)
+        self.metrics = QueueMetrics()
+        self.thread = threading.Thread(
+            target=self._run, name=f"plugin-{type(plugin).__name__}", daemon=True
+        )
+
+    def _run(self) -> None:
+        while True:
+            event = self.queue.get()
+            if event is _STOP:
+                break
+            hook, args = event
+            try:
+                getattr(self.plugin, hook)(*args)
+            except Exception:
+                self.metrics.errors += 1
+                logging.exception(f"Plugin {type(self.plugin).__name__}.{hook} failed")
+            self.metrics.processed += 1
+
+class PluginEventBus:
+    """
+    Dispatches IPlugin hooks to background workers so plugin I/O never runs
+    on the trading path.
+
+    Each plugin has its own bounded queue and worker thread, so events reach a
+    plugin in the order they were published, and a slow plugin only delays
+    itself. When a queue is full, the "drop" policy discards the new event
+    (and counts it), while "block" makes the publisher wait for space.
+    """
+
+    def __init__(self, plugins: List[IPlugin], maxsize: int = 1024, overflow_policy: str = "drop"):
+        if overflow_policy not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unknown overflow policy: {overflow_policy}")
+        self.overflow_policy = overflow_policy
+        self._workers = [_PluginWorker(plugin, maxsize) for plugin in plugins]
+        self._started = False
+
+    def start(self) -> None:
+        if not self._started:
+            for worker in self._workers:
+                worker.thread.start()
+            self._started = True
+
+    def publish(self, hook: str, *args) -> None:
+        """
+        Queues 'hook' with 'args' for every plugin. Never calls plugin code directly.
+        """
+        if hook not in PLUGIN_HOOKS:
+            raise ValueError(f"Unknown plugin hook: {hook}")
+
+        event = (hook, args)
+        for worker in self._workers:
+            metrics = worker.metrics
+            metrics.published += 1
+            if self.overflow_policy == "block":
+                worker.queue.put(event)
+            else:
+                try:
+                    worker.queue.put_nowait(event)
+                except queue.Full:
+                    metrics.dropped += 1
+                    continue
+            depth = worker.queue.qsize()
+            if depth > metrics.max_depth:
+                metrics.max_depth = depth
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """
+        Lets each worker drain its queue, then stops it.
+        """
+        if not self._started:
+            return
+        for worker in self._workers:
+            worker.queue.put(_STOP)
+        for worker in self._workers:
+            worker.thread.join(timeout)
+        self._started = False
+
+    def metrics(self) -> Dict[str, QueueMetrics]:
+        """
+        Returns per-plugin queue metrics keyed by plugin class name.
+        """
+        result = {}
+        for worker in self._workers:
+            worker.metrics.depth = worker.queue.qsize()
+            result[type(worker.plugin).__name__] = worker.metrics
+        return result
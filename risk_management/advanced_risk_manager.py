@@ -1,8 +1,9 @@
 # risk_management/advanced_risk_manager.py
 
 from typing import List
+import numpy as np
 from core.interfaces import IRiskManager
-from core.models import Trade, Position, OrderType
+from core.models import Trade, Position, OrderType, OrderValidation
 from brokers.paper_broker import PaperBroker  # Assuming using PaperBroker for accessing positions
 import logging
 
@@ -48,26 +49,26 @@ class AdvancedRiskManager(IRiskManager):
             return False
 
         # 2. Check maximum number of open positions
-        current_positions: List[Position] = self.broker.get_positions()
-        if len(current_positions) >= self.max_open_positions and not self._position_exists(trade.symbol):
+        open_positions = self._open_position_count()
+        if open_positions >= self.max_open_positions and not self._position_exists(trade.symbol):
             logging.warning(
-                f"Number of open positions {len(current_positions)} exceeds max allowed {self.max_open_positions}."
+                f"Number of open positions {open_positions} exceeds max allowed {self.max_open_positions}."
             )
             return False
 
         # 3. Check total exposure
-        total_exposure = self._calculate_total_exposure(current_positions, trade)
+        total_exposure = self._calculate_total_exposure(trade)
         if total_exposure > self.max_total_exposure:
             logging.warning(
                 f"Total exposure {total_exposure} exceeds max allowed {self.max_total_exposure}."
             )
             return False
 
-        # 4. Check leverage
-        current_balance = self.broker.get_balance()
-        if total_exposure > current_balance * self.leverage:
+        # 4. Check leverage against live equity (cash plus marked positions)
+        current_equity = self.broker.get_equity()
+        if total_exposure > current_equity * self.leverage:
             logging.warning(
-                f"Total exposure {total_exposure} exceeds allowed leverage {self.leverage}x of balance {current_balance}."
+                f"Total exposure {total_exposure} exceeds allowed leverage {self.leverage}x of equity {current_equity}."
             )
             return False
 
@@ -87,17 +88,110 @@ class AdvancedRiskManager(IRiskManager):
         logging.info("Trade validated successfully.")
         return True
 
-    def _calculate_total_exposure(self, current_positions: List[Position], trade: Trade) -> float:
+    def validate_orders(self, trades: List[Trade]) -> OrderValidation:
+        """
+        Validates a batch of trades in submission order, as if each accepted
+        trade had been placed before the next one is checked.
+
+        Per-trade checks (position size, stop-loss) are evaluated for the whole
+        batch at once. Exposure, leverage and open-position counts are running
+        totals over the accepted trades, kept in a single pass: a rejected trade
+        is simply left out of them. Sells are assumed not to close positions
+        within the batch.
+
+        :param trades: The Trade objects to validate, in submission order.
+        :return: OrderValidation with an accept mask and per-trade rejection reasons.
+        """
+        n = len(trades)
+        reasons: List[str] = [None] * n
+        if n == 0:
+            return OrderValidation(accepted=np.zeros(0, dtype=bool), reasons=reasons)
+
+        quantities = np.fromiter((trade.quantity for trade in trades), dtype=float, count=n)
+        prices = np.fromiter((trade.price for trade in trades), dtype=float, count=n)
+        is_buy = np.array([trade.order_type in {OrderType.BUY, OrderType.BUY_CALL, OrderType.BUY_PUT} for trade in trades])
+        is_sell = np.array([trade.order_type in {OrderType.SELL, OrderType.SELL_CALL, OrderType.SELL_PUT} for trade in trades])
+
+        # Map symbols to dense codes and look each distinct symbol up once
+        codes = np.empty(n, dtype=np.int64)
+        symbol_codes = {}
+        for i, trade in enumerate(trades):
+            codes[i] = symbol_codes.setdefault(trade.symbol, len(symbol_codes))
+        held = np.array([self._position_exists(symbol) for symbol in symbol_codes], dtype=bool)[codes]
+
+        rejected = np.zeros(n, dtype=bool)
+
+        # 1. Check individual position size
+        oversized = quantities > self.max_position_size
+        for i in np.flatnonzero(oversized):
+            reasons[i] = f"Trade quantity {quantities[i]} exceeds max position size {self.max_position_size}."
+        rejected |= oversized
+
+        # 5. Check stop-loss (same simplified rule as validate_order)
+        stop_loss_hit = is_buy & (prices < prices * (1 - self.stop_loss_percent)) & ~rejected
+        for i in np.flatnonzero(stop_loss_hit):
+            reasons[i] = f"Trade price {prices[i]} triggers stop-loss at {prices[i] * (1 - self.stop_loss_percent)}."
+        rejected |= stop_loss_hit
+
+        # 2-4. Sequential portfolio checks, one pass with running totals over
+        # the trades accepted so far; a rejected trade never enters them
+        deltas = np.where(is_buy, quantities * prices, np.where(is_sell, -quantities * prices, 0.0))
+        exposure = self._current_exposure()
+        open_count = self._open_position_count()
+        max_leveraged = self.broker.get_equity() * self.leverage
+        opened = [False] * len(symbol_codes)  # symbols opened by accepted buys
+
+        for i, (code, delta, buy, was_held, skip) in enumerate(zip(
+                codes.tolist(), deltas.tolist(), is_buy.tolist(), held.tolist(), rejected.tolist())):
+            if skip:
+                continue
+            has_position = was_held or opened[code]
+            new_exposure = exposure + delta
+            if open_count >= self.max_open_positions and not has_position:
+                reasons[i] = f"Number of open positions {open_count} exceeds max allowed {self.max_open_positions}."
+            elif new_exposure > self.max_total_exposure:
+                reasons[i] = f"Total exposure {new_exposure} exceeds max allowed {self.max_total_exposure}."
+            elif new_exposure > max_leveraged:
+                reasons[i] = f"Total exposure {new_exposure} exceeds allowed leverage {self.leverage}x of equity {max_leveraged / self.leverage}."
+            else:
+                exposure = new_exposure
+                if buy and not has_position:
+                    opened[code] = True
+                    open_count += 1
+                continue
+            rejected[i] = True
+
+        accepted = ~rejected
+        logging.info(f"Validated {n} trades: {int(accepted.sum())} accepted, {int(rejected.sum())} rejected.")
+        return OrderValidation(accepted=accepted, reasons=reasons)
+
+    def _open_position_count(self) -> int:
+        """
+        Returns the number of open positions, read from the PaperBroker's
+        running aggregate when available.
+        """
+        if isinstance(self.broker, PaperBroker):
+            return self.broker.open_position_count
+        return sum(1 for position in self.broker.get_positions() if position.quantity > 0)
+
+    def _current_exposure(self) -> float:
+        """
+        Returns the market exposure of the current positions, read from the
+        PaperBroker's running aggregate when available.
+        """
+        if isinstance(self.broker, PaperBroker):
+            return self.broker.gross_exposure
+        current_positions: List[Position] = self.broker.get_positions()
+        return sum(position.quantity * position.avg_price for position in current_positions)
+
+    def _calculate_total_exposure(self, trade: Trade) -> float:
         """
         Calculates the total market exposure including the new trade.
 
-        :param current_positions: List of current open positions.
         :param trade: The new Trade to be considered.
         :return: Total exposure as a float.
         """
-        exposure = 0.0
-        for position in current_positions:
-            exposure += position.quantity * position.avg_price
+        exposure = self._current_exposure()
 
         # Include the new trade's exposure
         if trade.order_type in {OrderType.BUY, OrderType.BUY_CALL, OrderType.BUY_PUT}:
@@ -115,10 +209,14 @@ class AdvancedRiskManager(IRiskManager):
         :param symbol: The trading symbol to check.
         :return: True if position exists, False otherwise.
         """
-        current_positions: List[Position] = self.broker.get_positions()
-        for position in current_positions:
-            if position.symbol == symbol and position.quantity > 0:
-                logging.debug(f"Position exists for symbol: {symbol}")
-                return True
-        logging.debug(f"No existing position for symbol: {symbol}")
-        return False
+        if isinstance(self.broker, PaperBroker):
+            exists = self.broker.has_position(symbol)
+        else:
+            current_positions: List[Position] = self.broker.get_positions()
+            exists = any(position.symbol == symbol and position.quantity > 0 for position in current_positions)
+
+        if exists:
+            logging.debug(f"Position exists for symbol: {symbol}")
+        else:
+            logging.debug(f"No existing position for symbol: {symbol}")
+        return exists
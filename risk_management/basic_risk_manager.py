@@ -1,7 +1,11 @@
 # risk_management/basic_risk_manager.py
 
+from typing import List
+
+import numpy as np
+
 from core.interfaces import IRiskManager
-from core.models import Trade
+from core.models import Trade, OrderValidation
 
 class BasicRiskManager(IRiskManager):
     """
@@ -26,3 +30,17 @@ class BasicRiskManager(IRiskManager):
         # Other checks (e.g., price constraints, stop-loss triggers, etc.) can go here.
 
         return True
+
+    def validate_orders(self, trades: List[Trade]) -> OrderValidation:
+        """
+        Validates a batch of trades with the same constraints as validate_order,
+        checked for all trades at once.
+        """
+        quantities = np.fromiter((trade.quantity for trade in trades), dtype=float, count=len(trades))
+        accepted = quantities <= self.max_position_size
+
+        reasons = [
+            None if ok else f"Trade quantity {quantity} exceeds max position size {self.max_position_size}."
+            for ok, quantity in zip(accepted, quantities)
+        ]
+        return OrderValidation(accepted=accepted, reasons=reasons)
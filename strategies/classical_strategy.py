@@ -1,25 +1,94 @@
 # strategies/classical_strategy.py
 
+from typing import List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from core.bars import BarWindow
 from core.interfaces import IStrategy
 from core.models import OrderType
+from indicators.engine import IndicatorEngine, Node, Rsi
 from indicators.rsi import RsiIndicator
 
 class ClassicalStrategy(IStrategy):
-    def __init__(self, period=14):
+    def __init__(self, period=14, oversold: float = 30, overbought: float = 70,
+                 engine: Optional[IndicatorEngine] = None):
         self.rsi_indicator = RsiIndicator(period=period)
+        self.oversold = oversold
+        self.overbought = overbought
+        # When an IndicatorEngine is shared with other strategies, RSI and its
+        # intermediates are computed once per bar for all of them.
+        self.engine = engine
+        self.rsi_node = Rsi(period)
+        if engine is not None:
+            engine.register(self.required_indicators())
+
+    def required_indicators(self) -> List[Node]:
+        """
+        The indicator nodes this strategy reads from a shared IndicatorEngine.
+        """
+        return [self.rsi_node]
+
+    def _latest_rsi(self, data) -> float:
+        if self.engine is not None:
+            return self.engine.latest(self.rsi_node, data)
+        return self.rsi_indicator.calculate(data)
 
     def generate_signal(self, data) -> OrderType:
         """
         Uses a classical RSI-based strategy:
-          - If RSI < 30, return BUY
-          - If RSI > 70, return SELL
+          - If RSI < oversold (default 30), return BUY
+          - If RSI > overbought (default 70), return SELL
           - Otherwise, HOLD
         """
-        rsi_value = self.rsi_indicator.calculate(data)
+        return self._signal_for(self._latest_rsi(data))
 
-        if rsi_value < 30:
+    def generate_signal_fast(self, window: BarWindow) -> OrderType:
+        """
+        Same decision as generate_signal, computed from the last period + 1
+        closes of the window's array (through the shared engine if there is one).
+        """
+        if self.engine is not None:
+            return self._signal_for(self.engine.latest_fast(self.rsi_node, window))
+        period = self.rsi_indicator.period
+        rsi_value = self.rsi_indicator.calculate_panel(window.close[-(period + 1):, None])[0]
+        return self._signal_for(rsi_value)
+
+    def _signal_for(self, rsi_value: float) -> OrderType:
+        if rsi_value < self.oversold:
             return OrderType.BUY
-        elif rsi_value > 70:
+        elif rsi_value > self.overbought:
             return OrderType.SELL
         else:
             return OrderType.HOLD
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized equivalent of calling generate_signal on every prefix of 'data'.
+        """
+        rsi_series = self.rsi_indicator.calculate_series(data).to_numpy()
+
+        signals = np.full(len(rsi_series), OrderType.HOLD, dtype=object)
+        signals[rsi_series < self.oversold] = OrderType.BUY
+        signals[rsi_series > self.overbought] = OrderType.SELL
+        return pd.Series(signals, index=data.index, dtype=object)
+
+    def generate_signals(self, prices: Union[np.ndarray, pd.DataFrame]) -> Union[np.ndarray, pd.Series]:
+        """
+        Applies the same RSI thresholds to a whole universe in one vectorized pass.
+        'prices' is a 2-D array or wide DataFrame of closes shaped (bars x symbols).
+
+        Returns an object array of OrderType per symbol, or a Series indexed by
+        symbol when given a DataFrame.
+        """
+        rsi_values = self.rsi_indicator.calculate_panel(prices)
+
+        rsi_array = np.asarray(rsi_values, dtype=float)
+        signals = np.full(rsi_array.shape, OrderType.HOLD, dtype=object)
+        signals[rsi_array < self.oversold] = OrderType.BUY
+        signals[rsi_array > self.overbought] = OrderType.SELL
+
+        if isinstance(rsi_values, pd.Series):
+            return pd.Series(signals, index=rsi_values.index, name='signal')
+        return signals
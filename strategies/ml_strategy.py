@@ -1,11 +1,17 @@
 # strategies/ml_strategy.py
 
+from typing import Dict, List, Union
+
 import pandas as pd
 
+from core.bars import BarWindow
 from core.interfaces import IStrategy
 from core.models import OrderType
 from ml.model_selector import get_ml_model
 
+# Action string -> OrderType, for mapping batched predictions without try/except per row
+_ORDER_TYPES_BY_VALUE = {order_type.value: order_type for order_type in OrderType}
+
 class MLStrategy(IStrategy):
     def __init__(self, config: dict):
         """
@@ -33,3 +39,41 @@ class MLStrategy(IStrategy):
         except ValueError:
             # If not recognized, default to HOLD
             return OrderType.HOLD
+
+    def generate_signal_fast(self, window: BarWindow) -> OrderType:
+        """
+        Generates a signal from the last bar of 'window', passed to the model
+        as a 1 x 5 array of open, high, low, close and volume.
+        """
+        prediction_str = self.model.predict_action(window.features())
+        return _ORDER_TYPES_BY_VALUE.get(prediction_str, OrderType.HOLD)
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized equivalent of calling generate_signal on every prefix of 'data':
+        each row is scored as features in one batched model call.
+        """
+        return pd.Series(self._to_order_types(self.model.predict_actions(data)), index=data.index, dtype=object)
+
+    def generate_signals(self, data_by_symbol: Union[Dict[str, pd.DataFrame], pd.DataFrame]) -> Dict[str, OrderType]:
+        """
+        Generates the latest signal for a whole universe with a single model call.
+        Accepts either a dict of per-symbol DataFrames (their last rows are used)
+        or a DataFrame of features with one row per symbol, indexed by symbol.
+        """
+        if isinstance(data_by_symbol, pd.DataFrame):
+            features = data_by_symbol
+            symbols = list(features.index)
+        else:
+            symbols = list(data_by_symbol)
+            if not symbols:
+                return {}
+            features = pd.concat([data_by_symbol[symbol].iloc[[-1]] for symbol in symbols])
+
+        predictions = self.model.predict_actions(features)
+        return dict(zip(symbols, self._to_order_types(predictions)))
+
+    @staticmethod
+    def _to_order_types(predictions: List[str]) -> List[OrderType]:
+        # Unrecognized predictions default to HOLD, as in generate_signal
+        return [_ORDER_TYPES_BY_VALUE.get(prediction, OrderType.HOLD) for prediction in predictions]
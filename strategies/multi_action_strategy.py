@@ -1,9 +1,14 @@
 # strategies/multi_action_strategy.py
 
+from typing import Dict, List, Optional
+
+import numpy as np
 import pandas as pd
 
+from core.bars import BarWindow
 from core.interfaces import IStrategy
 from core.models import OrderType
+from indicators.engine import IndicatorEngine, Node, Rsi
 from indicators.rsi import RsiIndicator
 from ml.model_selector import get_ml_model
 
@@ -14,27 +19,60 @@ class MultiActionStrategy(IStrategy):
     BUY_CALL, BUY_PUT, SELL_CALL, SELL_PUT, etc.
     """
 
-    def __init__(self, config: dict, rsi_period: int = 14):
+    def __init__(self, config: dict, rsi_period: int = 14, oversold: float = 30, overbought: float = 70,
+                 engine: Optional[IndicatorEngine] = None):
         self.rsi_indicator = RsiIndicator(period=rsi_period)
+        self.oversold = oversold
+        self.overbought = overbought
         self.model = get_ml_model(config)  # The model might return "call", "put", etc.
+        # Optional shared IndicatorEngine; see ClassicalStrategy
+        self.engine = engine
+        self.rsi_node = Rsi(rsi_period)
+        if engine is not None:
+            engine.register(self.required_indicators())
+
+    def required_indicators(self) -> List[Node]:
+        """
+        The indicator nodes this strategy reads from a shared IndicatorEngine.
+        """
+        return [self.rsi_node]
 
     def generate_signal(self, data: pd.DataFrame) -> OrderType:
         # Calculate RSI
-        rsi_value = self.rsi_indicator.calculate(data)
-        
-        # Basic RSI-based category
-        if rsi_value < 30:
-            rsi_bias = "bullish"
-        elif rsi_value > 70:
-            rsi_bias = "bearish"
+        if self.engine is not None:
+            rsi_value = self.engine.latest(self.rsi_node, data)
         else:
-            rsi_bias = "neutral"
+            rsi_value = self.rsi_indicator.calculate(data)
 
         # Get an ML model suggestion (mocked to return a single string, e.g., "call", "put")
         # Here we take the last row as features:
         features = data.iloc[[-1]]
         ml_output = self.model.predict_action(features)
 
+        return self._decide(rsi_value, ml_output)
+
+    def generate_signal_fast(self, window: BarWindow) -> OrderType:
+        """
+        Same decision as generate_signal, computed from the window's arrays:
+        RSI over the last period + 1 closes and the model on the last bar.
+        """
+        if self.engine is not None:
+            rsi_value = self.engine.latest_fast(self.rsi_node, window)
+        else:
+            period = self.rsi_indicator.period
+            rsi_value = self.rsi_indicator.calculate_panel(window.close[-(period + 1):, None])[0]
+        ml_output = self.model.predict_action(window.features())
+        return self._decide(rsi_value, ml_output)
+
+    def _decide(self, rsi_value: float, ml_output: str) -> OrderType:
+        # Basic RSI-based category
+        if rsi_value < self.oversold:
+            rsi_bias = "bullish"
+        elif rsi_value > self.overbought:
+            rsi_bias = "bearish"
+        else:
+            rsi_bias = "neutral"
+
         # Combine RSI bias + ML output into final multi-action decision
         if rsi_bias == "bullish" and ml_output.lower() == "call":
             return OrderType.BUY_CALL
@@ -47,3 +85,51 @@ class MultiActionStrategy(IStrategy):
         else:
             # If we're neutral or don't match above conditions, just HOLD
             return OrderType.HOLD
+
+    def generate_signal_series(self, data: pd.DataFrame) -> pd.Series:
+        """
+        Vectorized equivalent of calling generate_signal on every prefix of 'data':
+        one RSI pass and one batched model call for the whole history.
+        """
+        rsi_values = self.rsi_indicator.calculate_series(data).to_numpy()
+        ml_outputs = self.model.predict_actions(data)
+        signals = self._combine(rsi_values, ml_outputs)
+        return pd.Series(signals, index=data.index, dtype=object)
+
+    def generate_signals(self, data_by_symbol: Dict[str, pd.DataFrame]) -> Dict[str, OrderType]:
+        """
+        Generates the latest signal for every symbol with a single model call
+        over the stacked last rows.
+        """
+        symbols = list(data_by_symbol)
+        if not symbols:
+            return {}
+
+        period = self.rsi_indicator.period
+        rsi_values = np.array([
+            self.rsi_indicator.calculate_panel(
+                data_by_symbol[symbol]['close'].to_numpy(dtype=float)[-(period + 1):, None]
+            )[0]
+            for symbol in symbols
+        ])
+        features = pd.concat([data_by_symbol[symbol].iloc[[-1]] for symbol in symbols])
+        ml_outputs = self.model.predict_actions(features)
+
+        return dict(zip(symbols, self._combine(rsi_values, ml_outputs)))
+
+    def _combine(self, rsi_values: np.ndarray, ml_outputs: List[str]) -> np.ndarray:
+        """
+        Array form of generate_signal's RSI bias + ML output decision table.
+        """
+        ml_outputs = np.array([output.lower() for output in ml_outputs], dtype=object)
+        bullish = rsi_values < self.oversold
+        bearish = rsi_values > self.overbought
+        call = ml_outputs == "call"
+        put = ml_outputs == "put"
+
+        signals = np.full(len(rsi_values), OrderType.HOLD, dtype=object)
+        signals[bullish & call] = OrderType.BUY_CALL
+        signals[bullish & put] = OrderType.BUY_PUT
+        signals[bearish & call] = OrderType.SELL_CALL
+        signals[bearish & put] = OrderType.SELL_PUT
+        return signals
@@ -0,0 +1,60 @@
+# tests/test_backtest_engine.py
+
+import numpy as np
+import pandas as pd
+
+from backtesting.engine import Backtester
+from core.interfaces import IStrategy
+from core.models import OrderType
+
+class FixedSignals(IStrategy):
+    def __init__(self, signals):
+        self.signals = signals
+
+    def generate_signal(self, data) -> OrderType:
+        return self.signals[len(data) - 1]
+
+    def generate_signal_series(self, data):
+        return pd.Series(self.signals, index=data.index, dtype=object)
+
+def reference_backtest(signals, prices, starting_balance, quantity):
+    """
+    Bar-by-bar loop with PaperBroker's rules: sells that would take the
+    position below zero are rejected.
+    """
+    cash, position = starting_balance, 0.0
+    equity, trades = [], []
+    for i, (signal, price) in enumerate(zip(signals, prices)):
+        if signal == OrderType.BUY:
+            position += quantity
+            cash -= quantity * price
+            trades.append((i, signal, quantity, price, position))
+        elif signal == OrderType.SELL and position >= quantity:
+            position -= quantity
+            cash += quantity * price
+            trades.append((i, signal, quantity, price, position))
+        equity.append(cash + position * price)
+    return equity, trades
+
+def test_vectorized_backtest_matches_bar_by_bar_loop():
+    rng = np.random.default_rng(11)
+    n = 300
+    choices = [OrderType.BUY, OrderType.SELL, OrderType.HOLD]
+    # Sells before any buy, then a random mix with runs of oversized sells
+    signals = [OrderType.SELL, OrderType.SELL, OrderType.HOLD, OrderType.BUY, OrderType.SELL, OrderType.SELL]
+    signals += [choices[i] for i in rng.choice(3, size=n - len(signals), p=[0.3, 0.4, 0.3])]
+    prices = 100 + rng.normal(size=n).cumsum()
+    data = pd.DataFrame({"close": prices}, index=pd.date_range("2024-01-01", periods=n, freq="D"))
+
+    result = Backtester(FixedSignals(signals), starting_balance=10000.0, quantity=5).run(data)
+    equity, trades = reference_backtest(signals, prices, 10000.0, 5)
+
+    np.testing.assert_allclose(result.equity.to_numpy(), equity, rtol=1e-12)
+    rows, order_types, quantities, fill_prices, positions = zip(*trades)
+    assert result.trades.index.equals(data.index[list(rows)])
+    assert result.trades["order_type"].tolist() == list(order_types)
+    assert result.trades["quantity"].tolist() == list(quantities)
+    assert result.trades["price"].tolist() == list(fill_prices)
+    assert result.trades["position"].tolist() == list(positions)
+    assert result.stats["n_trades"] == len(trades)
+    assert result.trades.index[0] == data.index[3]  # the leading sells were rejected
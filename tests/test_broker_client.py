@@ -0,0 +1,83 @@
+# tests/test_broker_client.py
+
+import asyncio
+import threading
+
+from brokers.broker_client import AsyncBrokerClient
+from brokers.real_broker import RealBroker
+from brokers.stub_server import StubBrokerServer
+from core.models import OrderType
+
+def run_with_server(scenario, **server_kwargs):
+    """
+    Starts a StubBrokerServer and a client on one event loop, runs
+    scenario(server, client) and returns its result.
+    """
+    async def run():
+        server = StubBrokerServer(**server_kwargs)
+        await server.start()
+        client = AsyncBrokerClient(server.base_url, batch_window=0.01)
+        try:
+            return await scenario(server, client)
+        finally:
+            await client.close()
+            await server.stop()
+
+    return asyncio.run(run())
+
+def test_requests_reuse_keep_alive_connection():
+    async def scenario(server, client):
+        for _ in range(5):
+            client.snapshot.invalidate()
+            await client.account()
+        await client.place_order("AAPL", OrderType.BUY, 1)
+        return server
+
+    server = run_with_server(scenario)
+    assert server.requests["GET /v1/account"] == 5
+    assert server.connections == 1
+
+def test_concurrent_orders_are_sent_as_one_batch():
+    async def scenario(server, client):
+        results = await asyncio.gather(*(client.place_order("AAPL", OrderType.BUY, 1) for _ in range(20)))
+        return server, results
+
+    server, results = run_with_server(scenario, prices={"AAPL": 150.0})
+    assert server.requests["POST /v1/orders/batch"] == 1
+    assert [r["status"] for r in results] == ["filled"] * 20
+    assert len({r["order_id"] for r in results}) == 20
+    assert server.positions["AAPL"]["quantity"] == 20
+
+def test_snapshot_is_cached_and_invalidated_by_fills():
+    async def scenario(server, client):
+        first = await asyncio.gather(*(client.balance() for _ in range(10)))
+        cached = await client.balance()
+        await client.place_order("AAPL", OrderType.BUY, 2)
+        after_fill = await client.balance()
+        return server, first, cached, after_fill
+
+    server, first, cached, after_fill = run_with_server(
+        scenario, starting_balance=1000.0, prices={"AAPL": 100.0}
+    )
+    assert first == [1000.0] * 10
+    assert cached == 1000.0
+    assert after_fill == 800.0
+    assert server.requests["GET /v1/account"] == 2
+
+def test_real_broker_batches_orders_from_threads_and_skips_hold():
+    server = StubBrokerServer(prices={"AAPL": 10.0})
+    base_url = server.start_in_thread()
+    broker = RealBroker({"real_broker": {"base_url": base_url, "batch_window_ms": 20}})
+    try:
+        threads = [threading.Thread(target=broker.place_order, args=("AAPL", OrderType.BUY, 1)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        broker.place_order("AAPL", OrderType.HOLD, 1)
+
+        assert server.requests["POST /v1/orders/batch"] == 1
+        assert [(p.symbol, p.quantity) for p in broker.get_positions()] == [("AAPL", 8.0)]
+    finally:
+        broker.close()
+        server.stop_thread()
@@ -0,0 +1,24 @@
+# tests/test_feature_store.py
+
+import numpy as np
+import pandas as pd
+
+from data.feature_store import ROLLING_FUNCS, FeatureStore, RollingFeature
+
+def test_rolling_features_match_pandas_around_nans():
+    rng = np.random.default_rng(7)
+    close = 100 + rng.normal(size=300).cumsum()
+    close[[20, 21, 90, 150, 151, 152, 153, 154, 155, 156, 157, 158, 159, 160]] = np.nan
+    df = pd.DataFrame({"Close": close})
+
+    features = [RollingFeature(f"{func}_{window}", "Close", window, func)
+                for func in ROLLING_FUNCS for window in (1, 5, 12)]
+    store = FeatureStore(features, capacity=len(df))
+    for row in df.to_dict("records"):
+        store.update("SYM", row)
+
+    actual = store.window("SYM", len(df))
+    for j, feature in enumerate(features):
+        expected = getattr(df["Close"].rolling(feature.window), feature.func)().to_numpy()
+        np.testing.assert_allclose(actual[:, j], expected, rtol=1e-9, atol=1e-9, equal_nan=True,
+                                   err_msg=feature.name)
@@ -0,0 +1,41 @@
+# tests/test_indicator_engine.py
+
+import numpy as np
+import pandas as pd
+
+from benchmarks.synthetic import make_bars
+from core.bars import BarWindow
+from indicators.engine import IndicatorEngine, Rsi
+from indicators.rsi import RsiIndicator
+from strategies.classical_strategy import ClassicalStrategy
+
+def test_strategies_share_one_rsi_computation_per_symbol_and_bar():
+    df = make_bars(300)
+    engine = IndicatorEngine()
+    settings = [{}, {"oversold": 45, "overbought": 55}, {"period": 20}]
+    strategies = [ClassicalStrategy(**kwargs, engine=engine) for kwargs in settings]
+    standalone = [ClassicalStrategy(**kwargs) for kwargs in settings]
+
+    for end in (200, 201):
+        # Each strategy gets its own window, as from separate fetches
+        signals = [strategy.generate_signal_fast(BarWindow.from_dataframe(df.iloc[:end], symbol="SYM"))
+                   for strategy in strategies]
+        window = BarWindow.from_dataframe(df.iloc[:end])
+        assert signals == [strategy.generate_signal_fast(window) for strategy in standalone]
+
+    # Per bar: close, diff, gain and loss once, then two rolling means and
+    # the RSI for each of the two distinct periods
+    assert engine.evaluations == 2 * (4 + 3 + 3)
+
+def test_latest_fast_matches_rsi_indicator():
+    rng = np.random.default_rng(2)
+    close = 100 + rng.normal(size=120).cumsum()
+    close[60] = np.nan
+    data = pd.DataFrame({"close": close})
+    engine = IndicatorEngine()
+    for period in (2, 14):
+        expected = RsiIndicator(period).calculate_series(data).to_numpy()
+        for end in (1, period, period + 1, 61, 61 + period, 120):
+            value = engine.latest_fast(Rsi(period), BarWindow(close[:end]))
+            np.testing.assert_allclose(value, expected[end - 1], rtol=1e-9, equal_nan=True,
+                                       err_msg=f"period={period} end={end}")
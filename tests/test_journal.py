@@ -0,0 +1,102 @@
+# tests/test_journal.py
+
+import errno
+import glob
+import os
+
+import numpy as np
+import pytest
+
+from brokers.journal import RECORD_DTYPE, Journal
+from brokers.paper_broker import PaperBroker
+from core.models import OrderType
+
+def broker_state(broker):
+    return (broker.balance,
+            {symbol: (p.quantity, p.avg_price) for symbol, p in broker.positions.items()},
+            broker.trades.to_dataframe().values.tolist())
+
+def test_recovery_through_compaction_matches_live_state(tmp_path):
+    journal = Journal(str(tmp_path), flush_interval=0.001, snapshot_every=10)
+    broker = PaperBroker(journal=journal)
+    for i in range(200):
+        symbol = f"S{i % 7}"
+        if i >= 100:
+            broker.place_order(symbol, OrderType.SELL, 1)
+        else:
+            broker.place_order(symbol, OrderType.BUY, 2)
+        if i % 20 == 0:
+            journal.sync()
+    journal.close()
+
+    assert glob.glob(os.path.join(str(tmp_path), "snapshot-*.npz"))
+    recovered = PaperBroker(journal=Journal(str(tmp_path)))
+    recovered.journal.close()
+    assert broker_state(recovered) == broker_state(broker)
+
+def test_records_after_a_sequence_break_are_discarded(tmp_path):
+    journal = Journal(str(tmp_path))
+    broker = PaperBroker(journal=journal)
+    broker.place_order("AAPL", OrderType.BUY, 5)
+    journal.close()
+
+    stray = np.zeros(1, dtype=RECORD_DTYPE)
+    stray['seq'] = 3  # record 2 is missing
+    stray['symbol'] = b"AAPL"
+    stray.tofile(os.path.join(str(tmp_path), "wal-000099.log"))
+
+    recovered = PaperBroker(journal=Journal(str(tmp_path)))
+    recovered.place_order("AAPL", OrderType.BUY, 1)
+    recovered.journal.close()
+    assert recovered.positions["AAPL"].quantity == 6
+
+    reopened = PaperBroker(journal=Journal(str(tmp_path)))
+    reopened.journal.close()
+    assert broker_state(reopened) == broker_state(recovered)
+
+def test_failed_commit_is_raised_instead_of_blocking(tmp_path, monkeypatch):
+    journal = Journal(str(tmp_path), flush_interval=0.001)
+    broker = PaperBroker(journal=journal)
+    broker.place_order("AAPL", OrderType.BUY, 1)
+    assert journal.sync(timeout=5)
+
+    def no_space(fd):
+        raise OSError(errno.ENOSPC, "No space left on device")
+
+    monkeypatch.setattr(os, "fsync", no_space)
+    broker.place_order("AAPL", OrderType.BUY, 1)
+    with pytest.raises(OSError):
+        journal.sync()
+    with pytest.raises(OSError):
+        broker.place_order("AAPL", OrderType.BUY, 1)
+    journal.close()
+
+def test_compaction_only_writes_new_fills(tmp_path):
+    directory = str(tmp_path)
+    journal = Journal(directory, flush_interval=0.001, snapshot_every=10)
+    broker = PaperBroker(journal=journal)
+    for i in range(100):
+        broker.place_order(f"S{i % 3}", OrderType.BUY, 1)
+        if i % 5 == 0:
+            journal.sync()
+    journal.close()
+
+    chunks = sorted(glob.glob(os.path.join(directory, "trades-*.npy")))
+    assert len(chunks) > 1
+    first = os.stat(chunks[0])
+    np.save(os.path.join(directory, "trades-000999.npy"), np.zeros(3))  # left by a crashed compaction
+
+    recovered = PaperBroker(journal=Journal(directory, snapshot_every=10))
+    state = recovered.journal.load()
+    saved = state.trade_chunks[:len(state.chunk_generations)]
+    assert saved and all(isinstance(chunk, np.memmap) for chunk in saved)
+    for i in range(30):
+        recovered.place_order("S0", OrderType.BUY, 1)
+    recovered.journal.close()
+
+    assert os.stat(chunks[0]).st_mtime_ns == first.st_mtime_ns
+    assert not os.path.exists(os.path.join(directory, "trades-000999.npy"))
+    reopened = PaperBroker(journal=Journal(directory))
+    reopened.journal.close()
+    assert broker_state(reopened) == broker_state(recovered)
+    assert len(reopened.trades) == 130
@@ -0,0 +1,61 @@
+# tests/test_main.py
+
+import asyncio
+
+from brokers.paper_broker import PaperBroker
+from brokers.real_broker import RealBroker
+from brokers.stub_server import StubBrokerServer
+from core.interfaces import IStrategy
+from core.models import OrderType
+from main import run_trading_cycle
+from risk_management.basic_risk_manager import BasicRiskManager
+
+class AlwaysBuy(IStrategy):
+    def generate_signal(self, data) -> OrderType:
+        return OrderType.BUY
+
+    def generate_signal_fast(self, window) -> OrderType:
+        return OrderType.BUY
+
+def test_cycle_batches_real_broker_orders_across_symbols():
+    server = StubBrokerServer()
+    base_url = server.start_in_thread()
+    config = {"real_broker": {"base_url": base_url, "batch_window_ms": 100}}
+    broker = RealBroker(config)
+    symbols = [f"SYM{i}" for i in range(20)]
+    try:
+        results = asyncio.run(run_trading_cycle(symbols, AlwaysBuy(), BasicRiskManager(config), broker, config))
+
+        assert [result.error for result in results] == [None] * 20
+        assert all(result.placed for result in results)
+        assert server.requests["POST /v1/orders/batch"] < 5
+        assert sorted(p.symbol for p in broker.get_positions()) == sorted(symbols)
+    finally:
+        broker.close()
+        server.stop_thread()
+
+class RecordingBroker(PaperBroker):
+    def __init__(self, events):
+        super().__init__()
+        self.events = events
+
+    def place_order(self, symbol, order_type, quantity):
+        self.events.append("place_order")
+        super().place_order(symbol, order_type, quantity)
+
+class RecordingEventBus:
+    def __init__(self, events):
+        self.events = events
+
+    def publish(self, hook, *args):
+        self.events.append(hook)
+
+def test_signal_and_order_hooks_are_published_after_placement():
+    events = []
+    config = {}
+    asyncio.run(run_trading_cycle(["AAPL"], AlwaysBuy(), BasicRiskManager(config), RecordingBroker(events),
+                                  config, RecordingEventBus(events)))
+
+    placed = events.index("place_order")
+    for hook in ("on_signal_generated", "on_order_validated", "on_trade_executed"):
+        assert events.index(hook) > placed
@@ -0,0 +1,98 @@
+# tests/test_matching_engine.py
+
+import numpy as np
+
+from benchmarks.synthetic import make_bars
+from brokers.matching_engine import (CANCELLED, FILLED, LIMIT, OPEN, STOP, STOP_LIMIT,
+                                     MatchingEngine)
+from brokers.paper_broker import PaperBroker
+from core.bars import BarWindow
+from core.models import OrderType
+
+def test_equal_priced_limits_fill_in_arrival_order():
+    engine = MatchingEngine()
+    first = engine.submit("AAPL", OrderType.BUY, 1, LIMIT, limit_price=99.0)
+    second = engine.submit("AAPL", OrderType.BUY, 1, LIMIT, limit_price=99.0)
+    better = engine.submit("AAPL", OrderType.BUY, 1, LIMIT, limit_price=99.5)
+
+    engine.submit("AAPL", OrderType.SELL, 2, LIMIT, limit_price=99.0)
+
+    assert (better.status, first.status, second.status) == (FILLED, FILLED, OPEN)
+
+def test_fills_are_capped_at_participation_of_volume():
+    engine = MatchingEngine(participation=0.1)
+    fills = []
+    engine.subscribe(lambda order, quantity, price, timestamp: fills.append((quantity, price)))
+    order = engine.submit("AAPL", OrderType.BUY, 10, LIMIT, limit_price=100.0)
+
+    engine.on_bar("AAPL", 101.0, 101.0, 99.0, 100.0, volume=30)
+    engine.on_bar("AAPL", 100.5, 101.0, 99.5, 100.0, volume=50)
+    assert order.filled == 8 and order.status == OPEN
+    engine.on_bar("AAPL", 99.0, 100.0, 98.0, 99.0, volume=1000)
+
+    assert order.status == FILLED
+    assert fills == [(3.0, 100.0), (5.0, 100.0), (2.0, 99.0)]
+
+def test_stops_trigger_at_stop_price_or_gap_open():
+    engine = MatchingEngine()
+    engine.on_tick("AAPL", 100.0)
+    buy_stop = engine.submit("AAPL", OrderType.BUY, 1, STOP, stop_price=105.0)
+    sell_stop = engine.submit("AAPL", OrderType.SELL, 1, STOP, stop_price=95.0)
+    gapped = engine.submit("AAPL", OrderType.BUY, 1, STOP, stop_price=108.0)
+    fills = {}
+    engine.subscribe(lambda order, quantity, price, timestamp: fills.__setitem__(order.order_id, price))
+
+    engine.on_bar("AAPL", 101.0, 106.0, 100.0, 104.0)
+    assert fills == {buy_stop.order_id: 105.0}
+    engine.on_bar("AAPL", 96.0, 96.0, 94.0, 95.0)
+    assert fills[sell_stop.order_id] == 95.0
+    engine.on_bar("AAPL", 110.0, 111.0, 109.0, 110.0)  # opens above the stop
+    assert fills[gapped.order_id] == 110.0
+
+def test_stop_limit_gapping_past_its_limit_rests_as_a_limit():
+    engine = MatchingEngine()
+    engine.on_tick("AAPL", 100.0)
+    order = engine.submit("AAPL", OrderType.BUY, 1, STOP_LIMIT, limit_price=106.0, stop_price=105.0)
+
+    engine.on_bar("AAPL", 108.0, 109.0, 107.0, 108.0)
+    assert (order.kind, order.status, order.filled) == (LIMIT, OPEN, 0.0)
+
+    prices = []
+    engine.subscribe(lambda order, quantity, price, timestamp: prices.append(price))
+    engine.on_bar("AAPL", 107.0, 107.0, 105.0, 105.5)
+    assert order.status == FILLED and prices == [106.0]
+
+def test_cancelled_orders_are_skipped_lazily():
+    engine = MatchingEngine()
+    first = engine.submit("AAPL", OrderType.BUY, 1, LIMIT, limit_price=99.0)
+    second = engine.submit("AAPL", OrderType.BUY, 1, LIMIT, limit_price=99.0)
+
+    assert engine.cancel(first.order_id) is first
+    assert engine.cancel(first.order_id) is None
+    assert engine.open_orders("AAPL") == [second]
+
+    engine.submit("AAPL", OrderType.SELL, 1, LIMIT, limit_price=99.0)
+    assert (first.status, first.filled, second.status) == (CANCELLED, 0.0, FILLED)
+
+def test_replay_bars_settles_fills_in_paper_broker():
+    bars = BarWindow.from_dataframe(make_bars(1000))
+    engine = MatchingEngine()
+    broker = PaperBroker(starting_balance=10000.0, engine=engine)
+    limit = float(bars.close[0]) - 1.0
+    last = len(bars.close) - 1
+
+    def on_bar(i):
+        if i == 0:
+            broker.submit_order("SYM", OrderType.BUY, 10, LIMIT, limit_price=limit)
+        elif i == last:
+            broker.submit_order("SYM", OrderType.SELL, 10)
+
+    engine.replay_bars("SYM", bars, on_bar)
+
+    # The limit buy fills on the first later bar trading through it
+    j = int(np.argmax(bars.low[1:] <= limit)) + 1
+    buy_price = min(limit, bars.open[j])
+    assert broker.trades[0].timestamp == bars.timestamp[j].astype("datetime64[us]").tolist()
+    assert broker.trades[0].price == buy_price
+    assert broker.positions["SYM"].quantity == 0
+    assert np.isclose(broker.balance, 10000.0 - 10 * buy_price + 10 * bars.close[last])
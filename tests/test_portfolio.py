@@ -0,0 +1,79 @@
+# tests/test_portfolio.py
+
+from datetime import datetime
+
+import numpy as np
+import pytest
+
+from core.portfolio import Portfolio
+
+def full_equity(portfolio):
+    return portfolio.starting_capital + portfolio.realized.sum() + portfolio.unrealized_pnl().sum()
+
+def test_buys_average_their_cost():
+    portfolio = Portfolio(1000.0)
+    portfolio.apply_fill("AAPL", 10, 100.0)
+    portfolio.apply_fill("AAPL", 30, 120.0)
+
+    i = portfolio.symbol_id("AAPL")
+    assert portfolio.quantities[i] == 40
+    assert portfolio.avg_prices[i] == pytest.approx(115.0)
+    assert portfolio.cash == pytest.approx(1000.0 - 10 * 100.0 - 30 * 120.0)
+    assert portfolio.equity == pytest.approx(1000.0 + 40 * (120.0 - 115.0))
+
+def test_partial_sells_realize_against_average_cost():
+    portfolio = Portfolio(1000.0)
+    portfolio.apply_fill("AAPL", 10, 100.0)
+    portfolio.apply_fill("AAPL", -4, 110.0)
+    portfolio.apply_fill("AAPL", -2, 95.0)
+
+    i = portfolio.symbol_id("AAPL")
+    assert portfolio.quantities[i] == 4
+    assert portfolio.avg_prices[i] == 100.0  # sells leave the cost basis alone
+    assert portfolio.realized_pnl == pytest.approx(4 * 10.0 - 2 * 5.0)
+    assert portfolio.equity == pytest.approx(1000.0 + 30.0 + 4 * (95.0 - 100.0))
+
+def test_rounding_residue_closes_the_position():
+    portfolio = Portfolio()
+    portfolio.apply_fill("AAPL", 0.3, 10.0)
+    for _ in range(3):
+        portfolio.apply_fill("AAPL", -0.1, 10.0)
+
+    i = portfolio.symbol_id("AAPL")
+    assert (portfolio.quantities[i], portfolio.avg_prices[i]) == (0.0, 0.0)
+    assert portfolio.unrealized_pnl()[i] == 0.0
+
+def test_running_equity_tracks_fills_and_marks():
+    rng = np.random.default_rng(3)
+    portfolio = Portfolio(1e6)
+    symbols = [f"S{i}" for i in range(20)]
+    for step in range(2000):
+        symbol = symbols[rng.integers(len(symbols))]
+        held = portfolio.quantities[portfolio.symbol_id(symbol)]
+        price = 100.0 + rng.normal()
+        if held > 0 and rng.random() < 0.4:
+            portfolio.apply_fill(symbol, -min(held, float(rng.integers(1, 5))), price)
+        else:
+            portfolio.apply_fill(symbol, float(rng.integers(1, 5)), price)
+        if step % 50 == 0:
+            portfolio.mark({symbol: 100.0 + rng.normal() for symbol in symbols[:5]})
+        if step % 170 == 0:
+            portfolio.mark(np.where(rng.random(len(symbols)) < 0.5, np.nan, 100.0 + rng.normal(size=len(symbols))))
+
+        assert portfolio.equity == pytest.approx(full_equity(portfolio), rel=1e-12)
+
+def test_mark_to_market_records_history():
+    portfolio = Portfolio(1000.0)
+    portfolio.apply_fill("AAPL", 10, 100.0)
+    portfolio.apply_fill("MSFT", 5, 200.0)
+
+    first = portfolio.mark_to_market({"AAPL": 110.0, "XYZ": 1.0}, datetime(2024, 1, 1))
+    portfolio.apply_fill("AAPL", -10, 105.0)
+    second = portfolio.mark_to_market(np.array([np.nan, 190.0]), datetime(2024, 1, 2))
+
+    history = portfolio.history()
+    assert history.index.tolist() == [datetime(2024, 1, 1), datetime(2024, 1, 2)]
+    assert history["equity"].tolist() == pytest.approx([first, second])
+    assert history["unrealized_pnl"].tolist() == pytest.approx([100.0, -50.0])
+    assert history["realized_pnl"].tolist() == pytest.approx([0.0, 50.0])
+    assert second == pytest.approx(1000.0 + 50.0 - 50.0)
@@ -0,0 +1,57 @@
+# tests/test_processing.py
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data.processing import purged_kfold_splits, select_rows, walk_forward_splits
+
+def rows_of(slices):
+    return np.concatenate([np.arange(s.start, s.stop) for s in slices]) if slices else np.zeros(0, dtype=int)
+
+@pytest.mark.parametrize("n_splits,test_size,train_size,gap", [
+    (5, None, None, 0), (4, 20, None, 3), (3, 15, 30, 5), (6, None, 10, 1),
+])
+def test_walk_forward_trains_strictly_before_the_gap(n_splits, test_size, train_size, gap):
+    n = 200
+    folds = list(walk_forward_splits(n, n_splits, test_size, train_size, gap))
+    assert len(folds) == n_splits
+
+    tests = [np.arange(test.start, test.stop) for _, test in folds]
+    np.testing.assert_array_equal(np.concatenate(tests), np.arange(tests[0][0], n))
+    for train, test in folds:
+        train_rows = rows_of(train)
+        assert len(train_rows) > 0
+        assert train_rows.max() == test.start - gap - 1
+        if train_size is not None:
+            assert len(train_rows) <= train_size
+
+def test_walk_forward_raises_without_training_rows():
+    with pytest.raises(ValueError):
+        list(walk_forward_splits(60, n_splits=5, test_size=10, gap=10))
+
+@pytest.mark.parametrize("n_splits,purge,embargo", [(5, 0, 0), (5, 3, 2), (4, 10, 0), (3, 0, 7)])
+def test_purged_kfold_drops_exactly_the_purge_and_embargo_rows(n_splits, purge, embargo):
+    n = 103
+    folds = list(purged_kfold_splits(n, n_splits, purge, embargo))
+    assert len(folds) == n_splits
+
+    tested = []
+    for train, test in folds:
+        train_rows = set(rows_of(train).tolist())
+        excluded = set(range(max(test.start - purge, 0), min(test.stop + embargo, n)))
+        assert train_rows == set(range(n)) - excluded
+        assert not train_rows & set(range(test.start, test.stop))
+        tested.extend(range(test.start, test.stop))
+    assert tested == list(range(n))
+
+def test_purged_kfold_raises_for_a_fold_with_no_training_rows():
+    with pytest.raises(ValueError):
+        list(purged_kfold_splits(10, n_splits=2, purge=5, embargo=5))
+
+def test_select_rows_returns_the_fold_rows():
+    df = pd.DataFrame({"x": np.arange(50)})
+    train, test = list(purged_kfold_splits(len(df), 5, purge=2, embargo=3))[2]
+    assert select_rows(df, train)["x"].tolist() == rows_of(train).tolist()
+    assert select_rows(df, test)["x"].tolist() == list(range(test.start, test.stop))
+    assert select_rows(df, ()).empty
@@ -0,0 +1,19 @@
+# tests/test_realtime.py
+
+from data.realtime import BarAggregator
+
+def test_late_tick_after_flush_is_dropped():
+    aggregator = BarAggregator(60)
+    emitted = []
+    aggregator.subscribe(emitted.append)
+
+    aggregator.on_tick("AAPL", 1.0, 1, timestamp=0)
+    aggregator.on_tick("AAPL", 2.0, 1, timestamp=30)
+    aggregator.flush(now=61)
+    aggregator.on_tick("AAPL", 3.0, 1, timestamp=59)  # belongs to the flushed bar
+    aggregator.on_tick("AAPL", 4.0, 1, timestamp=70)
+    aggregator.flush(now=121)
+
+    assert aggregator.late_ticks == 1
+    assert [bar.timestamp.timestamp() for bar in emitted] == [0.0, 60.0]
+    assert aggregator.bars("AAPL")["close"].tolist() == [2.0, 4.0]
@@ -0,0 +1,26 @@
+# tests/test_resampling.py
+
+import numpy as np
+
+from benchmarks.synthetic import make_bars
+from data.resampling import MultiTimeframeResampler
+
+def test_seeded_and_streamed_bars_match_pandas_resample():
+    df = make_bars(3 * 1440 + 7)  # three days of minutes, ending mid-bar
+    resampler = MultiTimeframeResampler()
+    split = 1003  # inside a 5m bar, so streaming continues a seeded open bar
+    resampler.seed("SYM", df.iloc[:split])
+    for row in df.iloc[split:].itertuples(index=False):
+        resampler.update("SYM", row.Date, row.Open, row.High, row.Low, row.Close, row.Volume)
+
+    agg = {"Open": "first", "High": "max", "Low": "min", "Close": "last", "Volume": "sum"}
+    for timeframe, rule in (("5m", "5min"), ("15m", "15min"), ("1h", "1h"), ("1d", "1D")):
+        expected = df.set_index("Date").resample(rule).agg(agg)
+        bars = resampler.bars("SYM", timeframe)
+
+        starts = expected.index.to_numpy().astype("datetime64[s]").astype(float)
+        np.testing.assert_array_equal(bars["timestamp"], starts, err_msg=timeframe)
+        for field in ("open", "high", "low", "close", "volume"):
+            np.testing.assert_allclose(bars[field], expected[field.capitalize()].to_numpy(),
+                                       rtol=1e-12, err_msg=f"{timeframe} {field}")
+    assert resampler.late_bars == 0
@@ -0,0 +1,62 @@
+# tests/test_risk_manager.py
+
+from datetime import datetime
+
+import numpy as np
+
+from brokers.paper_broker import PaperBroker
+from core.models import OrderType, Trade
+from risk_management.advanced_risk_manager import AdvancedRiskManager
+
+def make_risk_manager(risk_config):
+    # PaperBroker fills at 100.0 without an engine, so trades are priced at 100.0
+    broker = PaperBroker(starting_balance=50000.0)
+    for symbol in ("H0", "H1", "H2"):
+        broker.place_order(symbol, OrderType.BUY, 50)
+    return AdvancedRiskManager({"risk": risk_config}, broker)
+
+def random_batch(rng, n):
+    trades = []
+    for _ in range(n):
+        kind = rng.random()
+        if kind < 0.15:
+            # A small sell of a held symbol, never closing it
+            trades.append((f"H{rng.integers(3)}", OrderType.SELL, float(rng.integers(1, 5))))
+        elif kind < 0.2:
+            trades.append((f"N{rng.integers(10)}", OrderType.HOLD, 1.0))
+        elif kind < 0.25:
+            trades.append((f"N{rng.integers(10)}", OrderType.BUY, 150.0))  # over max_position_size
+        else:
+            symbol = f"H{rng.integers(3)}" if rng.random() < 0.3 else f"N{rng.integers(10)}"
+            trades.append((symbol, OrderType.BUY, float(rng.integers(1, 40))))
+    return [Trade(symbol=symbol, order_type=order_type, quantity=quantity, price=100.0,
+                  timestamp=datetime(2024, 1, 1)) for symbol, order_type, quantity in trades]
+
+def sequential_decisions(risk_manager, trades):
+    decisions = []
+    for trade in trades:
+        accepted = risk_manager.validate_order(trade)
+        if accepted:
+            risk_manager.broker.place_order(trade.symbol, trade.order_type, trade.quantity)
+        decisions.append(accepted)
+    return decisions
+
+def test_batch_matches_one_by_one_validation_across_limits():
+    rng = np.random.default_rng(5)
+    configs = [
+        # Open positions run out partway through the batch
+        {"max_position_size": 100, "max_open_positions": 6, "max_total_exposure": 1e9, "leverage": 1e3},
+        # Total exposure runs out partway through
+        {"max_position_size": 100, "max_open_positions": 50, "max_total_exposure": 40000.0, "leverage": 1e3},
+        # Leverage on equity runs out partway through
+        {"max_position_size": 100, "max_open_positions": 50, "max_total_exposure": 1e9, "leverage": 0.8},
+    ]
+    for config in configs:
+        for _ in range(20):
+            trades = random_batch(rng, 40)
+            batch = make_risk_manager(config).validate_orders(trades)
+            expected = sequential_decisions(make_risk_manager(config), trades)
+
+            assert batch.accepted.tolist() == expected, config
+            assert any(expected) and not all(expected)
+            assert [reason is None for reason in batch.reasons] == expected
@@ -0,0 +1,31 @@
+# tests/test_rsi.py
+
+import numpy as np
+import pandas as pd
+
+from indicators.rsi import RsiIndicator
+
+def test_streaming_rsi_matches_batch():
+    rng = np.random.default_rng(42)
+    close = 100 + rng.normal(size=500).cumsum()
+    close[200:240] = close[199]  # flat prices: no gains or losses
+    close[300] = np.nan          # a missing close poisons two deltas
+    close[350:353] = np.nan
+    data = pd.DataFrame({"close": close})
+
+    for period in (2, 14, 30):
+        rsi = RsiIndicator(period)
+        expected = rsi.calculate_series(data).to_numpy()
+        streamed = np.array([rsi.update(value) for value in close])
+
+        # Warm-up: nothing until period + 1 closes have been seen
+        assert np.isnan(streamed[:period]).all()
+        np.testing.assert_allclose(streamed, expected, rtol=1e-8, atol=1e-6, equal_nan=True,
+                                   err_msg=f"period={period}")
+
+def test_seed_matches_batch_value():
+    rng = np.random.default_rng(1)
+    data = pd.DataFrame({"close": 50 + rng.normal(size=200).cumsum()})
+    rsi = RsiIndicator(14)
+    assert np.isclose(rsi.seed(data), rsi.calculate(data))
+    assert np.isclose(rsi.update(60.0), rsi.calculate(pd.concat([data, pd.DataFrame({"close": [60.0]})])))